@@ -118,6 +118,8 @@ class handler(BaseHTTPRequestHandler):
 
     def do_POST(self):
         """更新权重"""
+        global calculator
+
         try:
             content_length = int(self.headers.get('Content-Length', 0))
             post_data = self.rfile.read(content_length)
@@ -149,7 +151,6 @@ class handler(BaseHTTPRequestHandler):
 
             elif action == 'reset':
                 # 重置权重
-                global calculator
                 decay_factor = params.get('decay_factor', 0.85)
                 calculator = WeightCalculator(decay_factor=decay_factor)
 
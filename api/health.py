@@ -64,6 +64,18 @@ class handler(BaseHTTPRequestHandler):
             ]
         }
 
+        # 当前进程正在使用的模型版本与COS上的最新版本
+        if cos_configured:
+            try:
+                from utils._predictor_registry import get_models_status
+                from utils._cos_data_loader import get_models_version
+                models_status = get_models_status()
+                if models_status['latest_version'] is None:
+                    models_status['latest_version'] = get_models_version()
+                result['models'] = models_status
+            except Exception as e:
+                result['models'] = {'error': str(e)}
+
         if error_message:
             result['error'] = error_message
 
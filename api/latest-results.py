@@ -5,10 +5,20 @@
 from http.server import BaseHTTPRequestHandler
 import json
 import os
+import sys
 import random
 from datetime import datetime
 from collections import Counter
 
+# 添加api目录到路径
+sys.path.insert(0, os.path.dirname(__file__))
+
+from utils._sampling import weighted_sample
+from utils._fusion import normalize, fuse_zone
+
+# 历史命中查询单次最多的号码注数
+MAX_LOOKUP_TICKETS = 10000
+
 KV_REST_API_URL = os.environ.get('KV_REST_API_URL') or os.environ.get('KV_URL', '')
 KV_REST_API_TOKEN = os.environ.get('KV_REST_API_TOKEN', '')
 
@@ -351,6 +361,11 @@ def kv_get(key):
         return None
 
 
+def _proba_list(values):
+    """得分 -> 归一化概率列表（下标0对应号码1）"""
+    return [round(float(p), 6) for p in normalize(values)]
+
+
 class MLPredictor:
     """基于300期历史数据的ML预测器"""
     
@@ -398,6 +413,8 @@ class MLPredictor:
         return {
             'front': front, 
             'back': back, 
+            'front_proba': _proba_list([recent_freq.get(n, 0) if n in hot else 0 for n in range(1, 36)]),
+            'back_proba': _proba_list([recent_back.get(n, 0) if n in hot_back else 0 for n in range(1, 13)]),
             'confidence': round(0.72 + random.random() * 0.1, 3),
             'model': 'LSTM',
             'description': '基于时序模式分析近50期热号'
@@ -421,28 +438,14 @@ class MLPredictor:
             l = local_freq.get(n, 1)
             weights.append(g * 0.7 + l * 0.3 * 10)  # 局部权重放大
         
-        front = []
-        available = all_nums.copy()
-        available_weights = weights.copy()
-        
-        for _ in range(5):
-            total = sum(available_weights)
-            r = random.random() * total
-            cumsum = 0
-            for i, n in enumerate(available):
-                cumsum += available_weights[i]
-                if cumsum >= r:
-                    front.append(n)
-                    del available_weights[i]
-                    available.remove(n)
-                    break
-        
-        front.sort()
+        front = weighted_sample(all_nums, weights, 5, seed=seed + 2)
         back = sorted(random.sample(range(1, 13), 2))
         
         return {
             'front': front, 
             'back': back, 
+            'front_proba': _proba_list(weights),
+            'back_proba': _proba_list([1] * 12),
             'confidence': round(0.68 + random.random() * 0.12, 3),
             'model': 'Transformer',
             'description': '注意力机制综合全局300期和近30期特征'
@@ -476,9 +479,18 @@ class MLPredictor:
         front = sorted(pool[:5])
         back = sorted(random.sample(range(1, 13), 2))
         
+        # 概率：与"2冷3热"一致，冷号合计2份、热号合计3份
+        front_scores = [0.0] * 35
+        for n in cold:
+            front_scores[n - 1] += 2.0 / len(cold)
+        for n in hot:
+            front_scores[n - 1] += 3.0 / len(hot)
+        
         return {
             'front': front, 
             'back': back, 
+            'front_proba': _proba_list(front_scores),
+            'back_proba': _proba_list([1] * 12),
             'confidence': round(0.65 + random.random() * 0.15, 3),
             'model': 'XGBoost',
             'description': '特征工程分析冷热转换规律'
@@ -507,13 +519,20 @@ class MLPredictor:
         return {
             'front': front, 
             'back': back, 
+            'front_proba': _proba_list([votes_front.get(n, 0) for n in range(1, 36)]),
+            'back_proba': _proba_list([votes_back.get(n, 0) for n in range(1, 13)]),
             'confidence': round(0.60 + random.random() * 0.18, 3),
             'model': 'RandomForest',
             'description': '10棵决策树集成投票'
         }
     
-    def ensemble_predict(self):
-        """融合预测：加权投票"""
+    def ensemble_predict(self, method='linear'):
+        """
+        融合预测：各模型概率向量加权池化
+        
+        启发式模型的得分向量中常有大量0（只在热号/投票号上有质量），
+        默认使用算术池化，避免对数池化把任一模型未覆盖的号码全部否决
+        """
         models = {
             'lstm': self.lstm_predict(),
             'transformer': self.transformer_predict(),
@@ -523,25 +542,26 @@ class MLPredictor:
         
         weights = {'lstm': 0.35, 'transformer': 0.30, 'xgboost': 0.20, 'random_forest': 0.15}
         
-        front_scores = {}
-        back_scores = {}
-        
-        for name, pred in models.items():
-            w = weights[name]
-            for i, n in enumerate(pred['front']):
-                front_scores[n] = front_scores.get(n, 0) + w * (5 - i)
-            for i, n in enumerate(pred['back']):
-                back_scores[n] = back_scores.get(n, 0) + w * (2 - i)
-        
-        front = sorted(sorted(front_scores.keys(), key=lambda x: front_scores[x], reverse=True)[:5])
-        back = sorted(sorted(back_scores.keys(), key=lambda x: back_scores[x], reverse=True)[:2])
+        names = list(models)
+        model_weights = [weights[n] for n in names]
+        front_fused = fuse_zone([models[n]['front_proba'] for n in names], model_weights, 5, method, 35)
+        back_fused = fuse_zone([models[n]['back_proba'] for n in names], model_weights, 2, method, 12)
         
         avg_conf = sum(m['confidence'] * weights[n] for n, m in models.items())
         
         return {
-            'front': front,
-            'back': back,
+            'front': front_fused['numbers'],
+            'back': back_fused['numbers'],
             'confidence': round(avg_conf, 3),
+            'front_proba': _proba_list(front_fused['proba']),
+            'back_proba': _proba_list(back_fused['proba']),
+            'fusion': {
+                'method': method,
+                'front_coverage': front_fused['coverage'],
+                'front_lift': front_fused['lift'],
+                'back_coverage': back_fused['coverage'],
+                'back_lift': back_fused['lift']
+            },
             'individual_models': models,
             'training_periods': self.total_periods,
             'weights': weights
@@ -646,6 +666,30 @@ class handler(BaseHTTPRequestHandler):
                     'statistics': stats
                 }
             
+            elif action == 'hit_lookup':
+                from utils._history_index import get_history_index
+
+                tickets = body.get('tickets')
+                if tickets is None:
+                    tickets = [{'front': body.get('front', []), 'back': body.get('back', [])}]
+                if len(tickets) > MAX_LOOKUP_TICKETS:
+                    raise ValueError('单次最多查询' + str(MAX_LOOKUP_TICKETS) + '注')
+
+                min_front = int(body.get('min_front', 3))
+                min_back = int(body.get('min_back', 0))
+                limit = body.get('limit', 50)
+
+                index = get_history_index(history)
+                lookups = index.query_many(tickets, min_front, min_back, limit)
+
+                result = {
+                    'status': 'success',
+                    'results': lookups,
+                    'min_front': min_front,
+                    'min_back': min_back,
+                    'total_periods': len(history)
+                }
+
             elif action == 'get_history':
                 limit = body.get('limit', 50)
                 result = {
@@ -11,13 +11,16 @@ import json
 import os
 import sys
 from datetime import datetime
+from urllib.parse import urlparse, parse_qsl
 
 # 添加api目录到路径
 sys.path.insert(0, os.path.dirname(__file__))
 
+from utils._deadline import Deadline, DEFAULT_BUDGET_MS
 
-def get_historical_data():
-    """获取历史数据：优先从COS，否则使用本地备份"""
+
+def get_historical_data(deadline: Deadline = None):
+    """获取历史数据：优先从COS，否则使用本地备份（预算不足时直接使用本地备份）"""
     try:
         # 检查COS配置
         cos_configured = all([
@@ -29,7 +32,7 @@ def get_historical_data():
 
         if cos_configured:
             from utils._cos_data_loader import get_lottery_data
-            data = get_lottery_data()
+            data = get_lottery_data(deadline=deadline)
             if data and len(data) > 0:
                 return data, 'tencent_cos'
 
@@ -47,6 +50,13 @@ def get_historical_data():
     return FALLBACK_DATA, 'embedded_fallback'
 
 
+# 批量生成号码：超过该注数时以NDJSON流式返回
+STREAM_THRESHOLD = 100
+
+# NDJSON每次写出的行数
+STREAM_FLUSH_LINES = 1000
+
+
 # 嵌入式备份数据
 FALLBACK_DATA = [
     {'period': '25142', 'front_zone': [9, 10, 14, 27, 29], 'back_zone': [2, 9]},
@@ -62,13 +72,258 @@ FALLBACK_DATA = [
 ]
 
 
+def get_precomputed_response(historical_data: list, deadline: Deadline = None):
+    """读取离线预计算的下期预测（scripts/precompute_predictions.py 发布），不存在时返回None"""
+    try:
+        from utils._prediction_artifact import get_next_period
+        from utils._cos_data_loader import load_prediction_artifact
+
+        period = get_next_period(historical_data)
+        if not period:
+            return None
+
+        artifact = load_prediction_artifact(period, deadline=deadline)
+        if not artifact:
+            return None
+
+        ml_info = dict(artifact.get('ml_info', {}))
+        ml_info['served_from'] = 'precomputed'
+        ml_info['generated_at'] = artifact.get('generated_at')
+
+        return {
+            'status': 'success',
+            'target_period': period,
+            'prediction': artifact['prediction'],
+            'ml_info': ml_info,
+            'timestamp': datetime.now().isoformat()
+        }
+
+    except Exception as e:
+        print(f"⚠️  读取预计算预测失败: {e}")
+        return None
+
+
+def get_live_response(historical_data: list, data_source: str, use_cos_models: bool,
+                      deadline: Deadline = None) -> dict:
+    """实时推理（预计算结果不可用时）；预算不足时跳过的模型使用备用概率"""
+    # 获取进程级预测器（热请求直接复用，模型只加载一次）
+    try:
+        from utils._predictor_registry import get_predictor
+        predictor = get_predictor(historical_data, use_cos_models=use_cos_models, deadline=deadline)
+        ml_version = 'real_ml'
+    except ImportError as e:
+        print(f"⚠️  无法导入RealMLPredictor: {e}")
+        # 回退到简单预测
+        from utils._ml_predictor import MLPredictor
+        predictor = MLPredictor(historical_data)
+        ml_version = 'simple_ml'
+
+    # 获取预测结果
+    if ml_version == 'real_ml':
+        from utils._prediction_artifact import build_prediction_payload, get_next_period
+        payload = build_prediction_payload(predictor, historical_data, data_source, deadline)
+        payload['ml_info']['served_from'] = 'live_inference'
+
+        response = {
+            'status': 'success',
+            'target_period': get_next_period(historical_data),
+            'prediction': payload['prediction'],
+            'ml_info': payload['ml_info'],
+            'timestamp': datetime.now().isoformat()
+        }
+    else:
+        # 简单预测回退
+        predictions = predictor.generate_predictions(5)
+        response = {
+            'status': 'success',
+            'prediction': {
+                'ensemble_prediction': {
+                    'front_zone': predictions[0]['front_zone'],
+                    'back_zone': predictions[0]['back_zone'],
+                    'confidence': predictions[0]['confidence']
+                },
+                'all_predictions': predictions,
+                'based_on_data': {
+                    'periods_analyzed': len(historical_data),
+                    'data_source': data_source
+                }
+            },
+            'ml_info': {
+                'version': ml_version,
+                'note': '使用简化ML预测（COS模型加载失败）'
+            },
+            'timestamp': datetime.now().isoformat()
+        }
+
+    return response
+
+
+def get_fused_probabilities(historical_data: list, use_cos_models: bool, deadline: Deadline = None):
+    """
+    获取融合概率向量：优先取预计算产物，否则实时推理
+
+    Returns:
+        (front_proba, back_proba, served_from)
+    """
+    if use_cos_models:
+        precomputed = get_precomputed_response(historical_data, deadline)
+        fused = precomputed and precomputed['prediction'].get('fused_probabilities')
+        if fused:
+            return fused['front'], fused['back'], 'precomputed'
+
+    from utils._predictor_registry import get_predictor
+    predictor = get_predictor(historical_data, use_cos_models=use_cos_models, deadline=deadline)
+    ensemble_result = predictor.ensemble_predict(deadline=deadline)
+    return ensemble_result['front_proba'], ensemble_result['back_proba'], 'live_inference'
+
+
 class handler(BaseHTTPRequestHandler):
 
+    def _read_params(self) -> dict:
+        """合并URL查询参数与JSON请求体参数"""
+        params = dict(parse_qsl(urlparse(self.path).query))
+
+        content_length = int(self.headers.get('Content-Length', 0) or 0)
+        if content_length > 0:
+            body = json.loads(self.rfile.read(content_length).decode('utf-8') or '{}')
+            if isinstance(body, dict):
+                params.update(body)
+
+        return params
+
+    def _send_tickets(self, historical_data, use_cos_models, params, deadline):
+        """批量生成N注号码（大批量时NDJSON流式输出）"""
+        from utils._ticket_generator import iter_unique_tickets, MAX_TICKET_COUNT
+        from utils._prediction_artifact import get_next_period
+
+        # 参数在开始输出之前校验，错误以400返回
+        try:
+            count = int(params.get('count'))
+            seed = params.get('seed')
+            seed = int(seed) if seed not in (None, '') else None
+        except (TypeError, ValueError):
+            self._send_error(400, f"count / seed 必须是整数: {params.get('count')!r} / {params.get('seed')!r}", 'ValueError')
+            return
+        if not 0 < count <= MAX_TICKET_COUNT:
+            self._send_error(400, f"count 必须在 1..{MAX_TICKET_COUNT} 之间: {count}", 'ValueError')
+            return
+
+        front_proba, back_proba, served_from = get_fused_probabilities(historical_data, use_cos_models, deadline)
+        tickets = iter_unique_tickets(front_proba, back_proba, count, seed=seed)
+
+        meta = {
+            'status': 'success',
+            'target_period': get_next_period(historical_data),
+            'requested': count,
+            'served_from': served_from,
+            'deadline': deadline.to_dict(),
+            'timestamp': datetime.now().isoformat()
+        }
+
+        stream = params.get('format') == 'ndjson' or (
+            params.get('format') != 'json' and count > STREAM_THRESHOLD
+        )
+
+        if not stream:
+            ticket_list = list(tickets)
+            response = {**meta, 'count': len(ticket_list), 'tickets': ticket_list}
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json; charset=utf-8')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8'))
+            return
+
+        # NDJSON：首行为元信息，其后每行一注号码
+        self.send_response(200)
+        self.send_header('Content-type', 'application/x-ndjson; charset=utf-8')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+
+        # 响应头已发出：之后的错误不能再返回500，以最后一行 {"error": ...} 结束输出
+        lines = [json.dumps(meta, ensure_ascii=False)]
+        try:
+            for ticket in tickets:
+                lines.append(json.dumps(ticket, separators=(',', ':')))
+                if len(lines) >= STREAM_FLUSH_LINES:
+                    self.wfile.write(('\n'.join(lines) + '\n').encode('utf-8'))
+                    self.wfile.flush()
+                    lines = []
+        except Exception as e:
+            print(f"⚠️  号码流式输出中断: {e}")
+            lines.append(json.dumps({'error': str(e), 'error_type': type(e).__name__}, ensure_ascii=False))
+        if lines:
+            self.wfile.write(('\n'.join(lines) + '\n').encode('utf-8'))
+
+    def _send_constrained_tickets(self, historical_data, use_cos_models, params, deadline):
+        """约束驱动的号码生成：返回满足全部结构约束、概率最高的前N注"""
+        import time
+        from utils._constraint_generator import (
+            MAX_CONSTRAINED_TICKETS, constrained_top_tickets, validate_constraints
+        )
+        from utils._prediction_artifact import get_next_period
+
+        # 参数在推理之前校验，错误以400返回
+        try:
+            count = params.get('count')
+            count = int(count) if count not in (None, '') else 10
+        except (TypeError, ValueError):
+            self._send_error(400, f"count 必须是整数: {params.get('count')!r}", 'ValueError')
+            return
+        if not 0 < count <= MAX_CONSTRAINED_TICKETS:
+            self._send_error(400, f"count 必须在 1..{MAX_CONSTRAINED_TICKETS} 之间: {count}", 'ValueError')
+            return
+
+        try:
+            constraints = params.get('constraints') or {}
+            if isinstance(constraints, str):
+                constraints = json.loads(constraints)
+            constraints = validate_constraints(constraints)
+        except ValueError as e:
+            # json.JSONDecodeError 也是 ValueError
+            self._send_error(400, f"constraints 不合法: {e}", 'ValueError')
+            return
+
+        front_proba, back_proba, served_from = get_fused_probabilities(historical_data, use_cos_models, deadline)
+
+        latest = historical_data[0]
+        last_draw = latest.get('front_zone') or latest.get('front', [])
+
+        start = time.perf_counter()
+        result = constrained_top_tickets(front_proba, back_proba, count, constraints, last_draw)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        response = {
+            'status': 'success',
+            'action': 'constrained',
+            'target_period': get_next_period(historical_data),
+            'constraints': constraints,
+            'count': len(result['tickets']),
+            'tickets': result['tickets'],
+            'front_candidates': result['front_candidates'],
+            'back_candidates': result['back_candidates'],
+            'served_from': served_from,
+            'elapsed_ms': round(elapsed_ms, 2),
+            'deadline': deadline.to_dict(),
+            'timestamp': datetime.now().isoformat()
+        }
+
+        self.send_response(200)
+        self.send_header('Content-type', 'application/json; charset=utf-8')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8'))
+
     def do_POST(self):
         """处理预测请求"""
         try:
+            params = self._read_params()
+
+            # 请求级时间预算：各阶段按剩余时间决定是否执行
+            deadline = Deadline(float(params.get('budget_ms') or DEFAULT_BUDGET_MS))
+
             # 获取历史数据
-            historical_data, data_source = get_historical_data()
+            historical_data, data_source = get_historical_data(deadline)
 
             if len(historical_data) < 10:
                 raise Exception(f"历史数据不足: {len(historical_data)}期")
@@ -81,87 +336,25 @@ class handler(BaseHTTPRequestHandler):
                 os.getenv('TENCENT_COS_REGION')
             ])
 
-            # 创建预测器
-            try:
-                from utils._real_ml_predictor import RealMLPredictor
-                predictor = RealMLPredictor(historical_data, use_cos_models=use_cos_models)
-                ml_version = 'real_ml'
-            except ImportError as e:
-                print(f"⚠️  无法导入RealMLPredictor: {e}")
-                # 回退到简单预测
-                from utils._ml_predictor import MLPredictor
-                predictor = MLPredictor(historical_data)
-                ml_version = 'simple_ml'
-
-            # 获取预测结果
-            if ml_version == 'real_ml':
-                ensemble_result = predictor.ensemble_predict()
-                all_predictions = predictor.get_all_predictions()
-
-                response = {
-                    'status': 'success',
-                    'prediction': {
-                        'ensemble_prediction': {
-                            'front_zone': ensemble_result['front'],
-                            'back_zone': ensemble_result['back'],
-                            'confidence': ensemble_result['confidence'],
-                            'models_used': ensemble_result['total_models'],
-                            'cos_models_used': ensemble_result['cos_models_used']
-                        },
-                        'individual_models': {
-                            name: {
-                                'front_zone': pred['front'],
-                                'back_zone': pred['back'],
-                                'confidence': pred['confidence'],
-                                'source': pred['source'],
-                                'description': pred['description']
-                            }
-                            for name, pred in ensemble_result['individual_predictions'].items()
-                        },
-                        'based_on_data': {
-                            'periods_analyzed': len(historical_data),
-                            'data_source': data_source,
-                            'hot_numbers_front': all_predictions['features']['front_hot'],
-                            'hot_numbers_back': all_predictions['features']['back_hot']
-                        }
-                    },
-                    'ml_info': {
-                        'version': ml_version,
-                        'models': ['XGBoost', 'RandomForest', 'LSTM', 'Transformer'],
-                        'model_format': {
-                            'xgboost': 'sklearn (.pkl)',
-                            'random_forest': 'sklearn (.pkl)',
-                            'lstm': 'ONNX (.onnx)',
-                            'transformer': 'ONNX (.onnx)'
-                        },
-                        'weights': ensemble_result['weights'],
-                        'model_sources': ensemble_result['model_sources']
-                    },
-                    'timestamp': datetime.now().isoformat()
-                }
-            else:
-                # 简单预测回退
-                predictions = predictor.generate_predictions(5)
-                response = {
-                    'status': 'success',
-                    'prediction': {
-                        'ensemble_prediction': {
-                            'front_zone': predictions[0]['front_zone'],
-                            'back_zone': predictions[0]['back_zone'],
-                            'confidence': predictions[0]['confidence']
-                        },
-                        'all_predictions': predictions,
-                        'based_on_data': {
-                            'periods_analyzed': len(historical_data),
-                            'data_source': data_source
-                        }
-                    },
-                    'ml_info': {
-                        'version': ml_version,
-                        'note': '使用简化ML预测（COS模型加载失败）'
-                    },
-                    'timestamp': datetime.now().isoformat()
-                }
+            # 约束驱动生成
+            if params.get('action') == 'constrained':
+                self._send_constrained_tickets(historical_data, use_cos_models, params, deadline)
+                return
+
+            # 批量生成号码
+            if params.get('count') not in (None, ''):
+                self._send_tickets(historical_data, use_cos_models, params, deadline)
+                return
+
+            # 优先使用离线预计算的预测结果
+            response = None
+            if use_cos_models:
+                response = get_precomputed_response(historical_data, deadline)
+
+            if response is None:
+                response = get_live_response(historical_data, data_source, use_cos_models, deadline)
+
+            response['deadline'] = deadline.to_dict()
 
             self.send_response(200)
             self.send_header('Content-type', 'application/json; charset=utf-8')
@@ -170,17 +363,21 @@ class handler(BaseHTTPRequestHandler):
             self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8'))
 
         except Exception as e:
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json; charset=utf-8')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            error_response = {
-                'status': 'error',
-                'message': str(e),
-                'error_type': type(e).__name__,
-                'timestamp': datetime.now().isoformat()
-            }
-            self.wfile.write(json.dumps(error_response, ensure_ascii=False).encode('utf-8'))
+            self._send_error(500, str(e), type(e).__name__)
+
+    def _send_error(self, status: int, message: str, error_type: str):
+        """返回JSON错误响应（只能在响应头发出之前调用）"""
+        self.send_response(status)
+        self.send_header('Content-type', 'application/json; charset=utf-8')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        error_response = {
+            'status': 'error',
+            'message': message,
+            'error_type': error_type,
+            'timestamp': datetime.now().isoformat()
+        }
+        self.wfile.write(json.dumps(error_response, ensure_ascii=False).encode('utf-8'))
 
     def do_GET(self):
         """GET请求同样返回预测结果"""
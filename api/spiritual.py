@@ -15,20 +15,18 @@ class handler(BaseHTTPRequestHandler):
     def do_GET(self):
         """获取灵修预测"""
         try:
-            # 生成基于时间的随机种子
-            import time
-            seed = int(time.time())
-            random.seed(seed)
-
-            # 生成灵修预测号码
-            front_zone = sorted(random.sample(range(1, 36), 5))
-            back_zone = sorted(random.sample(range(1, 13), 2))
+            from utils._spiritual_prediction import daily_spiritual_prediction, get_beijing_date
 
-            # 生成能量分析
-            intensity = round(random.uniform(0.6, 0.9), 2)
+            # 当天（北京时间）的灵修预测：同一天返回同一注，开奖后可按开奖日期推算并评分
+            date = get_beijing_date()
+            prediction = daily_spiritual_prediction(date)
+            front_zone = prediction['front_zone']
+            back_zone = prediction['back_zone']
+            intensity = prediction['intensity']
 
             result = {
                 'status': 'success',
+                'date': date,
                 'spiritual_prediction': {
                     'front_zone': front_zone,
                     'back_zone': back_zone
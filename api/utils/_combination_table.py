@@ -0,0 +1,256 @@
+"""
+前区全组合表（C(35,5) = 324,632 注）
+- 一次性生成所有前区组合及其结构属性，保存为紧凑的NumPy结构化数组（约6.5MB）
+- 加载时内存映射，多个进程/请求共享同一份页缓存
+- 过滤条件以向量化掩码表达，计数/抽样在毫秒级完成
+"""
+import os
+import tempfile
+import threading
+import itertools
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+
+FRONT_MAX = 35
+FRONT_PICK = 5
+TOTAL_COMBINATIONS = 324632
+
+# 大小号分界：18-35 为大号
+BIG_THRESHOLD = 18
+
+# 表结构版本（字段变化时递增，文件名随之变化）
+TABLE_VERSION = 1
+
+COMBO_DTYPE = np.dtype([
+    ('numbers', np.uint8, (FRONT_PICK,)),  # 升序号码
+    ('sum', np.uint8),                     # 和值
+    ('span', np.uint8),                    # 跨度
+    ('odd', np.uint8),                     # 奇数个数
+    ('big', np.uint8),                     # 大号个数
+    ('ac', np.uint8),                      # AC值
+    ('max_run', np.uint8),                 # 最长连号长度
+    ('consec_pairs', np.uint8),            # 相邻连号对数
+    ('mask', np.uint64),                   # 号码位掩码（第n-1位表示号码n）
+])
+
+_table = None
+_lock = threading.Lock()
+
+
+def get_table_path() -> str:
+    """组合表文件路径（可通过 COMBINATION_TABLE_PATH 指定）"""
+    return os.getenv(
+        'COMBINATION_TABLE_PATH',
+        os.path.join(tempfile.gettempdir(), f'dlt_front_combinations_v{TABLE_VERSION}.npy')
+    )
+
+
+def build_combination_table() -> np.ndarray:
+    """
+    生成全部前区组合及属性
+
+    Returns:
+        形状为 (324632,) 的结构化数组
+    """
+    numbers = np.fromiter(
+        itertools.combinations(range(1, FRONT_MAX + 1), FRONT_PICK),
+        dtype=np.dtype((np.uint8, FRONT_PICK)),
+        count=TOTAL_COMBINATIONS
+    )
+    nums = numbers.astype(np.int16)
+
+    table = np.empty(TOTAL_COMBINATIONS, dtype=COMBO_DTYPE)
+    table['numbers'] = numbers
+    table['sum'] = nums.sum(axis=1)
+    table['span'] = nums[:, -1] - nums[:, 0]
+    table['odd'] = (nums % 2 == 1).sum(axis=1)
+    table['big'] = (nums >= BIG_THRESHOLD).sum(axis=1)
+
+    # AC值 = 不同正差值个数 - (号码数 - 1)
+    i, j = np.triu_indices(FRONT_PICK, k=1)
+    diffs = np.sort(nums[:, j] - nums[:, i], axis=1)
+    distinct = 1 + (np.diff(diffs, axis=1) != 0).sum(axis=1)
+    table['ac'] = distinct - (FRONT_PICK - 1)
+
+    # 连号
+    adjacent = np.diff(nums, axis=1) == 1
+    table['consec_pairs'] = adjacent.sum(axis=1)
+    run = np.ones(TOTAL_COMBINATIONS, dtype=np.uint8)
+    max_run = run.copy()
+    for col in range(FRONT_PICK - 1):
+        run = np.where(adjacent[:, col], run + 1, 1).astype(np.uint8)
+        np.maximum(max_run, run, out=max_run)
+    table['max_run'] = max_run
+
+    one = np.uint64(1)
+    table['mask'] = np.bitwise_or.reduce(one << (numbers.astype(np.uint64) - one), axis=1)
+
+    return table
+
+
+def save_combination_table(path: Optional[str] = None) -> str:
+    """
+    生成并保存组合表（先写临时文件再原子替换）
+
+    Args:
+        path: 保存路径，默认 get_table_path()
+
+    Returns:
+        实际保存路径
+    """
+    path = path or get_table_path()
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+    table = build_combination_table()
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    with open(temp_path, 'wb') as f:
+        np.save(f, table)
+    os.replace(temp_path, path)
+
+    return path
+
+
+def load_combination_table(path: Optional[str] = None) -> np.ndarray:
+    """
+    加载组合表（内存映射，只读）；文件不存在时先生成
+
+    Args:
+        path: 文件路径，默认 get_table_path()
+
+    Returns:
+        结构化数组（np.memmap）
+    """
+    global _table
+
+    if _table is not None and path is None:
+        return _table
+
+    with _lock:
+        if _table is not None and path is None:
+            return _table
+
+        table_path = path or get_table_path()
+        if not os.path.exists(table_path):
+            print(f"🧮 生成前区组合表: {table_path}")
+            save_combination_table(table_path)
+
+        table = np.load(table_path, mmap_mode='r')
+        if table.dtype != COMBO_DTYPE or table.shape != (TOTAL_COMBINATIONS,):
+            print(f"⚠️  组合表格式不匹配，重新生成: {table_path}")
+            save_combination_table(table_path)
+            table = np.load(table_path, mmap_mode='r')
+
+        if path is None:
+            _table = table
+        return table
+
+
+def numbers_to_mask(numbers: Sequence[int]) -> np.uint64:
+    """号码列表 -> 位掩码"""
+    mask = 0
+    for n in numbers:
+        mask |= 1 << (int(n) - 1)
+    return np.uint64(mask)
+
+
+def _range_mask(column: np.ndarray, value_range: Optional[Tuple[Optional[int], Optional[int]]]) -> Optional[np.ndarray]:
+    """闭区间过滤（上下界均可为None）"""
+    if value_range is None:
+        return None
+    low, high = value_range
+    mask = None
+    if low is not None:
+        mask = column >= low
+    if high is not None:
+        upper = column <= high
+        mask = upper if mask is None else mask & upper
+    return mask
+
+
+def filter_mask(table: Optional[np.ndarray] = None,
+                sum_range: Optional[Tuple[Optional[int], Optional[int]]] = None,
+                span_range: Optional[Tuple[Optional[int], Optional[int]]] = None,
+                odd_counts: Optional[Sequence[int]] = None,
+                big_counts: Optional[Sequence[int]] = None,
+                ac_range: Optional[Tuple[Optional[int], Optional[int]]] = None,
+                max_run: Optional[int] = None,
+                include: Optional[Sequence[int]] = None,
+                exclude: Optional[Sequence[int]] = None) -> np.ndarray:
+    """
+    按结构条件生成布尔掩码
+
+    例：和值80-120、奇数2-3个、跨度>=20、无三连号
+        filter_mask(sum_range=(80, 120), odd_counts=[2, 3], span_range=(20, None), max_run=2)
+
+    Args:
+        table: 组合表，默认使用全局内存映射表
+        sum_range: 和值闭区间
+        span_range: 跨度闭区间
+        odd_counts: 允许的奇数个数
+        big_counts: 允许的大号个数
+        ac_range: AC值闭区间
+        max_run: 最长连号长度上限
+        include: 必须包含的号码（胆码）
+        exclude: 必须排除的号码
+
+    Returns:
+        长度为 324632 的布尔数组
+    """
+    if table is None:
+        table = load_combination_table()
+
+    masks = [
+        _range_mask(table['sum'], sum_range),
+        _range_mask(table['span'], span_range),
+        _range_mask(table['ac'], ac_range),
+    ]
+    if odd_counts is not None:
+        masks.append(np.isin(table['odd'], list(odd_counts)))
+    if big_counts is not None:
+        masks.append(np.isin(table['big'], list(big_counts)))
+    if max_run is not None:
+        masks.append(table['max_run'] <= max_run)
+
+    if include or exclude:
+        bits = table['mask']
+        if include:
+            required = numbers_to_mask(include)
+            masks.append((bits & required) == required)
+        if exclude:
+            masks.append((bits & numbers_to_mask(exclude)) == 0)
+
+    result = np.ones(len(table), dtype=bool)
+    for mask in masks:
+        if mask is not None:
+            result &= mask
+    return result
+
+
+def count_matching(**filters) -> int:
+    """统计满足条件的组合数（参数同 filter_mask）"""
+    return int(np.count_nonzero(filter_mask(**filters)))
+
+
+def sample_matching(k: int, seed: Optional[int] = None, **filters) -> np.ndarray:
+    """
+    从满足条件的组合中均匀无放回抽取k注
+
+    Args:
+        k: 抽取注数（超过匹配数时返回全部）
+        seed: 随机种子
+        **filters: 过滤条件（同 filter_mask）
+
+    Returns:
+        形状为 (k, 5) 的号码矩阵
+    """
+    table = filters.pop('table', None)
+    if table is None:
+        table = load_combination_table()
+
+    candidates = np.flatnonzero(filter_mask(table, **filters))
+    k = min(k, len(candidates))
+    rng = np.random.default_rng(seed)
+    chosen = np.sort(rng.choice(candidates, size=k, replace=False))
+    return np.asarray(table['numbers'][chosen])
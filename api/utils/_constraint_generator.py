@@ -0,0 +1,259 @@
+"""
+约束驱动的号码生成
+- 在前区全组合表上用向量化掩码剪枝（和值、奇偶、三区分布、与上期重号、排除号码等）
+- 在剩余候选中按模型概率打分，返回概率最高的前N注
+- 不做逐注拒绝采样，约束再严格也只需一次掩码计算
+"""
+import itertools
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from utils._combination_table import load_combination_table, filter_mask
+
+
+# 单次请求最多返回的注数
+MAX_CONSTRAINED_TICKETS = 1000
+
+# 前区三区划分：1-12 / 13-24 / 25-35
+FRONT_ZONES = ((1, 12), (13, 24), (25, 35))
+
+# 后区全部 C(12,2) = 66 种组合
+BACK_PAIRS = np.array(list(itertools.combinations(range(1, 13), 2)), dtype=np.uint8)
+
+# 概率下限（避免 log(0)）
+MIN_PROBA = 1e-12
+
+# 约束名 -> 取值形状
+RANGE_CONSTRAINTS = ('sum_range', 'span_range', 'ac_range')
+COUNTS_CONSTRAINTS = ('odd_counts', 'big_counts')
+INT_CONSTRAINTS = ('max_run', 'max_overlap_last')
+NUMBERS_CONSTRAINTS = {'include': 35, 'exclude': 35, 'exclude_back': 12}
+SUPPORTED_CONSTRAINTS = (RANGE_CONSTRAINTS + COUNTS_CONSTRAINTS + INT_CONSTRAINTS
+                         + tuple(NUMBERS_CONSTRAINTS) + ('zone_distribution',))
+
+
+def _as_range(value) -> tuple:
+    """int -> (v, v)；[lo, hi] -> (lo, hi)"""
+    if value is None:
+        return None
+    if isinstance(value, (list, tuple)):
+        low, high = value
+        return (low, high)
+    return (int(value), int(value))
+
+
+def _as_int(name: str, value) -> int:
+    """整数校验（拒绝布尔值和小数）"""
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError(f"{name} 必须是整数: {value!r}")
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} 必须是整数: {value!r}") from None
+
+
+def _validate_range(name: str, value) -> list:
+    """[最小, 最大]，端点可为 null；单个整数视为 [v, v]"""
+    if not isinstance(value, (list, tuple)):
+        value = _as_int(name, value)
+        return [value, value]
+    if len(value) != 2:
+        raise ValueError(f"{name} 必须是 [最小, 最大]: {value!r}")
+    low, high = (None if v is None else _as_int(name, v) for v in value)
+    if low is not None and high is not None and low > high:
+        raise ValueError(f"{name} 下限大于上限: {value!r}")
+    return [low, high]
+
+
+def validate_constraints(constraints: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    校验并规范化约束字典（形状见 constrained_top_tickets）
+
+    Args:
+        constraints: 约束字典，None 视为无约束
+
+    Returns:
+        规范化后的约束字典（整数、列表）
+
+    Raises:
+        ValueError: 约束名未知或取值形状不对
+    """
+    if constraints is None:
+        return {}
+    if not isinstance(constraints, dict):
+        raise ValueError(f"constraints 必须是对象: {constraints!r}")
+
+    unknown = sorted(set(constraints) - set(SUPPORTED_CONSTRAINTS))
+    if unknown:
+        raise ValueError(f"不支持的约束: {', '.join(map(str, unknown))}")
+
+    result: Dict[str, Any] = {}
+    for name, value in constraints.items():
+        if value is None:
+            continue
+        if name in RANGE_CONSTRAINTS:
+            result[name] = _validate_range(name, value)
+        elif name in COUNTS_CONSTRAINTS:
+            values = value if isinstance(value, (list, tuple)) else [value]
+            result[name] = [_as_int(name, v) for v in values]
+        elif name in INT_CONSTRAINTS:
+            result[name] = _as_int(name, value)
+        elif name in NUMBERS_CONSTRAINTS:
+            if not isinstance(value, (list, tuple)):
+                raise ValueError(f"{name} 必须是号码列表: {value!r}")
+            limit = NUMBERS_CONSTRAINTS[name]
+            numbers = [_as_int(name, v) for v in value]
+            if any(not 1 <= v <= limit for v in numbers):
+                raise ValueError(f"{name} 号码必须在 1..{limit} 之间: {value!r}")
+            result[name] = numbers
+        else:
+            if not isinstance(value, (list, tuple)) or len(value) != len(FRONT_ZONES):
+                raise ValueError("zone_distribution 必须包含3个区间（1-12/13-24/25-35）")
+            result[name] = [None if v is None else _validate_range(name, v) for v in value]
+    return result
+
+
+def _zone_counts_mask(numbers: np.ndarray, zone_distribution: Sequence) -> np.ndarray:
+    """
+    三区分布过滤
+
+    Args:
+        numbers: (N, 5) 候选号码
+        zone_distribution: 长度为3，每项为固定个数或 [最少, 最多]
+
+    Returns:
+        (N,) 布尔掩码
+    """
+    if len(zone_distribution) != len(FRONT_ZONES):
+        raise ValueError("zone_distribution 必须包含3个区间（1-12/13-24/25-35）")
+
+    mask = np.ones(len(numbers), dtype=bool)
+    for (low_num, high_num), spec in zip(FRONT_ZONES, zone_distribution):
+        value_range = _as_range(spec)
+        if value_range is None:
+            continue
+        counts = ((numbers >= low_num) & (numbers <= high_num)).sum(axis=1)
+        low, high = value_range
+        if low is not None:
+            mask &= counts >= low
+        if high is not None:
+            mask &= counts <= high
+    return mask
+
+
+def _log_proba(proba: Sequence[float], size: int) -> np.ndarray:
+    """概率向量取对数"""
+    p = np.asarray(proba, dtype=np.float64)
+    if p.shape != (size,):
+        raise ValueError(f"概率向量长度必须为 {size}")
+    return np.log(np.maximum(p, MIN_PROBA))
+
+
+def _top_indices(scores: np.ndarray, n: int) -> np.ndarray:
+    """得分最高的n个下标（按得分降序）"""
+    n = min(n, len(scores))
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+    top = np.argpartition(-scores, n - 1)[:n] if n < len(scores) else np.arange(len(scores))
+    return top[np.argsort(-scores[top], kind='stable')]
+
+
+def constrained_top_tickets(front_proba: Sequence[float], back_proba: Sequence[float], n: int,
+                            constraints: Optional[Dict[str, Any]] = None,
+                            last_draw: Optional[Sequence[int]] = None) -> Dict[str, Any]:
+    """
+    返回满足全部约束、联合概率最高的前N注
+
+    支持的约束（均可省略）：
+        sum_range: [最小和值, 最大和值]
+        span_range: [最小跨度, 最大跨度]
+        odd_counts: 允许的前区奇数个数列表，如 [2, 3]
+        big_counts: 允许的前区大号个数列表
+        ac_range: [最小AC值, 最大AC值]
+        max_run: 最长连号上限
+        zone_distribution: 三区个数，如 [2, 2, 1] 或 [[1, 2], [1, 3], [0, 2]]
+        max_overlap_last: 与上期前区最多重复个数
+        include: 前区胆码
+        exclude: 前区排除号码
+        exclude_back: 后区排除号码
+
+    Args:
+        front_proba: 前区35个号码的概率
+        back_proba: 后区12个号码的概率
+        n: 返回注数
+        constraints: 约束字典
+        last_draw: 上期前区号码（max_overlap_last 使用）
+
+    Returns:
+        {'tickets': [...], 'front_candidates': int, 'back_candidates': int}
+
+    Raises:
+        ValueError: 约束不合法（见 validate_constraints）
+    """
+    constraints = validate_constraints(constraints)
+    n = max(0, min(int(n), MAX_CONSTRAINED_TICKETS))
+
+    front_log = _log_proba(front_proba, 35)
+    back_log = _log_proba(back_proba, 12)
+
+    # 1. 表内属性过滤（一次向量化掩码）
+    table = load_combination_table()
+    mask = filter_mask(
+        table,
+        sum_range=_as_range(constraints.get('sum_range')),
+        span_range=_as_range(constraints.get('span_range')),
+        odd_counts=constraints.get('odd_counts'),
+        big_counts=constraints.get('big_counts'),
+        ac_range=_as_range(constraints.get('ac_range')),
+        max_run=constraints.get('max_run'),
+        include=constraints.get('include'),
+        exclude=constraints.get('exclude'),
+    )
+    candidates = np.flatnonzero(mask)
+
+    # 2. 需要号码本身的约束只在剩余候选上计算
+    numbers = np.asarray(table['numbers'][candidates])
+
+    keep = np.ones(len(candidates), dtype=bool)
+    if constraints.get('zone_distribution') is not None:
+        keep &= _zone_counts_mask(numbers, constraints['zone_distribution'])
+
+    max_overlap = constraints.get('max_overlap_last')
+    if max_overlap is not None and last_draw:
+        overlap = np.isin(numbers, np.asarray(last_draw, dtype=np.uint8)).sum(axis=1)
+        keep &= overlap <= int(max_overlap)
+
+    numbers = numbers[keep]
+
+    # 3. 前区打分，取前N
+    front_scores = front_log[numbers.astype(np.intp) - 1].sum(axis=1)
+    front_top = _top_indices(front_scores, n)
+
+    # 4. 后区打分（66种组合）
+    back_pairs = BACK_PAIRS
+    if constraints.get('exclude_back'):
+        excluded = np.asarray(constraints['exclude_back'], dtype=np.uint8)
+        back_pairs = back_pairs[~np.isin(back_pairs, excluded).any(axis=1)]
+    back_scores = back_log[back_pairs.astype(np.intp) - 1].sum(axis=1)
+    back_top = _top_indices(back_scores, n)
+
+    # 5. 联合得分 = 前区得分 + 后区得分；前N注必然落在各自前N之内
+    tickets: List[Dict[str, Any]] = []
+    if len(front_top) and len(back_top):
+        joint = front_scores[front_top][:, None] + back_scores[back_top][None, :]
+        flat_top = _top_indices(joint.ravel(), n)
+        rows, cols = np.unravel_index(flat_top, joint.shape)
+
+        for row, col in zip(rows.tolist(), cols.tolist()):
+            tickets.append({
+                'front_zone': numbers[front_top[row]].tolist(),
+                'back_zone': back_pairs[back_top[col]].tolist(),
+                'log_score': round(float(joint[row, col]), 4)
+            })
+
+    return {
+        'tickets': tickets,
+        'front_candidates': int(len(numbers)),
+        'back_candidates': int(len(back_pairs))
+    }
@@ -1,14 +1,24 @@
 """
 从腾讯云COS加载数据和模型
 支持：
+- 树模型服务格式 (.rf.npz / .xgb.npz) - 不需要 scikit-learn，存在时优先加载
 - scikit-learn/xgboost 模型 (.pkl格式)
-- ONNX 模型 (.onnx格式) - 用于LSTM/Transformer
+- ONNX 模型 (.onnx格式) - 用于LSTM/Transformer，ONNX_MODEL_VARIANT=int8 时优先加载量化模型 (.int8.onnx)
+- LSTM/Transformer 的纯 NumPy 权重 (.nn.npz) - 未安装 onnxruntime 时使用
 提供缓存机制以减少COS请求次数
+失败的加载按产物进入负缓存（断路器），指数退避后才重新尝试
+COS上存在模型bundle时优先从bundle读取模型，bundle版本变化时模型缓存失效
+已加载的模型记录内存占用，设置 MODEL_MEMORY_BUDGET_MB 时按最近最少使用淘汰
+新加载的模型先用合成输入预热推理一次（MODEL_WARMUP），预热耗时与加载耗时分开统计
 """
 import os
 import sys
 import pickle
+import importlib.util
 import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
 
@@ -16,6 +26,16 @@ from datetime import datetime, timedelta
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from utils.tencent_cos import get_cos_client
+from utils._deadline import Deadline, DeadlineExceeded, check_deadline
+from utils._onnx_session import get_session_profile, optimized_model_path, create_session
+from utils._model_bundle import (
+    BUNDLE_COS_PATH, MANIFEST_COS_PATH, BUNDLE_FORMAT_VERSION, decode_member, extract_member, member_range
+)
+from utils._tree_serving import serving_suffix, load_serving_model
+from utils._numpy_nets import NN_SUFFIX, load_net
+from utils._onnx_quantize import INT8_SUFFIX
+from utils._model_memory import ModelMemory, current_rss, array_bytes, onnx_initializer_bytes
+from utils._model_warmup import warmup as warmup_inference
 
 
 # 全局缓存
@@ -24,16 +44,138 @@ _cache = {
     'lottery_data_timestamp': None,
     'models': {},
     'onnx_sessions': {},  # ONNX推理会话缓存
+    'onnx_load_info': {},  # ONNX模型加载方式与耗时
+    'warmup': {},  # 模型预热推理耗时（不计入加载耗时）
+    'preload': None,  # 最近一次并行预加载的报告
+    'prediction_artifacts': {},  # 预计算预测缓存（按目标期号）
+    'circuit_breakers': {},  # 加载失败的产物（负缓存）
+    'bundle': {'manifest': None, 'timestamp': None, 'data': None},  # 模型bundle清单与预加载时的完整内容
+    'models_info_version': None,  # 没有bundle时的模型版本（models_info.json 的ETag）
     'cache_ttl': 3600  # 缓存有效期：1小时
 }
 
+# 断路器：首次失败后退避 BREAKER_BASE_DELAY 秒，每次连续失败翻倍，最长 BREAKER_MAX_DELAY 秒
+BREAKER_BASE_DELAY = 30
+BREAKER_MAX_DELAY = 3600
 
-def get_lottery_data(force_refresh: bool = False) -> List[Dict]:
+# 预计算预测不存在时的负缓存时间（秒）：两次开奖之间下一期产物尚未发布是正常状态，
+# 只短暂缓存、不累计退避，产物发布后很快就能读到
+ARTIFACT_MISSING_TTL = float(os.getenv('ARTIFACT_MISSING_TTL', '60'))
+
+# COS返回"对象不存在"时的错误标识
+_MISSING_MARKERS = ('NoSuchKey', '404', 'Not Found')
+
+_breaker_lock = threading.Lock()
+
+# 发起一次COS下载所需的最少剩余预算（秒）
+COS_LOAD_MIN_SECONDS = 1.0
+
+# ONNX模型磁盘缓存目录；为空时模型只在内存中加载
+MODEL_CACHE_DIR = os.getenv('MODEL_CACHE_DIR', '')
+
+# 是否优先从模型bundle加载（COS上没有bundle时自动回退到单独的模型文件）
+MODEL_BUNDLE_ENABLED = os.getenv('MODEL_BUNDLE', '1').lower() in ('1', 'true', 'yes')
+
+# 是否优先加载树模型的服务格式（*.rf.npz / *.xgb.npz），不存在时回退到 .pkl
+MODEL_SERVING_FORMAT_ENABLED = os.getenv('MODEL_SERVING_FORMAT', '1').lower() in ('1', 'true', 'yes')
+
+# LSTM/Transformer 推理引擎：onnx / numpy / auto（默认，安装了 onnxruntime 时用 onnx，否则用 numpy）
+NN_ENGINE = os.getenv('NN_ENGINE', 'auto').lower()
+
+# ONNX 模型版本：fp32（默认）/ int8（量化模型更小，适合内存受限的函数；不存在时回退到fp32）
+ONNX_MODEL_VARIANT = os.getenv('ONNX_MODEL_VARIANT', 'fp32').lower()
+
+# 预加载需要的成员占bundle大小的比例达到该值时，一次下载整个bundle，否则按成员Range读取
+BUNDLE_FULL_FETCH_RATIO = 0.5
+
+_bundle_lock = threading.Lock()
+
+# 模型加载后的预热推理：sync（默认，加载时同步完成）/ background（后台线程，不阻塞加载）/ off
+MODEL_WARMUP = os.getenv('MODEL_WARMUP', 'sync').lower()
+
+_warmup_pool: Optional[ThreadPoolExecutor] = None
+_warmup_lock = threading.Lock()
+
+# 已加载模型的内存统计（按最近使用排序）与淘汰回调
+_memory = ModelMemory()
+_eviction_listeners = []
+
+# 并行预加载模型的最大线程数（默认与模型总数相同，全部模型同时下载）
+PRELOAD_MAX_WORKERS = int(os.getenv('MODEL_PRELOAD_WORKERS', '8'))
+
+
+class ArtifactUnavailableError(Exception):
+    """产物处于断路状态（近期加载失败，退避期内不再请求COS）"""
+
+
+def _breaker_check(key: str):
+    """
+    请求COS前检查断路器
+
+    断开状态且未到重试时间：直接抛出 ArtifactUnavailableError；
+    到达重试时间：只放行一个探测请求（半开），其余请求继续跳过
+
+    Args:
+        key: 产物标识（如 onnx:transformer_back）
+    """
+    with _breaker_lock:
+        breaker = _cache['circuit_breakers'].get(key)
+        if breaker is None:
+            return
+
+        now = time.monotonic()
+        if breaker['state'] == 'open' and now >= breaker['retry_at']:
+            breaker['state'] = 'half_open'
+            return
+
+        retry_in = max(0.0, breaker['retry_at'] - now)
+        raise ArtifactUnavailableError(
+            f"{key} 断路中（连续失败{breaker['failures']}次，{retry_in:.0f}秒后重试）: {breaker['last_error']}"
+        )
+
+
+def _breaker_failure(key: str, error: Exception, missing_delay: Optional[float] = None):
+    """
+    记录一次加载失败，按连续失败次数指数退避
+
+    Args:
+        key: 产物标识
+        error: 加载异常
+        missing_delay: 设置时，对象不存在按固定时间负缓存，不累计失败次数（传输错误仍指数退避）
+    """
+    message = str(error)
+    missing = any(marker in message for marker in _MISSING_MARKERS)
+    with _breaker_lock:
+        breaker = _cache['circuit_breakers'].setdefault(key, {'failures': 0})
+        if missing and missing_delay is not None:
+            delay = missing_delay
+        else:
+            breaker['failures'] += 1
+            delay = min(BREAKER_BASE_DELAY * 2 ** (breaker['failures'] - 1), BREAKER_MAX_DELAY)
+        breaker.update({
+            'state': 'open',
+            'retry_at': time.monotonic() + delay,
+            'backoff': delay,
+            'missing': missing,
+            'last_error': message[:200],
+            'last_failure': datetime.now().isoformat()
+        })
+    print(f"🚫 {key} 加载失败，{delay}秒内不再尝试")
+
+
+def _breaker_success(key: str):
+    """加载成功后关闭断路器"""
+    with _breaker_lock:
+        _cache['circuit_breakers'].pop(key, None)
+
+
+def get_lottery_data(force_refresh: bool = False, deadline: Optional[Deadline] = None) -> List[Dict]:
     """
     从COS获取彩票历史数据（带缓存）
 
     Args:
         force_refresh: 是否强制刷新缓存
+        deadline: 请求时间预算；不足以下载时返回过期缓存，无缓存则抛出 DeadlineExceeded
 
     Returns:
         彩票历史数据列表
@@ -48,6 +190,13 @@ def get_lottery_data(force_refresh: bool = False) -> List[Dict]:
                 print(f"📦 使用缓存数据（缓存时间: {cache_age:.0f}秒）")
                 return _cache['lottery_data']
 
+        # 缓存已过期但预算不足：继续使用过期缓存
+        if deadline is not None and not deadline.has(COS_LOAD_MIN_SECONDS):
+            deadline.skip('lottery_data_refresh', 'stale_cache')
+            return _cache['lottery_data']
+
+    check_deadline(deadline, 'lottery_data_load', COS_LOAD_MIN_SECONDS, 'local_backup')
+
     # 从COS加载
     print("📥 从腾讯云COS加载彩票数据...")
 
@@ -94,72 +243,506 @@ def get_lottery_data(force_refresh: bool = False) -> List[Dict]:
         return lottery_data
 
 
-def load_onnx_model(model_name: str, force_refresh: bool = False) -> Any:
+def register_eviction_listener(listener):
+    """
+    注册模型淘汰回调：模型因超出内存预算被淘汰时以模型名称列表调用，
+    持有模型引用的一方（预测器）需要同时释放，内存才会真正回收
+    """
+    if listener not in _eviction_listeners:
+        _eviction_listeners.append(listener)
+
+
+def touch_model(model_name: str):
+    """记录一次模型使用（预测器推理时调用，用于LRU排序与命中统计）"""
+    _memory.touch(model_name)
+
+
+def _record_model(model_name: str, kind: str, rss_before: Optional[int], **sizes):
+    """记录刚加载的模型占用，超出预算时淘汰最近最少使用的模型"""
+    rss_after = current_rss()
+    rss_delta = rss_after - rss_before if rss_before is not None and rss_after is not None else None
+    evicted = _memory.record(model_name, kind, rss_delta=rss_delta, **sizes)
+    if not evicted:
+        return
+
+    for name in evicted:
+        _cache['models'].pop(name, None)
+        _cache['onnx_sessions'].pop(name, None)
+        _cache['onnx_load_info'].pop(name, None)
+        _cache['warmup'].pop(name, None)
+    print(f"🧹 超出模型内存预算，已淘汰: {', '.join(evicted)}")
+    for listener in _eviction_listeners:
+        try:
+            listener(evicted)
+        except Exception as e:
+            print(f"⚠️  模型淘汰回调失败: {str(e)}")
+
+
+def _invalidate_models(reason: str):
+    """清除已加载的模型和ONNX会话（模型版本变化时调用）"""
+    _cache['models'].clear()
+    _cache['onnx_sessions'].clear()
+    _cache['onnx_load_info'].clear()
+    _cache['warmup'].clear()
+    _memory.clear()
+    _cache['bundle']['data'] = None
+    print(f"♻️  模型缓存已失效: {reason}")
+
+
+def get_bundle_manifest(force_refresh: bool = False, deadline: Optional[Deadline] = None,
+                        max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """
+    获取模型bundle清单（带缓存，过期后重新下载）
+
+    清单版本变化时清除已加载的模型，之后的加载会读取新bundle
+
+    Args:
+        force_refresh: 是否强制刷新缓存（同时跳过断路器）
+        deadline: 请求时间预算；不足以下载时继续使用已缓存的清单
+        max_age: 缓存最长有效秒数（默认 cache_ttl），0 表示重新下载但仍遵守断路器
+
+    Returns:
+        清单字典；未启用或COS上没有bundle时返回None
+    """
+    if not MODEL_BUNDLE_ENABLED:
+        return None
+
+    ttl = _cache['cache_ttl'] if max_age is None else min(max_age, _cache['cache_ttl'])
+    bundle = _cache['bundle']
+    with _bundle_lock:
+        if not force_refresh and bundle['timestamp'] is not None:
+            cache_age = (datetime.now() - bundle['timestamp']).total_seconds()
+            if cache_age < ttl:
+                return bundle['manifest']
+            if deadline is not None and not deadline.has(COS_LOAD_MIN_SECONDS):
+                deadline.skip('bundle_manifest_refresh', 'stale_cache')
+                return bundle['manifest']
+
+        breaker_key = 'bundle:manifest'
+        try:
+            if not force_refresh:
+                _breaker_check(breaker_key)
+            manifest = get_cos_client().download_json(MANIFEST_COS_PATH)
+            if manifest.get('format_version') != BUNDLE_FORMAT_VERSION:
+                raise ValueError(f"不支持的bundle格式版本: {manifest.get('format_version')}")
+            _breaker_success(breaker_key)
+        except ArtifactUnavailableError:
+            return bundle['manifest']
+        except Exception as e:
+            # 没有bundle时回退到单独的模型文件，断路器避免每次都请求清单
+            print(f"⚠️  模型bundle不可用，使用单独的模型文件: {str(e)}")
+            _breaker_failure(breaker_key, e)
+            return bundle['manifest']
+
+        previous = bundle['manifest']
+        if previous is not None and previous['version'] != manifest['version']:
+            _invalidate_models(f"bundle版本 {previous['version']} -> {manifest['version']}")
+
+        bundle['manifest'] = manifest
+        bundle['timestamp'] = datetime.now()
+        return manifest
+
+
+def _models_info_version(refresh: bool = False) -> Optional[str]:
+    """
+    没有bundle时的模型版本：models_info.json 的ETag（每次训练上传都会变化）
+
+    Args:
+        refresh: 是否重新读取ETag（HEAD请求）
+
+    Returns:
+        版本标识；无法读取时返回上次的值
+    """
+    previous = _cache['models_info_version']
+    if previous is not None and not refresh:
+        return previous
+
+    try:
+        version = 'info-' + _model_etag(get_cos_client(), 'models/models_info.json')
+    except Exception as e:
+        print(f"⚠️  无法读取模型信息版本: {str(e)}")
+        return previous
+
+    if previous is not None and previous != version:
+        _invalidate_models(f"models_info 版本 {previous} -> {version}")
+    _cache['models_info_version'] = version
+    return version
+
+
+def get_models_version() -> Optional[str]:
+    """当前模型版本：bundle清单版本，没有bundle时为 models_info.json 的ETag"""
+    manifest = get_bundle_manifest()
+    return manifest['version'] if manifest else _models_info_version()
+
+
+def poll_models_version() -> Optional[str]:
+    """
+    重新检查COS上的模型版本（模型注册表定期在后台调用）
+
+    有bundle时重新下载清单（几KB），否则只读取 models_info.json 的ETag；
+    版本变化时清除加载器中的模型缓存，之后的加载读取新版本
+
+    Returns:
+        最新模型版本
+    """
+    manifest = get_bundle_manifest(max_age=0)
+    return manifest['version'] if manifest else _models_info_version(refresh=True)
+
+
+def _bundle_member(client, model_name: str) -> Optional[tuple]:
+    """
+    从bundle读取一个模型的内容：预加载时已下载完整bundle则直接切片，否则按偏移发起Range请求
+
+    Args:
+        client: COS客户端
+        model_name: 模型名称
+
+    Returns:
+        (模型字节, 清单条目)；bundle中没有该模型时返回None
+    """
+    manifest = get_bundle_manifest()
+    if manifest is None or model_name not in manifest['members']:
+        return None
+
+    entry = manifest['members'][model_name]
+    data = _cache['bundle']['data']
+    if data is not None:
+        return extract_member(data, entry), entry
+
+    start, end = member_range(entry)
+    return decode_member(client.download_range(BUNDLE_COS_PATH, start, end), entry), entry
+
+
+def get_nn_engine() -> str:
+    """LSTM/Transformer 实际使用的推理引擎（'onnx' 或 'numpy'）"""
+    if NN_ENGINE != 'auto':
+        return NN_ENGINE
+    # 只查找不导入：onnxruntime 的导入本身就是冷启动开销
+    return 'onnx' if importlib.util.find_spec('onnxruntime') is not None else 'numpy'
+
+
+def _bundle_key(manifest: Dict[str, Any], model_name: str) -> Optional[str]:
+    """模型在bundle中实际会读取的成员（优先服务格式），不在bundle中返回None"""
+    if 'lstm' in model_name or 'transformer' in model_name:
+        if get_nn_engine() == 'numpy':
+            suffix = NN_SUFFIX
+        else:
+            suffix = INT8_SUFFIX if ONNX_MODEL_VARIANT == 'int8' else None
+    else:
+        suffix = serving_suffix(model_name) if MODEL_SERVING_FORMAT_ENABLED else None
+    if suffix and model_name + suffix in manifest['members']:
+        return model_name + suffix
+    return model_name if model_name in manifest['members'] else None
+
+
+def _fetch_full_bundle(model_names: List[str], deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
+    """
+    预加载前判断是否一次下载整个bundle（需要的成员足够多时比逐个Range请求更快）
+
+    Args:
+        model_names: 待加载的模型
+        deadline: 请求时间预算
+
+    Returns:
+        下载报告；未下载时返回None
+    """
+    manifest = get_bundle_manifest(deadline=deadline)
+    if manifest is None or _cache['bundle']['data'] is not None:
+        return None
+
+    needed = [
+        key for key in (_bundle_key(manifest, name) for name in model_names
+                        if name not in _cache['models'] and name not in _cache['onnx_sessions'])
+        # 磁盘缓存模式下ONNX模型可能已有本地文件，不计入
+        if key and not (MODEL_CACHE_DIR and manifest['members'][key]['format'] == 'onnx')
+    ]
+    needed_size = sum(manifest['members'][name]['size'] for name in needed)
+    if len(needed) < 2 or needed_size < BUNDLE_FULL_FETCH_RATIO * manifest.get('bundle_size', needed_size):
+        return None
+
+    try:
+        check_deadline(deadline, 'load_model_bundle', COS_LOAD_MIN_SECONDS, 'ranged_reads')
+        start = time.perf_counter()
+        data = get_cos_client().download_bytes(BUNDLE_COS_PATH)
+        if len(data) != manifest.get('bundle_size', len(data)):
+            raise ValueError(f"bundle大小与清单不符: {len(data)}")
+    except DeadlineExceeded:
+        return None
+    except Exception as e:
+        print(f"⚠️  下载完整bundle失败，改为按成员读取: {str(e)}")
+        return None
+
+    _cache['bundle']['data'] = data
+    return {
+        'version': manifest['version'],
+        'members': len(needed),
+        'size': len(data),
+        'ms': round((time.perf_counter() - start) * 1000, 1)
+    }
+
+
+def _model_etag(client, cos_path: str) -> str:
+    """COS对象ETag（可用作文件名的形式），用于区分模型版本"""
+    return client.get_object_info(cos_path)['etag'].replace('-', '_') or 'latest'
+
+
+def _get_cached_model_file(model_name: str, etag: str, fetch) -> str:
+    """
+    获取模型的本地缓存文件，不存在时调用 fetch 下载
+
+    缓存文件名包含对象ETag（或bundle成员的sha256），模型更新后自动使用新文件
+
+    Args:
+        model_name: 模型名称
+        etag: 模型版本标识
+        fetch: 返回模型字节的函数
+
+    Returns:
+        本地文件路径
+    """
+    path = os.path.join(MODEL_CACHE_DIR, f'{model_name}.{etag}.onnx')
+
+    if os.path.exists(path):
+        print(f"💾 使用磁盘缓存模型: {path}")
+        return path
+
+    data = fetch()
+    os.makedirs(MODEL_CACHE_DIR, exist_ok=True)
+
+    # 先写临时文件再原子替换，避免并发进程读到不完整的文件
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+    return path
+
+
+def _load_numpy_net(model_name: str, breaker_key: str) -> Any:
+    """
+    加载 LSTM/Transformer 的纯 NumPy 权重（*.nn.npz），接口与ONNX会话相同
+
+    Args:
+        model_name: 模型名称
+        breaker_key: 断路器键（与ONNX加载共用）
+
+    Returns:
+        NumpyNet 对象
+    """
+    print(f"📥 从腾讯云COS加载NumPy网络: {model_name}")
+
+    try:
+        client = get_cos_client()
+        key = model_name + NN_SUFFIX
+        start = time.perf_counter()
+
+        member = _bundle_member(client, key)
+        source = 'bundle' if member is not None else 'object'
+        data = member[0] if member is not None else client.download_bytes(f'models/{key}')
+        rss_before = current_rss()
+        net = load_net(data)
+
+        _cache['onnx_sessions'][model_name] = net
+        _cache['onnx_load_info'][model_name] = {
+            'mode': 'numpy',
+            'source': source,
+            'load_ms': round((time.perf_counter() - start) * 1000, 1)
+        }
+        _record_model(model_name, 'numpy', rss_before, payload_bytes=len(data), weight_bytes=array_bytes(net))
+        _breaker_success(breaker_key)
+
+        print(f"✅ 成功加载NumPy网络: {model_name}（{source}）")
+        return net
+
+    except Exception as e:
+        print(f"❌ 从COS加载NumPy网络失败: {str(e)}")
+        _breaker_failure(breaker_key, e)
+        raise Exception(f"无法加载模型 {model_name}: {str(e)}")
+
+
+def _onnx_object_key(client, model_name: str) -> Optional[str]:
+    """
+    没有bundle时按 ONNX_MODEL_VARIANT 选择单独的对象
+
+    量化模型不存在时进入断路器，之后的冷启动直接使用fp32而不再探测
+
+    Returns:
+        量化模型的对象名；使用fp32时返回None
+    """
+    if ONNX_MODEL_VARIANT != 'int8':
+        return None
+
+    key = model_name + INT8_SUFFIX
+    breaker_key = f'variant:{key}'
+    try:
+        _breaker_check(breaker_key)
+        if client.file_exists(f'models/{key}'):
+            _breaker_success(breaker_key)
+            return key
+        raise FileNotFoundError(f'models/{key} Not Found')
+    except ArtifactUnavailableError:
+        return None
+    except Exception as e:
+        _breaker_failure(breaker_key, e)
+        return None
+
+
+def load_onnx_model(model_name: str, force_refresh: bool = False, deadline: Optional[Deadline] = None) -> Any:
     """
     从COS加载ONNX模型（用于LSTM/Transformer）
 
     Args:
         model_name: 模型名称（如：lstm_front, transformer_back）
         force_refresh: 是否强制刷新缓存
+        deadline: 请求时间预算，不足时抛出 DeadlineExceeded
 
     Returns:
-        ONNX InferenceSession 对象
+        ONNX InferenceSession 对象（NN_ENGINE 为 numpy 时为接口相同的 NumpyNet）
     """
     global _cache
 
     # 检查缓存
     if not force_refresh and model_name in _cache['onnx_sessions']:
         print(f"📦 使用缓存ONNX会话: {model_name}")
+        _memory.touch(model_name)
         return _cache['onnx_sessions'][model_name]
 
+    breaker_key = f'onnx:{model_name}'
+    # 先检查预算再检查断路器：断路器到期后只放行一个探测请求，预算不足时不能消耗掉它
+    check_deadline(deadline, f'load_model:{model_name}', COS_LOAD_MIN_SECONDS, 'fallback')
+    if not force_refresh:
+        _breaker_check(breaker_key)
+
+    if get_nn_engine() == 'numpy':
+        return _load_numpy_net(model_name, breaker_key)
+
     print(f"📥 从腾讯云COS加载ONNX模型: {model_name}")
 
     try:
-        import onnxruntime as ort
-        import tempfile
+        import onnxruntime  # noqa: F401  提前检查依赖
 
         client = get_cos_client()
-        cos_path = f'models/{model_name}.onnx'
-
-        # 下载到临时文件
-        with tempfile.NamedTemporaryFile(suffix='.onnx', delete=False) as f:
-            temp_path = f.name
-
-        try:
-            client.download_file(cos_path, temp_path)
-
-            # 创建ONNX推理会话
-            session = ort.InferenceSession(
-                temp_path,
-                providers=['CPUExecutionProvider']
-            )
+        profile = get_session_profile()
+        start = time.perf_counter()
+
+        manifest = get_bundle_manifest(deadline=deadline)
+        key = _bundle_key(manifest, model_name) if manifest else _onnx_object_key(client, model_name)
+        entry = manifest['members'].get(key) if manifest and key else None
+        source = 'bundle' if entry else 'object'
+        variant = 'int8' if key and key.endswith(INT8_SUFFIX) else 'fp32'
+        cos_path = f'models/{key}' if variant == 'int8' else f'models/{model_name}.onnx'
+        if variant != ONNX_MODEL_VARIANT:
+            print(f"⚠️  未找到 {model_name} 的 {ONNX_MODEL_VARIANT} 模型，使用 fp32")
+
+        if entry:
+            fetch = lambda: _bundle_member(client, key)[0]
+        else:
+            fetch = lambda: client.download_bytes(cos_path)
+
+        if MODEL_CACHE_DIR:
+            # 磁盘缓存：按版本落盘一次，之后由onnxruntime直接读取文件；
+            # 首次加载同时保存优化后的图，已有优化文件时无需下载原始模型
+            etag = entry['sha256'][:16] if entry else _model_etag(client, cos_path)
+            cache_name = model_name if variant == 'fp32' else f'{model_name}.{variant}'
+            optimized_path = optimized_model_path(MODEL_CACHE_DIR, cache_name, etag, profile)
+            model_source = lambda: _get_cached_model_file(cache_name, etag, fetch)
+            mode = 'disk_cache'
+        else:
+            # 内存：模型内容直接作为序列化模型传给onnxruntime，不经过临时文件
+            optimized_path = None
+            model_source, mode = fetch(), 'memory'
+
+        # 按会话配置创建ONNX推理会话
+        rss_before = current_rss()
+        session, optimized = create_session(model_source, optimized_path, profile)
+        if optimized == 'hit':
+            mode = 'optimized_cache'
+
+        # 内存模式统计模型内容，磁盘模式统计实际加载的文件
+        if isinstance(model_source, bytes):
+            model_file, payload_bytes = model_source, len(model_source)
+        elif optimized_path and os.path.exists(optimized_path):
+            model_file, payload_bytes = optimized_path, os.path.getsize(optimized_path)
+        else:
+            model_file, payload_bytes = None, (entry['raw_size'] if entry else None)
 
-            # 更新缓存
-            _cache['onnx_sessions'][model_name] = session
-
-            print(f"✅ 成功加载ONNX模型: {model_name}")
-            return session
+        # 更新缓存
+        _cache['onnx_sessions'][model_name] = session
+        _cache['onnx_load_info'][model_name] = {
+            'mode': mode,
+            'source': source,
+            'variant': variant,
+            'optimized': optimized,
+            'load_ms': round((time.perf_counter() - start) * 1000, 1)
+        }
+        _record_model(model_name, 'onnx', rss_before, payload_bytes=payload_bytes,
+                      initializer_bytes=onnx_initializer_bytes(model_file) if model_file else None)
+        _breaker_success(breaker_key)
 
-        finally:
-            if os.path.exists(temp_path):
-                os.unlink(temp_path)
+        print(f"✅ 成功加载ONNX模型: {model_name}（{source}/{mode}/{variant}）")
+        return session
 
-    except ImportError:
+    except ImportError as e:
         print("❌ onnxruntime 未安装")
+        _breaker_failure(breaker_key, e)
         raise Exception("需要安装 onnxruntime: pip install onnxruntime")
 
     except Exception as e:
         print(f"❌ 从COS加载ONNX模型失败: {str(e)}")
+        _breaker_failure(breaker_key, e)
         raise Exception(f"无法加载ONNX模型 {model_name}: {str(e)}")
 
 
-def load_sklearn_model(model_name: str, force_refresh: bool = False) -> Any:
+def _load_serving_model(client, model_name: str) -> Optional[Any]:
+    """
+    加载树模型的服务格式（不需要 scikit-learn）
+
+    有bundle时只看bundle清单；没有bundle时尝试单独的对象，不存在的对象进入断路器，
+    之后的冷启动不再探测
+
+    Args:
+        client: COS客户端
+        model_name: 模型名称
+
+    Returns:
+        (XGBoostEvaluator / ForestEvaluator, 文件字节数)；没有服务格式或加载失败时返回None（回退到 .pkl）
+    """
+    suffix = serving_suffix(model_name)
+    if not MODEL_SERVING_FORMAT_ENABLED or suffix is None:
+        return None
+
+    key = model_name + suffix
+    breaker_key = f'serving:{model_name}'
+    try:
+        manifest = get_bundle_manifest()
+        if manifest is not None:
+            if key not in manifest['members']:
+                return None
+            data = _bundle_member(client, key)[0]
+        else:
+            _breaker_check(breaker_key)
+            data = client.download_bytes(f'models/{key}')
+
+        model = load_serving_model(data)
+        _breaker_success(breaker_key)
+        return model, len(data)
+
+    except ArtifactUnavailableError:
+        return None
+    except Exception as e:
+        print(f"⚠️  服务格式不可用，回退到pkl: {key}: {str(e)}")
+        _breaker_failure(breaker_key, e)
+        return None
+
+
+def load_sklearn_model(model_name: str, force_refresh: bool = False, deadline: Optional[Deadline] = None) -> Any:
     """
-    从COS加载sklearn/xgboost模型（.pkl格式）
+    从COS加载sklearn/xgboost模型（优先服务格式 .rf.npz / .xgb.npz，否则 .pkl）
 
     Args:
         model_name: 模型名称（如：xgboost_front, random_forest_back）
         force_refresh: 是否强制刷新缓存
+        deadline: 请求时间预算，不足时抛出 DeadlineExceeded
 
     Returns:
         加载的模型对象
@@ -169,43 +752,250 @@ def load_sklearn_model(model_name: str, force_refresh: bool = False) -> Any:
     # 检查缓存
     if not force_refresh and model_name in _cache['models']:
         print(f"📦 使用缓存模型: {model_name}")
+        _memory.touch(model_name)
         return _cache['models'][model_name]
 
+    breaker_key = f'sklearn:{model_name}'
+    # 先检查预算再检查断路器：断路器到期后只放行一个探测请求，预算不足时不能消耗掉它
+    check_deadline(deadline, f'load_model:{model_name}', COS_LOAD_MIN_SECONDS, 'fallback')
+    if not force_refresh:
+        _breaker_check(breaker_key)
+
     print(f"📥 从腾讯云COS加载sklearn模型: {model_name}")
 
     try:
         client = get_cos_client()
         cos_path = f'models/{model_name}.pkl'
+        rss_before = current_rss()
 
-        model = client.download_pickle(cos_path)
+        serving = _load_serving_model(client, model_name)
+        if serving is not None:
+            (model, payload_bytes), file_format = serving, 'serving'
+        else:
+            file_format = 'pkl'
+            member = _bundle_member(client, model_name)
+            data = member[0] if member is not None else client.download_bytes(cos_path)
+            model, payload_bytes = pickle.loads(data), len(data)
 
         # 更新缓存
         _cache['models'][model_name] = model
+        _record_model(model_name, file_format, rss_before, payload_bytes=payload_bytes, weight_bytes=array_bytes(model))
+        _breaker_success(breaker_key)
 
-        print(f"✅ 成功加载sklearn模型: {model_name}")
+        print(f"✅ 成功加载sklearn模型: {model_name}（{file_format}）")
         return model
 
     except Exception as e:
         print(f"❌ 从COS加载sklearn模型失败: {str(e)}")
+        _breaker_failure(breaker_key, e)
         raise Exception(f"无法加载模型 {model_name}: {str(e)}")
 
 
-def load_model_from_cos(model_name: str, force_refresh: bool = False) -> Any:
+def _is_current_model(model_name: str, model: Any) -> bool:
+    """模型是否仍是缓存中的当前对象（未被淘汰或因版本变化失效）"""
+    return _cache['models'].get(model_name) is model or _cache['onnx_sessions'].get(model_name) is model
+
+
+def _run_warmup(model_name: str, model: Any, mode: str) -> Dict[str, Any]:
+    try:
+        info = {'mode': mode, 'status': 'ok', 'ms': round(warmup_inference(model), 1)}
+    except Exception as e:
+        info = {'mode': mode, 'status': 'failed', 'error': str(e)[:200]}
+    info['at'] = datetime.now().isoformat()
+
+    if _is_current_model(model_name, model):
+        _cache['warmup'][model_name] = info
+    return info
+
+
+def warmup_model(model_name: str, model: Any, mode: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    用合成输入对新加载的模型预热推理一次
+
+    Args:
+        model_name: 模型名称
+        model: 模型对象或ONNX会话
+        mode: sync / background / off，默认使用 MODEL_WARMUP
+
+    Returns:
+        预热信息（后台模式为 pending 状态）；关闭时返回None
+    """
+    global _warmup_pool
+
+    mode = mode or MODEL_WARMUP
+    if mode == 'off':
+        return None
+    if mode != 'background':
+        return _run_warmup(model_name, model, mode)
+
+    with _warmup_lock:
+        if _warmup_pool is None:
+            _warmup_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='model-warmup')
+    info = {'mode': mode, 'status': 'pending'}
+    _cache['warmup'][model_name] = info
+    _warmup_pool.submit(_run_warmup, model_name, model, mode)
+    return info
+
+
+def load_model_from_cos(model_name: str, force_refresh: bool = False,
+                        deadline: Optional[Deadline] = None, warmup: bool = True) -> Any:
     """
     从COS加载机器学习模型（自动识别类型）
 
     Args:
         model_name: 模型名称
         force_refresh: 是否强制刷新缓存
+        deadline: 请求时间预算
+        warmup: 新加载的模型是否按 MODEL_WARMUP 预热
 
     Returns:
         加载的模型对象或ONNX会话
     """
+    cached = not force_refresh and (model_name in _cache['models'] or model_name in _cache['onnx_sessions'])
+
     # 根据模型名称判断类型
     if 'lstm' in model_name.lower() or 'transformer' in model_name.lower():
-        return load_onnx_model(model_name, force_refresh)
+        model = load_onnx_model(model_name, force_refresh, deadline)
     else:
-        return load_sklearn_model(model_name, force_refresh)
+        model = load_sklearn_model(model_name, force_refresh, deadline)
+
+    if warmup and not cached:
+        warmup_model(model_name, model)
+    return model
+
+
+def preload_models(model_names: List[str], max_workers: int = PRELOAD_MAX_WORKERS,
+                   deadline: Optional[Deadline] = None, warmup_mode: Optional[str] = None):
+    """
+    并行预加载多个模型（下载 + 反序列化 + 预热），冷启动耗时取决于最慢的模型而不是所有模型之和
+
+    Args:
+        model_names: 模型名称列表
+        max_workers: 最大并发线程数
+        deadline: 请求时间预算
+        warmup_mode: 新加载模型的预热方式，默认使用 MODEL_WARMUP
+
+    Returns:
+        (已加载模型 {名称: 模型对象或ONNX会话}, 每个模型的加载报告)
+    """
+    global _cache
+
+    if not model_names:
+        return {}, {}
+
+    # 先在主线程创建COS客户端并获取bundle清单，避免多个线程同时初始化
+    get_cos_client()
+    bundle_report = _fetch_full_bundle(model_names, deadline)
+
+    def load(model_name):
+        already_cached = model_name in _cache['models'] or model_name in _cache['onnx_sessions']
+        start = time.perf_counter()
+        try:
+            model = load_model_from_cos(model_name, deadline=deadline, warmup=False)
+            status, error = ('cached' if already_cached else 'loaded'), None
+        except (ArtifactUnavailableError, DeadlineExceeded) as e:
+            model, status, error = None, 'skipped', str(e)
+        except Exception as e:
+            model, status, error = None, 'failed', str(e)
+        load_ms = round((time.perf_counter() - start) * 1000, 1)
+
+        # 预热单独计时，不计入加载耗时
+        warmup_info = warmup_model(model_name, model, warmup_mode) if status == 'loaded' else None
+        return model_name, model, {
+            'status': status,
+            'ms': load_ms,
+            'warmup_ms': (warmup_info or {}).get('ms'),
+            'error': error
+        }
+
+    start = time.perf_counter()
+    loaded = {}
+    report = {}
+
+    workers = max(1, min(max_workers, len(model_names)))
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='model-preload') as pool:
+            for model_name, model, info in pool.map(load, model_names):
+                report[model_name] = info
+                if model is not None:
+                    loaded[model_name] = model
+    finally:
+        # 模型已反序列化，释放bundle原始内容
+        _cache['bundle']['data'] = None
+
+    # 超出内存预算时，先加载的模型可能已被后加载的淘汰，只返回仍在缓存中的模型
+    for model_name in list(loaded):
+        if model_name not in _cache['models'] and model_name not in _cache['onnx_sessions']:
+            del loaded[model_name]
+            report[model_name]['status'] = 'evicted'
+
+    total_ms = round((time.perf_counter() - start) * 1000, 1)
+    _cache['preload'] = {
+        'finished_at': datetime.now().isoformat(),
+        'workers': workers,
+        'total_ms': total_ms,
+        'sum_model_ms': round(sum(info['ms'] for info in report.values()), 1),
+        'sum_warmup_ms': round(sum(info['warmup_ms'] or 0 for info in report.values()), 1),
+        'bundle': bundle_report,
+        'models': report
+    }
+
+    print(f"⚡ 并行预加载完成: {len(loaded)}/{len(model_names)} 个模型，耗时 {total_ms:.0f}ms")
+    for model_name, info in report.items():
+        warmup_note = f"，预热 {info['warmup_ms']:.0f}ms" if info['warmup_ms'] is not None else ''
+        print(f"   {model_name}: {info['status']} ({info['ms']:.0f}ms{warmup_note})")
+
+    return loaded, report
+
+
+def load_prediction_artifact(period: str, force_refresh: bool = False,
+                             deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
+    """
+    从COS加载预计算的预测结果（predictions/<period>.json）
+
+    Args:
+        period: 目标期号
+        force_refresh: 是否强制刷新缓存
+        deadline: 请求时间预算，不足时返回None
+
+    Returns:
+        预测产物字典，不存在或加载失败时返回None
+    """
+    global _cache
+
+    # 检查缓存（产物按期号不可变，命中即可直接返回）
+    if not force_refresh and period in _cache['prediction_artifacts']:
+        return _cache['prediction_artifacts'][period]
+
+    from utils._prediction_artifact import get_artifact_cos_path
+
+    breaker_key = f'prediction:{period}'
+    try:
+        # 先检查预算再检查断路器，避免预算不足时消耗掉半开状态的探测机会
+        check_deadline(deadline, 'load_prediction_artifact', COS_LOAD_MIN_SECONDS, 'live_inference')
+        if not force_refresh:
+            _breaker_check(breaker_key)
+    except (ArtifactUnavailableError, DeadlineExceeded):
+        return None
+
+    try:
+        client = get_cos_client()
+        artifact = client.download_json(get_artifact_cos_path(period))
+
+        if not isinstance(artifact, dict) or 'prediction' not in artifact:
+            print(f"⚠️  预计算预测格式无效: {period}")
+            _breaker_failure(breaker_key, Exception('预计算预测格式无效'))
+            return None
+
+        _cache['prediction_artifacts'][period] = artifact
+        _breaker_success(breaker_key)
+        print(f"✅ 加载预计算预测: {period}")
+        return artifact
+
+    except Exception as e:
+        print(f"⚠️  预计算预测不可用 {period}: {str(e)}")
+        _breaker_failure(breaker_key, e, missing_delay=ARTIFACT_MISSING_TTL)
+        return None
 
 
 def get_models_info() -> Dict[str, Any]:
@@ -249,10 +1039,27 @@ def clear_cache():
     _cache['lottery_data_timestamp'] = None
     _cache['models'].clear()
     _cache['onnx_sessions'].clear()
+    _cache['onnx_load_info'].clear()
+    _cache['warmup'].clear()
+    _cache['preload'] = None
+    _cache['bundle'] = {'manifest': None, 'timestamp': None, 'data': None}
+    _cache['models_info_version'] = None
+    _cache['prediction_artifacts'].clear()
+    _memory.clear()
+    with _breaker_lock:
+        _cache['circuit_breakers'].clear()
 
     print("🗑️  缓存已清除")
 
 
+def _session_profile_status() -> Any:
+    """当前ONNX会话配置（环境变量无效时返回错误信息）"""
+    try:
+        return get_session_profile()
+    except ValueError as e:
+        return {'error': str(e)}
+
+
 def get_cache_status() -> Dict[str, Any]:
     """获取缓存状态"""
     global _cache
@@ -260,10 +1067,34 @@ def get_cache_status() -> Dict[str, Any]:
     status = {
         'lottery_data_cached': _cache['lottery_data'] is not None,
         'sklearn_models_cached': list(_cache['models'].keys()),
+        'sklearn_model_types': {name: type(model).__name__ for name, model in _cache['models'].items()},
         'onnx_models_cached': list(_cache['onnx_sessions'].keys()),
+        'onnx_load_info': dict(_cache['onnx_load_info']),
+        'onnx_session_profile': _session_profile_status(),
+        'nn_engine': get_nn_engine(),
+        'onnx_model_variant': ONNX_MODEL_VARIANT,
+        'model_memory': _memory.status(),
+        'warmup': dict(_cache['warmup']),
+        'preload': _cache['preload'],
+        'bundle_version': (_cache['bundle']['manifest'] or {}).get('version'),
+        'prediction_artifacts_cached': list(_cache['prediction_artifacts'].keys()),
+        'circuit_breakers': {},
         'cache_ttl': _cache['cache_ttl']
     }
 
+    now = time.monotonic()
+    with _breaker_lock:
+        for key, breaker in _cache['circuit_breakers'].items():
+            status['circuit_breakers'][key] = {
+                'state': breaker['state'],
+                'failures': breaker['failures'],
+                'missing': breaker['missing'],
+                'backoff': breaker['backoff'],
+                'retry_in': round(max(0.0, breaker['retry_at'] - now), 1),
+                'last_error': breaker['last_error'],
+                'last_failure': breaker['last_failure']
+            }
+
     if _cache['lottery_data_timestamp']:
         cache_age = (datetime.now() - _cache['lottery_data_timestamp']).total_seconds()
         status['lottery_data_cache_age'] = cache_age
@@ -0,0 +1,96 @@
+"""
+请求级时间预算（deadline）
+- 处理器创建一个 Deadline，沿调用链传给数据加载、模型加载和推理
+- 每个阶段开始前检查剩余时间：不够则跳过该阶段，改用缓存或备用结果
+- 被跳过的阶段记录在 Deadline 上，随响应一起返回
+"""
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+
+# /api/predict 默认预算（毫秒），Vercel 函数默认超时为10秒，留出序列化与网络余量
+DEFAULT_BUDGET_MS = int(os.getenv('PREDICT_BUDGET_MS', '8000'))
+
+
+class DeadlineExceeded(Exception):
+    """剩余时间不足以执行某个阶段"""
+
+
+class Deadline:
+    """请求级时间预算"""
+
+    def __init__(self, budget_ms: Optional[float] = None):
+        """
+        创建时间预算
+
+        Args:
+            budget_ms: 总预算（毫秒），None 表示不限时
+        """
+        self.budget_ms = budget_ms
+        self.started = time.monotonic()
+        self.expires_at = None if budget_ms is None else self.started + budget_ms / 1000.0
+        self.skipped: List[Dict[str, Any]] = []
+
+    def remaining(self) -> float:
+        """剩余时间（秒），不限时返回 inf"""
+        if self.expires_at is None:
+            return float('inf')
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def elapsed_ms(self) -> float:
+        """已用时间（毫秒）"""
+        return (time.monotonic() - self.started) * 1000
+
+    def expired(self) -> bool:
+        """预算是否已用完"""
+        return self.remaining() <= 0
+
+    def has(self, seconds: float) -> bool:
+        """剩余时间是否至少还有 seconds 秒"""
+        return self.remaining() >= seconds
+
+    def skip(self, stage: str, fallback: Optional[str] = None):
+        """
+        记录一个因预算不足而跳过的阶段
+
+        Args:
+            stage: 阶段名
+            fallback: 实际使用的替代结果（如 cached / fallback）
+        """
+        self.skipped.append({
+            'stage': stage,
+            'fallback': fallback,
+            'at_ms': round(self.elapsed_ms(), 1)
+        })
+        print(f"⏱️  时间预算不足，跳过: {stage}")
+
+    def check(self, stage: str, min_seconds: float = 0.0, fallback: Optional[str] = None):
+        """
+        阶段开始前检查预算，不足时记录并抛出 DeadlineExceeded
+
+        Args:
+            stage: 阶段名
+            min_seconds: 执行该阶段所需的最少剩余时间
+            fallback: 调用方将使用的替代结果
+        """
+        if not self.has(min_seconds):
+            self.skip(stage, fallback)
+            raise DeadlineExceeded(f"时间预算不足，跳过 {stage}")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """响应中返回的预算使用情况"""
+        remaining = self.remaining()
+        return {
+            'budget_ms': self.budget_ms,
+            'elapsed_ms': round(self.elapsed_ms(), 1),
+            'remaining_ms': None if remaining == float('inf') else round(remaining * 1000, 1),
+            'skipped_stages': list(self.skipped)
+        }
+
+
+def check_deadline(deadline: Optional[Deadline], stage: str, min_seconds: float = 0.0,
+                   fallback: Optional[str] = None):
+    """deadline 可为 None（不限时）的 Deadline.check 便捷封装"""
+    if deadline is not None:
+        deadline.check(stage, min_seconds, fallback)
@@ -0,0 +1,140 @@
+"""
+概率级模型融合
+- 每个模型输出完整的号码概率向量（前区35维 / 后区12维）
+- 将 M 个模型的向量堆叠为 (M, N) 矩阵，一次完成加权融合：
+    linear      算术池化  p = Σ w_i · p_i
+    log_linear  对数线性池化  p ∝ exp(Σ w_i · log p_i)（专家乘积，模型一致时更尖锐）
+- 融合后的概率向量可直接用于 top-k 选号、抽样、批量生成号码和置信度计算，无需重新运行模型
+"""
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+
+FUSION_METHODS = ('linear', 'log_linear')
+
+# 对数池化时的概率下限（避免 log(0) 让单个模型一票否决）
+MIN_PROBA = 1e-6
+
+
+def normalize(values: Sequence[float]) -> np.ndarray:
+    """
+    非负向量归一化为概率分布（全零时返回均匀分布）
+
+    Args:
+        values: 长度为 N 的得分或概率
+
+    Returns:
+        (N,) 概率向量
+    """
+    p = np.clip(np.asarray(values, dtype=np.float64), 0.0, None)
+    total = p.sum()
+    if not np.isfinite(total) or total <= 0:
+        return np.full(p.shape, 1.0 / len(p))
+    return p / total
+
+
+def stack_probas(vectors: Sequence[Sequence[float]], size: int) -> np.ndarray:
+    """
+    将多个模型的概率向量堆叠为 (M, size) 矩阵，逐行归一化
+
+    Args:
+        vectors: 各模型的概率向量
+        size: 号码个数（前区35，后区12）
+
+    Returns:
+        (M, size) 矩阵
+    """
+    matrix = np.asarray(vectors, dtype=np.float64).reshape(len(vectors), -1)
+    if matrix.shape[1] != size:
+        raise ValueError(f"概率向量长度必须为 {size}，实际为 {matrix.shape[1]}")
+
+    matrix = np.clip(matrix, 0.0, None)
+    totals = matrix.sum(axis=1, keepdims=True)
+    empty = (totals[:, 0] <= 0) | ~np.isfinite(totals[:, 0])
+    matrix[empty] = 1.0
+    totals[empty] = size
+    return matrix / totals
+
+
+def fuse(matrix: np.ndarray, weights: Sequence[float], method: str = 'log_linear') -> np.ndarray:
+    """
+    加权融合 (M, N) 概率矩阵
+
+    Args:
+        matrix: 逐行归一化的概率矩阵
+        weights: M 个模型权重（内部归一化）
+        method: 'linear' 或 'log_linear'
+
+    Returns:
+        (N,) 融合后的概率向量
+    """
+    if method not in FUSION_METHODS:
+        raise ValueError(f"未知融合方式: {method}")
+
+    w = normalize(weights)
+    if method == 'linear':
+        return normalize(w @ matrix)
+
+    logits = w @ np.log(np.maximum(matrix, MIN_PROBA))
+    return normalize(np.exp(logits - logits.max()))
+
+
+def top_numbers(proba: np.ndarray, k: int) -> list:
+    """
+    概率最高的 k 个号码（升序，号码从1开始）
+
+    Args:
+        proba: (N,) 概率向量
+        k: 选号个数
+
+    Returns:
+        号码列表
+    """
+    top = np.argsort(-proba, kind='stable')[:k]
+    return sorted(int(i) + 1 for i in top)
+
+
+def coverage(proba: np.ndarray, numbers: Sequence[int]) -> Dict[str, float]:
+    """
+    选中号码的置信度：覆盖的概率质量，以及相对随机选号的提升倍数
+
+    融合分布为号码的边际分布时，coverage × k 即该组号码的期望命中个数
+
+    Args:
+        proba: (N,) 融合概率向量
+        numbers: 选中的号码
+
+    Returns:
+        {'coverage': 概率质量, 'lift': 相对均匀分布 k/N 的倍数}
+    """
+    mass = float(proba[np.asarray(numbers, dtype=np.intp) - 1].sum())
+    baseline = len(numbers) / len(proba)
+    return {
+        'coverage': round(mass, 4),
+        'lift': round(mass / baseline, 4) if baseline else 0.0
+    }
+
+
+def fuse_zone(vectors: Sequence[Sequence[float]], weights: Sequence[float], k: int,
+              method: str = 'log_linear', size: Optional[int] = None) -> Dict[str, Any]:
+    """
+    单区融合：堆叠 -> 融合 -> 选号 -> 置信度，一次完成
+
+    Args:
+        vectors: 各模型的概率向量
+        weights: 模型权重
+        k: 选号个数（前区5，后区2）
+        method: 融合方式
+        size: 号码个数（默认取向量长度）
+
+    Returns:
+        {'proba': (N,) 概率向量, 'numbers': 选中号码, 'coverage': ..., 'lift': ...}
+    """
+    size = size or len(vectors[0])
+    proba = fuse(stack_probas(vectors, size), weights, method)
+    numbers = top_numbers(proba, k)
+
+    result = {'proba': proba, 'numbers': numbers}
+    result.update(coverage(proba, numbers))
+    return result
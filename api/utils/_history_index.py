@@ -0,0 +1,198 @@
+"""
+历史开奖倒排索引
+- 每个号码对应一个位图（Python大整数），第i位表示第i期开出了该号码
+- 查询"至少k个前区 + 至少j个后区命中"时只做位图与/或运算，无需遍历历史记录
+- 纯Python实现，无numpy依赖
+"""
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+from utils._prize_scoring import prize_tier, TIER_NAMES
+
+
+def _record_numbers(record: Dict, zone: str) -> List[int]:
+    """兼容 front_zone/front 两种字段名"""
+    if zone == 'front':
+        return record.get('front_zone') or record.get('front') or []
+    return record.get('back_zone') or record.get('back') or []
+
+
+def _iter_bits(bitmap: int):
+    """按从低到高顺序遍历位图中为1的位"""
+    while bitmap:
+        low = bitmap & -bitmap
+        yield low.bit_length() - 1
+        bitmap ^= low
+
+
+class HistoryIndex:
+    """号码 -> 开奖期位图 的倒排索引"""
+
+    def __init__(self, history: List[Dict]):
+        """
+        构建索引
+
+        Args:
+            history: 历史开奖数据（下标即期序号）
+        """
+        self.history = history
+        self.front_bitmaps = [0] * 36
+        self.back_bitmaps = [0] * 13
+
+        for draw_id, record in enumerate(history):
+            bit = 1 << draw_id
+            for n in _record_numbers(record, 'front'):
+                if 1 <= n <= 35:
+                    self.front_bitmaps[n] |= bit
+            for n in _record_numbers(record, 'back'):
+                if 1 <= n <= 12:
+                    self.back_bitmaps[n] |= bit
+
+        self.all_draws = (1 << len(history)) - 1
+
+    def _at_least(self, bitmaps: List[int], numbers: Sequence[int], k: int) -> int:
+        """
+        至少命中k个号码的开奖期位图
+
+        at_least[j] 表示已处理号码中至少命中j个的期；
+        每加入一个号码：at_least[j] |= at_least[j-1] & 该号码位图
+
+        Args:
+            bitmaps: 号码位图表
+            numbers: 查询号码
+            k: 最少命中个数
+
+        Returns:
+            满足条件的开奖期位图
+        """
+        if k <= 0:
+            return self.all_draws
+
+        rows = [bitmaps[n] for n in set(numbers) if 0 < n < len(bitmaps)]
+        if k > len(rows):
+            return 0
+
+        at_least = [self.all_draws] + [0] * k
+        for row in rows:
+            for j in range(k, 0, -1):
+                at_least[j] |= at_least[j - 1] & row
+        return at_least[k]
+
+    def match_bitmap(self, front: Sequence[int], back: Sequence[int],
+                     min_front: int = 0, min_back: int = 0) -> int:
+        """满足 前区>=min_front 且 后区>=min_back 命中的开奖期位图"""
+        bitmap = self._at_least(self.front_bitmaps, front, min_front)
+        if bitmap and min_back > 0:
+            bitmap &= self._at_least(self.back_bitmaps, back, min_back)
+        return bitmap
+
+    def query(self, front: Sequence[int], back: Sequence[int],
+              min_front: int = 3, min_back: int = 0,
+              limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        查询单注号码的历史命中
+
+        Args:
+            front: 前区号码
+            back: 后区号码
+            min_front: 前区最少命中个数
+            min_back: 后区最少命中个数
+            limit: 最多返回的命中期数（None表示全部）
+
+        Returns:
+            {'total': 命中期数, 'matches': [...]}
+        """
+        bitmap = self.match_bitmap(front, back, min_front, min_back)
+        front_set = set(front)
+        back_set = set(back)
+
+        matches = []
+        for draw_id in _iter_bits(bitmap):
+            if limit is not None and len(matches) >= limit:
+                break
+            record = self.history[draw_id]
+            draw_front = _record_numbers(record, 'front')
+            draw_back = _record_numbers(record, 'back')
+            front_matched = sorted(front_set.intersection(draw_front))
+            back_matched = sorted(back_set.intersection(draw_back))
+            tier = prize_tier(min(len(front_matched), 5), min(len(back_matched), 2))
+            matches.append({
+                'period': record.get('period'),
+                'date': record.get('date', ''),
+                'front_zone': draw_front,
+                'back_zone': draw_back,
+                'front_hits': len(front_matched),
+                'back_hits': len(back_matched),
+                'front_matched': front_matched,
+                'back_matched': back_matched,
+                'prize_tier': tier,
+                'prize_name': TIER_NAMES.get(tier, '未中奖')
+            })
+
+        return {'total': bin(bitmap).count('1'), 'matches': matches}
+
+    def query_many(self, tickets: List[Dict], min_front: int = 3, min_back: int = 0,
+                   limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        批量查询多注号码
+
+        Args:
+            tickets: [{'front': [...], 'back': [...]}, ...]（也支持 front_zone/back_zone）
+            min_front: 前区最少命中个数
+            min_back: 后区最少命中个数
+            limit: 每注最多返回的命中期数
+
+        Returns:
+            与 tickets 一一对应的查询结果
+        """
+        results = []
+        for ticket in tickets:
+            front = _record_numbers(ticket, 'front')
+            back = _record_numbers(ticket, 'back')
+            result = self.query(front, back, min_front, min_back, limit)
+            result['front'] = sorted(front)
+            result['back'] = sorted(back)
+            results.append(result)
+        return results
+
+
+# 进程级索引缓存（历史数据版本不变时复用）
+_index: Optional[HistoryIndex] = None
+_index_version = None
+_lock = threading.Lock()
+
+
+def get_history_version(historical_data: List[Dict]) -> tuple:
+    """
+    历史数据版本标识（期数 + 最新/最早期号），用于判断数据是否变化
+
+    索引缓存与进程级预测器（utils._predictor_registry）共用这一个定义
+
+    Args:
+        historical_data: 历史开奖数据（最新一期在前）
+
+    Returns:
+        版本元组
+    """
+    if not historical_data:
+        return (0, None, None)
+    return (
+        len(historical_data),
+        historical_data[0].get('period'),
+        historical_data[-1].get('period')
+    )
+
+
+def get_history_index(history: List[Dict]) -> HistoryIndex:
+    """获取（或按需重建）历史数据的倒排索引"""
+    global _index, _index_version
+
+    version = get_history_version(history)
+    if _index is not None and _index_version == version:
+        return _index
+
+    with _lock:
+        if _index is None or _index_version != version:
+            _index = HistoryIndex(history)
+            _index_version = version
+        return _index
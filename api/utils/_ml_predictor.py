@@ -1,7 +1,13 @@
 """ML预测模型 - 无numpy依赖版本"""
-import random
+import os
+import sys
 import statistics
-from _ml_features import LotteryFeatureExtractor
+
+# 添加父目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils._ml_features import LotteryFeatureExtractor
+from utils._sampling import weighted_sample
 
 class MLPredictor:
     """ML预测器"""
@@ -12,21 +18,8 @@ class MLPredictor:
         self.features = self.feature_extractor.extract_all_features()
     
     def weighted_random_choice(self, numbers, weights, k):
-        """加权随机选择"""
-        total_weight = sum(weights)
-        probabilities = [w / total_weight for w in weights]
-        selected = []
-        available_indices = list(range(len(numbers)))
-        for _ in range(k):
-            if not available_indices:
-                break
-            current_probs = [probabilities[i] for i in available_indices]
-            current_total = sum(current_probs)
-            current_probs = [p / current_total for p in current_probs]
-            chosen_idx = random.choices(available_indices, weights=current_probs, k=1)[0]
-            selected.append(numbers[chosen_idx])
-            available_indices.remove(chosen_idx)
-        return sorted(selected)
+        """加权随机选择（无放回，Gumbel top-k 一步完成）"""
+        return weighted_sample(numbers, weights, k)
     
     def frequency_based_prediction(self, zone='front', count=5):
         """基于频率的预测"""
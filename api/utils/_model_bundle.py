@@ -0,0 +1,158 @@
+"""
+模型打包产物（bundle）
+- 训练后将全部模型打包为一个zip（models/bundle.zip），默认不压缩（ZIP_STORED）
+- 清单（models/bundle_manifest.json）记录每个成员在bundle中的数据偏移、大小、sha256和元数据
+- 加载端可一次下载整个bundle，也可按清单中的偏移用Range请求只读取单个模型
+- 清单中的 version 由全部成员的sha256计算得出，模型内容变化即版本变化，用于缓存失效
+"""
+import os
+import json
+import struct
+import hashlib
+import zipfile
+import zlib
+from datetime import datetime
+from typing import Any, Dict, Tuple
+
+
+BUNDLE_COS_PATH = 'models/bundle.zip'
+MANIFEST_COS_PATH = 'models/bundle_manifest.json'
+BUNDLE_FILENAME = 'bundle.zip'
+MANIFEST_FILENAME = 'bundle_manifest.json'
+BUNDLE_FORMAT_VERSION = 1
+
+# zip本地文件头：固定30字节，文件名长度和扩展字段长度位于第26-29字节
+_LOCAL_HEADER_SIZE = 30
+_LOCAL_HEADER_SIGNATURE = b'PK\x03\x04'
+
+
+class BundleChecksumError(ValueError):
+    """成员内容与清单中的sha256不一致"""
+
+
+def _data_offset(bundle_file, info: zipfile.ZipInfo) -> int:
+    """读取成员的本地文件头，返回其数据部分在zip中的起始偏移"""
+    bundle_file.seek(info.header_offset)
+    header = bundle_file.read(_LOCAL_HEADER_SIZE)
+    if header[:4] != _LOCAL_HEADER_SIGNATURE:
+        raise ValueError(f"无效的zip本地文件头: {info.filename}")
+    name_len, extra_len = struct.unpack('<HH', header[26:30])
+    return info.header_offset + _LOCAL_HEADER_SIZE + name_len + extra_len
+
+
+def build_bundle(output_dir: str, saved_info: Dict[str, Any], compress: bool = False) -> Dict[str, Any]:
+    """
+    将 save_models 保存的模型打包为 bundle.zip 并生成清单
+
+    清单同时写入 output_dir/bundle_manifest.json 和 bundle 内的 manifest.json
+
+    Args:
+        output_dir: 模型目录
+        saved_info: save_models 返回的模型信息（models -> {path, format, metadata}）
+        compress: 是否使用 deflate 压缩（压缩后Range读取需要在加载端解压）
+
+    Returns:
+        清单字典
+    """
+    bundle_path = os.path.join(output_dir, BUNDLE_FILENAME)
+    compression = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+
+    # 成员键：原始模型为模型名，服务格式（*.rf.npz / *.xgb.npz / *.nn.npz）与量化模型（*.int8.onnx）为文件名
+    sources = []
+    for model_name, info in saved_info['models'].items():
+        # 只打包服务端能加载的格式（.keras 备用文件不打包）
+        if info['format'] in ('pkl', 'onnx'):
+            sources.append((model_name, f"{model_name}.{info['format']}", info['format'], info))
+        for variant, file_format in (('serving', 'npz'), ('quantized', 'onnx')):
+            if info.get(variant):
+                filename = os.path.basename(info[variant]['path'])
+                sources.append((filename, filename, file_format, {'path': info[variant]['path'],
+                                                                  'metadata': info.get('metadata', {})}))
+
+    members = {}
+    with zipfile.ZipFile(bundle_path, 'w', compression=compression) as bundle:
+        for key, filename, file_format, info in sources:
+            with open(info['path'], 'rb') as f:
+                data = f.read()
+
+            bundle.writestr(filename, data)
+            members[key] = {
+                'file': filename,
+                'format': file_format,
+                'raw_size': len(data),
+                'sha256': hashlib.sha256(data).hexdigest(),
+                'metadata': info.get('metadata', {})
+            }
+
+    # 写入完成后再读取本地文件头，得到每个成员数据的真实偏移
+    with zipfile.ZipFile(bundle_path) as bundle, open(bundle_path, 'rb') as f:
+        for member in members.values():
+            info = bundle.getinfo(member['file'])
+            member['offset'] = _data_offset(f, info)
+            member['size'] = info.compress_size
+            member['compression'] = 'deflate' if info.compress_type == zipfile.ZIP_DEFLATED else 'stored'
+
+    digest = hashlib.sha256(''.join(
+        f"{name}:{members[name]['sha256']}" for name in sorted(members)
+    ).encode()).hexdigest()
+
+    manifest = {
+        'format_version': BUNDLE_FORMAT_VERSION,
+        'version': digest[:16],
+        'created_at': datetime.now().isoformat(),
+        'trained_at': saved_info.get('trained_at'),
+        'compression': 'deflate' if compress else 'stored',
+        'members': members
+    }
+
+    # 追加 manifest.json 不会移动已有成员（只重写中央目录）
+    with zipfile.ZipFile(bundle_path, 'a', compression=zipfile.ZIP_DEFLATED) as bundle:
+        bundle.writestr('manifest.json', json.dumps(manifest, ensure_ascii=False, indent=2))
+    manifest['bundle_size'] = os.path.getsize(bundle_path)
+
+    with open(os.path.join(output_dir, MANIFEST_FILENAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    print(f"📦 模型bundle已生成: {bundle_path}（{len(members)} 个模型，版本 {manifest['version']}）")
+    return manifest
+
+
+def decode_member(raw: bytes, entry: Dict[str, Any]) -> bytes:
+    """
+    解码并校验一个成员的数据
+
+    Args:
+        raw: 成员在bundle中的原始字节（长度为 entry['size']）
+        entry: 清单中的成员信息
+
+    Returns:
+        成员内容（.pkl 或 .onnx 文件的字节）
+    """
+    if len(raw) != entry['size']:
+        raise BundleChecksumError(f"{entry['file']} 长度不符: {len(raw)} != {entry['size']}")
+
+    data = zlib.decompress(raw, -15) if entry['compression'] == 'deflate' else raw
+
+    if hashlib.sha256(data).hexdigest() != entry['sha256']:
+        raise BundleChecksumError(f"{entry['file']} sha256校验失败")
+    return data
+
+
+def extract_member(bundle: bytes, entry: Dict[str, Any]) -> bytes:
+    """
+    从完整的bundle字节中取出一个成员（按清单偏移切片，不解析zip目录）
+
+    Args:
+        bundle: 完整bundle内容
+        entry: 清单中的成员信息
+
+    Returns:
+        成员内容
+    """
+    start = entry['offset']
+    return decode_member(bytes(memoryview(bundle)[start:start + entry['size']]), entry)
+
+
+def member_range(entry: Dict[str, Any]) -> Tuple[int, int]:
+    """成员数据在bundle中的字节范围 (start, end)，end为闭区间，可直接用于HTTP Range"""
+    return entry['offset'], entry['offset'] + entry['size'] - 1
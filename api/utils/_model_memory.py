@@ -0,0 +1,176 @@
+"""
+已加载模型的内存统计与LRU淘汰
+- 每个模型记录：序列化大小（下载的 pkl / npz / onnx 字节数）、ONNX 初始化器字节数（安装了 onnx 包时）、
+  权重数组字节数（NumPy 服务格式）以及加载前后的进程RSS变化
+- 估算占用 = 以上静态大小中的最大值；RSS变化在并行预加载时互相重叠，只作参考，不参与预算
+- 设置 MODEL_MEMORY_BUDGET_MB 后，总占用超出预算时按最近最少使用的顺序淘汰模型
+- 单个模型就超出预算时只给出警告、不淘汰其他模型（淘汰也无法满足预算，只会反复重新下载）
+"""
+import os
+import threading
+import importlib.util
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+
+# 模型内存预算（字节），0 表示不限制
+MODEL_MEMORY_BUDGET = int(float(os.getenv('MODEL_MEMORY_BUDGET_MB', '0')) * 1024 * 1024)
+
+
+def current_rss() -> Optional[int]:
+    """当前进程的常驻内存（字节），不支持 /proc 的平台返回None"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def array_bytes(obj: Any) -> int:
+    """对象属性中 NumPy 数组（含数组字典）的总字节数"""
+    total = 0
+    for value in getattr(obj, '__dict__', {}).values():
+        if isinstance(value, np.ndarray):
+            total += value.nbytes
+        elif isinstance(value, dict):
+            total += sum(v.nbytes for v in value.values() if isinstance(v, np.ndarray))
+    return total
+
+
+def onnx_initializer_bytes(source: Union[str, bytes]) -> Optional[int]:
+    """
+    ONNX 模型初始化器（权重）的总字节数
+
+    Args:
+        source: 模型文件路径或内容
+
+    Returns:
+        字节数；未安装 onnx 包或解析失败时返回None
+    """
+    if importlib.util.find_spec('onnx') is None:
+        return None
+
+    try:
+        import onnx
+        from onnx import helper
+
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            model = onnx.load_model_from_string(bytes(source))
+        else:
+            model = onnx.load(source, load_external_data=False)
+
+        total = 0
+        for tensor in model.graph.initializer:
+            if tensor.raw_data:
+                total += len(tensor.raw_data)
+            else:
+                itemsize = np.dtype(helper.tensor_dtype_to_np_dtype(tensor.data_type)).itemsize
+                total += int(np.prod(tensor.dims)) * itemsize
+        return total
+    except Exception:
+        return None
+
+
+class ModelMemory:
+    """按最近使用顺序记录已加载模型的内存占用"""
+
+    def __init__(self, budget: int = MODEL_MEMORY_BUDGET):
+        self.budget = budget
+        self.entries: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self.evictions = 0
+        # 单个模型就超出预算的模型
+        self.oversized = set()
+        self._lock = threading.Lock()
+
+    def record(self, model_name: str, kind: str, payload_bytes: Optional[int] = None,
+               initializer_bytes: Optional[int] = None, weight_bytes: Optional[int] = None,
+               rss_delta: Optional[int] = None) -> List[str]:
+        """
+        记录一个刚加载的模型
+
+        Args:
+            model_name: 模型名称
+            kind: 加载格式（pkl / serving / onnx / numpy）
+            payload_bytes: 序列化大小
+            initializer_bytes: ONNX 初始化器字节数
+            weight_bytes: 权重数组字节数
+            rss_delta: 加载前后的RSS变化
+
+        Returns:
+            超出预算需要淘汰的模型（最近最少使用的在前，不含本模型）
+        """
+        estimate = max(payload_bytes or 0, initializer_bytes or 0, weight_bytes or 0)
+        now = datetime.now().isoformat()
+
+        if 0 < self.budget < estimate:
+            if model_name not in self.oversized:
+                print(f"⚠️  模型 {model_name} 约 {estimate / 1024 / 1024:.1f}MB，"
+                      f"超出内存预算 {self.budget / 1024 / 1024:.1f}MB，请调大 MODEL_MEMORY_BUDGET_MB")
+            self.oversized.add(model_name)
+
+        with self._lock:
+            previous = self.entries.pop(model_name, None)
+            self.entries[model_name] = {
+                'kind': kind,
+                'bytes': estimate,
+                'payload_bytes': payload_bytes,
+                'initializer_bytes': initializer_bytes,
+                'weight_bytes': weight_bytes,
+                'rss_delta': rss_delta,
+                'hits': previous['hits'] if previous else 0,
+                'loaded_at': now,
+                'last_used': now
+            }
+            if model_name in self.oversized:
+                return []
+            return self._over_budget(keep=model_name)
+
+    def _over_budget(self, keep: str) -> List[str]:
+        if self.budget <= 0:
+            return []
+
+        evicted = []
+        total = sum(entry['bytes'] for entry in self.entries.values())
+        for name in list(self.entries):
+            if total <= self.budget:
+                break
+            if name == keep:
+                continue
+            total -= self.entries.pop(name)['bytes']
+            evicted.append(name)
+        self.evictions += len(evicted)
+        return evicted
+
+    def touch(self, model_name: str):
+        """记录一次使用（缓存命中或推理）"""
+        with self._lock:
+            entry = self.entries.get(model_name)
+            if entry is not None:
+                entry['hits'] += 1
+                entry['last_used'] = datetime.now().isoformat()
+                self.entries.move_to_end(model_name)
+
+    def remove(self, model_name: str):
+        with self._lock:
+            self.entries.pop(model_name, None)
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self.oversized.clear()
+
+    def status(self) -> Dict[str, Any]:
+        """内存统计（models 按最近最少使用在前排列）"""
+        with self._lock:
+            models = {name: dict(entry) for name, entry in self.entries.items()}
+        return {
+            'budget_bytes': self.budget,
+            'total_bytes': sum(entry['bytes'] for entry in models.values()),
+            'rss_bytes': current_rss(),
+            'evictions': self.evictions,
+            'oversized': sorted(self.oversized),
+            'models': models
+        }
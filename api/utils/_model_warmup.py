@@ -0,0 +1,66 @@
+"""
+模型加载后的预热推理
+新的 ONNX 会话首次 run 需要分配内存池、初始化算子；sklearn / XGBoost 模型首次 predict_proba
+需要做输入校验和内部缓存初始化。加载后用正确形状的合成输入先推理一次，
+让第一个真实请求的延迟与稳定状态一致
+"""
+import time
+from typing import Any
+
+import numpy as np
+
+
+# 与 RealMLPredictor._prepare_features_for_model 一致：10期 × (5+2) 个号码
+DEFAULT_FEATURE_DIM = 70
+
+
+def _feature_dim(model: Any) -> int:
+    """树模型的输入特征数"""
+    first = model[0] if isinstance(model, (list, tuple)) and model else model
+    n_features = getattr(first, 'n_features_in_', None)
+    if n_features is None and hasattr(first, 'boosters'):
+        # XGBoostEvaluator：原生 Booster 记录了训练时的特征数
+        n_features = first.boosters[0].num_features() if first.boosters else None
+    return int(n_features or DEFAULT_FEATURE_DIM)
+
+
+def synthetic_input(model: Any) -> np.ndarray:
+    """
+    生成与模型输入形状一致的合成输入（float32，与真实请求的特征类型相同）
+
+    Args:
+        model: ONNX 会话 / NumpyNet，或 sklearn / XGBoost / 服务格式模型
+
+    Returns:
+        批大小为1的输入
+    """
+    if hasattr(model, 'get_inputs'):
+        # 动态维度（None 或符号名）取1
+        shape = [n if isinstance(n, int) and n > 0 else 1 for n in model.get_inputs()[0].shape]
+        shape[0] = 1
+        return np.zeros(shape, dtype=np.float32)
+    return np.zeros((1, _feature_dim(model)), dtype=np.float32)
+
+
+def warmup(model: Any) -> float:
+    """
+    用合成输入推理一次，调用方式与 RealMLPredictor 相同
+
+    Args:
+        model: 已加载的模型或会话
+
+    Returns:
+        预热耗时（毫秒）
+    """
+    X = synthetic_input(model)
+    start = time.perf_counter()
+
+    if hasattr(model, 'get_inputs'):
+        model.run(None, {model.get_inputs()[0].name: X})
+    elif isinstance(model, (list, tuple)):
+        for m in model:
+            m.predict_proba(X)
+    else:
+        model.predict_proba(X)
+
+    return (time.perf_counter() - start) * 1000
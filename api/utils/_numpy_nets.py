@@ -0,0 +1,294 @@
+"""
+LSTM / Transformer 的纯 NumPy 推理（不依赖 onnxruntime）
+- 只实现 scripts/train_models.py 中 create_lstm_model / create_transformer_model 的两种结构：
+    LSTM:        LSTM(64, 返回序列) -> LSTM(32) -> Dense(64, relu) -> Dense(out, sigmoid)
+    Transformer: Dense(128) -> Reshape(16, 8) -> MultiHeadAttention(4头, key_dim=8) + 残差 -> LayerNorm
+                 -> Dense(64, relu) -> Dense(8) + 残差 -> LayerNorm -> Flatten -> Dense(128, relu) -> Dense(out, sigmoid)
+  Dropout 在推理时为恒等映射
+- 训练脚本把 Keras 权重导出为 .npz（*.nn.npz），加载后得到与 ONNX 会话接口相同的对象
+  （get_inputs() / run()），可直接替换 RealMLPredictor.onnx_sessions 中的会话
+"""
+import io
+import json
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+
+NN_FORMAT_VERSION = 1
+NN_SUFFIX = '.nn.npz'
+
+# Keras LayerNormalization 默认 epsilon
+KERAS_LN_EPSILON = 1e-3
+
+
+# ==================== 基本算子 ====================
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 0.5 * (np.tanh(0.5 * x) + 1.0)
+
+
+def _relu(x: np.ndarray) -> np.ndarray:
+    return np.maximum(x, 0.0)
+
+
+def _softmax(x: np.ndarray, axis: int = -1) -> np.ndarray:
+    e = np.exp(x - x.max(axis=axis, keepdims=True))
+    return e / e.sum(axis=axis, keepdims=True)
+
+
+def dense(x: np.ndarray, kernel: np.ndarray, bias: np.ndarray) -> np.ndarray:
+    """Keras Dense：kernel 为 (in, out)"""
+    return x @ kernel + bias
+
+
+def layer_norm(x: np.ndarray, gamma: np.ndarray, beta: np.ndarray, epsilon: float = KERAS_LN_EPSILON) -> np.ndarray:
+    """最后一维上的 LayerNormalization"""
+    mean = x.mean(axis=-1, keepdims=True)
+    var = x.var(axis=-1, keepdims=True)
+    return (x - mean) / np.sqrt(var + epsilon) * gamma + beta
+
+
+def lstm(x: np.ndarray, kernel: np.ndarray, recurrent: np.ndarray, bias: np.ndarray,
+         return_sequences: bool = False) -> np.ndarray:
+    """
+    Keras LSTM（tanh / sigmoid 激活，门顺序 i, f, c, o）
+
+    Args:
+        x: (batch, timesteps, features)
+        kernel: (features, 4 * units)
+        recurrent: (units, 4 * units)
+        bias: (4 * units,)
+        return_sequences: 是否返回每个时间步的输出
+
+    Returns:
+        (batch, timesteps, units) 或 (batch, units)
+    """
+    batch, timesteps, _ = x.shape
+    units = recurrent.shape[0]
+
+    # 输入投影对所有时间步一次完成，循环内只剩递归部分
+    projected = x @ kernel + bias
+    h = np.zeros((batch, units), dtype=x.dtype)
+    c = np.zeros((batch, units), dtype=x.dtype)
+    outputs = []
+
+    for t in range(timesteps):
+        z = projected[:, t] + h @ recurrent
+        i = _sigmoid(z[:, :units])
+        f = _sigmoid(z[:, units:2 * units])
+        g = np.tanh(z[:, 2 * units:3 * units])
+        o = _sigmoid(z[:, 3 * units:])
+        c = f * c + i * g
+        h = o * np.tanh(c)
+        if return_sequences:
+            outputs.append(h)
+
+    return np.stack(outputs, axis=1) if return_sequences else h
+
+
+def multi_head_attention(x: np.ndarray, w: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Keras MultiHeadAttention 自注意力（query = key = value = x，无掩码）
+
+    Args:
+        x: (batch, seq, d_model)
+        w: query/key/value 的 kernel (d_model, heads, key_dim) 与 bias (heads, key_dim)，
+           output 的 kernel (heads, key_dim, d_model) 与 bias (d_model,)
+
+    Returns:
+        (batch, seq, d_model)
+    """
+    key_dim = w['mha_query_kernel'].shape[-1]
+
+    q = np.einsum('btd,dhk->bthk', x, w['mha_query_kernel']) + w['mha_query_bias']
+    k = np.einsum('btd,dhk->bthk', x, w['mha_key_kernel']) + w['mha_key_bias']
+    v = np.einsum('btd,dhk->bthk', x, w['mha_value_kernel']) + w['mha_value_bias']
+
+    q = q / np.sqrt(key_dim)
+    scores = np.einsum('bqhk,bshk->bhqs', q, k)
+    attention = _softmax(scores, axis=-1)
+    context = np.einsum('bhqs,bshk->bqhk', attention, v)
+
+    return np.einsum('bqhk,hkd->bqd', context, w['mha_output_kernel']) + w['mha_output_bias']
+
+
+# ==================== 两种网络结构 ====================
+
+def lstm_forward(x: np.ndarray, w: Dict[str, np.ndarray]) -> np.ndarray:
+    """create_lstm_model 的前向计算，x: (batch, 10, 7)"""
+    h = lstm(x, w['lstm1_kernel'], w['lstm1_recurrent'], w['lstm1_bias'], return_sequences=True)
+    h = lstm(h, w['lstm2_kernel'], w['lstm2_recurrent'], w['lstm2_bias'])
+    h = _relu(dense(h, w['dense1_kernel'], w['dense1_bias']))
+    return _sigmoid(dense(h, w['out_kernel'], w['out_bias']))
+
+
+def transformer_forward(x: np.ndarray, w: Dict[str, np.ndarray]) -> np.ndarray:
+    """create_transformer_model 的前向计算，x: (batch, 70)"""
+    seq_len, d_model = (int(n) for n in w['seq_shape'])
+
+    h = dense(x, w['embed_kernel'], w['embed_bias']).reshape(x.shape[0], seq_len, d_model)
+    h = layer_norm(h + multi_head_attention(h, w), w['ln1_gamma'], w['ln1_beta'], float(w['ln_epsilon']))
+
+    ff = _relu(dense(h, w['ff1_kernel'], w['ff1_bias']))
+    ff = dense(ff, w['ff2_kernel'], w['ff2_bias'])
+    h = layer_norm(h + ff, w['ln2_gamma'], w['ln2_beta'], float(w['ln_epsilon']))
+
+    h = h.reshape(x.shape[0], -1)
+    h = _relu(dense(h, w['dense_kernel'], w['dense_bias']))
+    return _sigmoid(dense(h, w['out_kernel'], w['out_bias']))
+
+
+_FORWARD = {
+    'lstm': lstm_forward,
+    'transformer': transformer_forward
+}
+
+
+# ==================== Keras 权重导出 ====================
+
+def _weighted_layers(model) -> List[Any]:
+    return [layer for layer in model.layers if layer.get_weights()]
+
+
+def export_keras_lstm(model, path: str) -> Dict[str, Any]:
+    """
+    导出 create_lstm_model 的权重
+
+    Args:
+        model: 训练好的 Keras 模型
+        path: 输出文件路径（*.nn.npz）
+
+    Returns:
+        导出信息
+    """
+    lstm1, lstm2, dense1, out = _weighted_layers(model)
+    weights = {}
+    for prefix, layer in (('lstm1', lstm1), ('lstm2', lstm2)):
+        kernel, recurrent, bias = layer.get_weights()
+        weights.update({f'{prefix}_kernel': kernel, f'{prefix}_recurrent': recurrent, f'{prefix}_bias': bias})
+    for prefix, layer in (('dense1', dense1), ('out', out)):
+        kernel, bias = layer.get_weights()
+        weights.update({f'{prefix}_kernel': kernel, f'{prefix}_bias': bias})
+
+    return save_net(path, 'lstm', weights, input_shape=[None, int(model.input_shape[1]), int(model.input_shape[2])])
+
+
+def export_keras_transformer(model, path: str) -> Dict[str, Any]:
+    """
+    导出 create_transformer_model 的权重
+
+    Args:
+        model: 训练好的 Keras 模型
+        path: 输出文件路径（*.nn.npz）
+
+    Returns:
+        导出信息
+    """
+    layers = {type(layer).__name__: [] for layer in model.layers}
+    for layer in model.layers:
+        layers[type(layer).__name__].append(layer)
+
+    embed, ff1, ff2, dense1, out = layers['Dense']
+    ln1, ln2 = layers['LayerNormalization']
+    mha = layers['MultiHeadAttention'][0]
+    reshape = layers['Reshape'][0]
+
+    weights = {}
+    for prefix, layer in (('embed', embed), ('ff1', ff1), ('ff2', ff2), ('dense', dense1), ('out', out)):
+        kernel, bias = layer.get_weights()
+        weights.update({f'{prefix}_kernel': kernel, f'{prefix}_bias': bias})
+    for prefix, layer in (('ln1', ln1), ('ln2', ln2)):
+        gamma, beta = layer.get_weights()
+        weights.update({f'{prefix}_gamma': gamma, f'{prefix}_beta': beta})
+
+    # Keras MultiHeadAttention 权重顺序：query、key、value、output（各自 kernel, bias）
+    mha_weights = mha.get_weights()
+    for i, name in enumerate(('query', 'key', 'value', 'output')):
+        weights[f'mha_{name}_kernel'] = mha_weights[2 * i]
+        weights[f'mha_{name}_bias'] = mha_weights[2 * i + 1]
+
+    weights['seq_shape'] = np.array(reshape.target_shape)
+    weights['ln_epsilon'] = np.array(ln1.epsilon)
+
+    return save_net(path, 'transformer', weights, input_shape=[None, int(model.input_shape[1])])
+
+
+def save_net(path: str, arch: str, weights: Dict[str, np.ndarray], input_shape: List[Optional[int]]) -> Dict[str, Any]:
+    """
+    保存网络权重为 .npz
+
+    Args:
+        path: 输出文件路径
+        arch: 'lstm' 或 'transformer'
+        weights: 按 *_forward 约定命名的权重
+        input_shape: 模型输入形状（批维度为None）
+
+    Returns:
+        导出信息
+    """
+    arrays = {}
+    for name, value in weights.items():
+        value = np.asarray(value)
+        arrays[name] = value.astype(np.float32) if value.dtype.kind == 'f' else value
+
+    np.savez(
+        path,
+        arch=np.array(arch),
+        format_version=np.array(NN_FORMAT_VERSION),
+        input_shape=np.array(json.dumps(input_shape)),
+        **arrays
+    )
+    return {'kind': 'numpy_net', 'arch': arch, 'path': path}
+
+
+# ==================== 与 ONNX 会话兼容的推理对象 ====================
+
+class _InputInfo:
+    def __init__(self, name: str, shape: List[Optional[int]]):
+        self.name = name
+        self.shape = shape
+
+
+class NumpyNet:
+    """纯 NumPy 网络，提供与 onnxruntime.InferenceSession 相同的 get_inputs() / run() 接口"""
+
+    def __init__(self, arch: str, weights: Dict[str, np.ndarray], input_shape: List[Optional[int]]):
+        if arch not in _FORWARD:
+            raise ValueError(f"未知网络结构: {arch}")
+        self.arch = arch
+        self.weights = weights
+        self.input_shape = input_shape
+        self._forward = _FORWARD[arch]
+
+    def get_inputs(self) -> List[_InputInfo]:
+        return [_InputInfo('input', self.input_shape)]
+
+    def predict(self, x: np.ndarray) -> np.ndarray:
+        return self._forward(np.asarray(x, dtype=np.float32), self.weights)
+
+    def run(self, output_names, input_feed: Dict[str, np.ndarray]) -> List[np.ndarray]:
+        return [self.predict(next(iter(input_feed.values())))]
+
+
+def load_net(source: Union[str, bytes]) -> NumpyNet:
+    """
+    加载 .npz 网络
+
+    Args:
+        source: 文件路径或文件内容
+
+    Returns:
+        NumpyNet
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(bytes(source))
+
+    with np.load(source, allow_pickle=False) as npz:
+        version = int(npz['format_version'])
+        if version != NN_FORMAT_VERSION:
+            raise ValueError(f"不支持的网络格式版本: {version}")
+
+        meta = ('arch', 'format_version', 'input_shape')
+        weights = {name: npz[name] for name in npz.files if name not in meta}
+        return NumpyNet(str(npz['arch']), weights, json.loads(str(npz['input_shape'])))
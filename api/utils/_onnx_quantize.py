@@ -0,0 +1,98 @@
+"""
+LSTM / Transformer ONNX 模型的 INT8 量化
+- dynamic：只量化权重，激活在推理时动态量化，不需要校准数据（LSTM 算子也会被量化）
+- static：权重与激活都量化为 INT8（QDQ 格式），激活范围由训练集校准得到
+量化后的模型保存为 <name>.int8.onnx，与 FP32 模型的输入输出完全相同，
+加载端通过 ONNX_MODEL_VARIANT=int8 选择（内存受限的函数可使用更小的模型）
+"""
+import os
+from typing import Any, Dict, Iterator, Optional
+
+import numpy as np
+
+
+QUANT_MODES = ('dynamic', 'static')
+INT8_SUFFIX = '.int8.onnx'
+
+# 静态量化最多使用的校准样本数与每批样本数
+MAX_CALIBRATION_SAMPLES = 512
+CALIBRATION_BATCH_SIZE = 64
+
+
+def reshape_for_input(X: np.ndarray, input_shape) -> np.ndarray:
+    """
+    将扁平特征 (n_samples, 70) 调整为模型输入形状（与 train_lstm 相同的截取方式）
+
+    Args:
+        X: 扁平特征
+        input_shape: 模型输入形状（批维度可为None或字符串）
+
+    Returns:
+        float32 输入
+    """
+    dims = [int(n) for n in input_shape[1:]]
+    size = int(np.prod(dims))
+    return np.asarray(X[:, :size], dtype=np.float32).reshape([-1] + dims)
+
+
+def calibration_batches(X: np.ndarray, input_name: str, input_shape,
+                        max_samples: int = MAX_CALIBRATION_SAMPLES,
+                        batch_size: int = CALIBRATION_BATCH_SIZE) -> Iterator[Dict[str, np.ndarray]]:
+    """按模型输入生成校准批次（均匀抽取训练集样本）"""
+    if X.shape[0] > max_samples:
+        X = X[np.linspace(0, X.shape[0] - 1, max_samples).astype(int)]
+    inputs = reshape_for_input(X, input_shape)
+    for start in range(0, inputs.shape[0], batch_size):
+        yield {input_name: inputs[start:start + batch_size]}
+
+
+def quantize_onnx_model(model_path: str, output_path: str, mode: str = 'dynamic',
+                        calibration_data: Optional[np.ndarray] = None) -> Dict[str, Any]:
+    """
+    量化 ONNX 模型为 INT8
+
+    Args:
+        model_path: FP32 模型路径
+        output_path: 输出路径（*.int8.onnx）
+        mode: 'dynamic' 或 'static'
+        calibration_data: 静态量化的校准特征（训练集扁平特征）
+
+    Returns:
+        量化信息
+    """
+    import onnxruntime as ort
+    from onnxruntime.quantization import (
+        CalibrationDataReader, QuantFormat, QuantType, quantize_dynamic, quantize_static
+    )
+
+    if mode not in QUANT_MODES:
+        raise ValueError(f"未知量化方式: {mode}（可选: {', '.join(QUANT_MODES)}）")
+
+    if mode == 'dynamic':
+        quantize_dynamic(model_path, output_path, weight_type=QuantType.QInt8)
+    else:
+        if calibration_data is None or len(calibration_data) == 0:
+            raise ValueError("静态量化需要校准数据")
+
+        model_input = ort.InferenceSession(model_path, providers=['CPUExecutionProvider']).get_inputs()[0]
+
+        class _Reader(CalibrationDataReader):
+            def __init__(self):
+                self.batches = calibration_batches(calibration_data, model_input.name, model_input.shape)
+
+            def get_next(self):
+                return next(self.batches, None)
+
+        quantize_static(
+            model_path, output_path, _Reader(),
+            quant_format=QuantFormat.QDQ,
+            activation_type=QuantType.QInt8,
+            weight_type=QuantType.QInt8
+        )
+
+    return {
+        'mode': mode,
+        'path': output_path,
+        'size': os.path.getsize(output_path),
+        'fp32_size': os.path.getsize(model_path)
+    }
@@ -0,0 +1,156 @@
+"""
+ONNX Runtime 会话配置
+- 会话参数（线程数、图优化级别、执行模式、内存池）由环境变量组成的 profile 决定
+- 启用磁盘缓存时，首次加载通过 optimized_model_filepath 保存优化后的图，
+  之后直接加载已优化的文件并跳过图优化
+"""
+import os
+import hashlib
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+
+# 图优化级别（环境变量取值 -> onnxruntime 枚举名）
+GRAPH_OPT_LEVELS = {
+    'disabled': 'ORT_DISABLE_ALL',
+    'basic': 'ORT_ENABLE_BASIC',
+    'extended': 'ORT_ENABLE_EXTENDED',
+    'all': 'ORT_ENABLE_ALL'
+}
+
+EXECUTION_MODES = {
+    'sequential': 'ORT_SEQUENTIAL',
+    'parallel': 'ORT_PARALLEL'
+}
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() in ('1', 'true', 'yes')
+
+
+def get_session_profile() -> Dict[str, Any]:
+    """
+    从环境变量读取会话配置
+
+    ONNX_INTRA_OP_THREADS   单个算子内的线程数（默认1，Serverless实例通常只有1-2个vCPU）
+    ONNX_INTER_OP_THREADS   算子间并行线程数（默认1，仅 parallel 模式生效）
+    ONNX_GRAPH_OPT_LEVEL    disabled / basic / extended / all（默认all）
+    ONNX_EXECUTION_MODE     sequential / parallel（默认sequential）
+    ONNX_ENABLE_MEM_ARENA   是否启用CPU内存池（默认1）
+    ONNX_ENABLE_MEM_PATTERN 是否启用内存复用规划（默认1）
+
+    Returns:
+        配置字典
+    """
+    profile = {
+        'intra_op_threads': int(os.getenv('ONNX_INTRA_OP_THREADS', '1')),
+        'inter_op_threads': int(os.getenv('ONNX_INTER_OP_THREADS', '1')),
+        'graph_optimization_level': os.getenv('ONNX_GRAPH_OPT_LEVEL', 'all').lower(),
+        'execution_mode': os.getenv('ONNX_EXECUTION_MODE', 'sequential').lower(),
+        'enable_mem_arena': _env_flag('ONNX_ENABLE_MEM_ARENA', '1'),
+        'enable_mem_pattern': _env_flag('ONNX_ENABLE_MEM_PATTERN', '1')
+    }
+
+    if profile['graph_optimization_level'] not in GRAPH_OPT_LEVELS:
+        raise ValueError(f"未知图优化级别: {profile['graph_optimization_level']}")
+    if profile['execution_mode'] not in EXECUTION_MODES:
+        raise ValueError(f"未知执行模式: {profile['execution_mode']}")
+
+    return profile
+
+
+def build_session_options(profile: Dict[str, Any], optimized_model_filepath: Optional[str] = None,
+                          pre_optimized: bool = False):
+    """
+    根据配置创建 SessionOptions
+
+    Args:
+        profile: get_session_profile() 返回的配置
+        optimized_model_filepath: 保存优化后模型的路径（可选）
+        pre_optimized: 模型已离线优化过时关闭图优化
+
+    Returns:
+        onnxruntime.SessionOptions
+    """
+    import onnxruntime as ort
+
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = profile['intra_op_threads']
+    options.inter_op_num_threads = profile['inter_op_threads']
+    options.execution_mode = getattr(ort.ExecutionMode, EXECUTION_MODES[profile['execution_mode']])
+    options.enable_cpu_mem_arena = profile['enable_mem_arena']
+    options.enable_mem_pattern = profile['enable_mem_pattern']
+
+    level = 'disabled' if pre_optimized else profile['graph_optimization_level']
+    options.graph_optimization_level = getattr(ort.GraphOptimizationLevel, GRAPH_OPT_LEVELS[level])
+
+    if optimized_model_filepath:
+        options.optimized_model_filepath = optimized_model_filepath
+
+    return options
+
+
+def optimized_model_path(cache_dir: str, model_name: str, version: str,
+                         profile: Optional[Dict[str, Any]] = None) -> str:
+    """
+    优化后模型的缓存路径
+
+    文件名包含模型版本（ETag）和图优化级别，模型或优化级别变化时自动使用新文件；
+    线程数等运行参数不影响图结构，不参与命名。
+    'all' 级别的优化图可能包含与CPU相关的算子布局，只应在生成它的实例上使用，
+    因此只保存到本地磁盘缓存，不上传COS
+
+    Args:
+        cache_dir: 磁盘缓存目录
+        model_name: 模型名称
+        version: 模型版本标识
+        profile: 会话配置
+
+    Returns:
+        文件路径
+    """
+    profile = profile or get_session_profile()
+    tag = hashlib.md5(f"{version}:{profile['graph_optimization_level']}".encode()).hexdigest()[:12]
+    return os.path.join(cache_dir, f'{model_name}.{tag}.opt.onnx')
+
+
+def create_session(model_source: Union[str, bytes, Callable[[], Union[str, bytes]]],
+                   optimized_path: Optional[str] = None,
+                   profile: Optional[Dict[str, Any]] = None) -> Tuple[Any, str]:
+    """
+    按配置创建推理会话
+
+    Args:
+        model_source: 模型文件路径、序列化字节，或按需获取它们的函数
+                      （已有优化缓存时不会调用，从而跳过下载）
+        optimized_path: 优化后模型的缓存路径（None 表示不缓存）
+        profile: 会话配置（默认读取环境变量）
+
+    Returns:
+        (InferenceSession, 优化缓存状态: 'hit' / 'saved' / 'disabled')
+    """
+    import onnxruntime as ort
+
+    profile = profile or get_session_profile()
+    providers = ['CPUExecutionProvider']
+
+    if optimized_path and os.path.exists(optimized_path):
+        options = build_session_options(profile, pre_optimized=True)
+        return ort.InferenceSession(optimized_path, options, providers=providers), 'hit'
+
+    if callable(model_source):
+        model_source = model_source()
+
+    if not optimized_path or profile['graph_optimization_level'] == 'disabled':
+        options = build_session_options(profile)
+        return ort.InferenceSession(model_source, options, providers=providers), 'disabled'
+
+    # 先写临时文件再原子替换，避免并发进程读到不完整的优化模型
+    os.makedirs(os.path.dirname(optimized_path), exist_ok=True)
+    temp_path = f'{optimized_path}.{os.getpid()}.tmp'
+    options = build_session_options(profile, optimized_model_filepath=temp_path)
+    session = ort.InferenceSession(model_source, options, providers=providers)
+
+    if os.path.exists(temp_path):
+        os.replace(temp_path, optimized_path)
+        return session, 'saved'
+    return session, 'disabled'
@@ -0,0 +1,162 @@
+"""
+预计算预测产物
+- 离线任务（scripts/precompute_predictions.py）与在线接口（/api/predict）共用同一套响应结构
+- 产物按目标期号存储在COS：predictions/<period>.json
+- 开奖后对产物中的ML预测和开奖当天 /api/spiritual 返回的灵修预测评分，供融合权重（/api/fusion-weights）批量更新
+"""
+from typing import Dict, List, Any, Optional
+from datetime import datetime
+
+
+# COS中预计算预测的存储前缀
+PREDICTIONS_PREFIX = 'predictions'
+
+# 产物格式版本（结构变更时递增）
+ARTIFACT_VERSION = '1.1'
+
+
+def get_next_period(historical_data: List[Dict]) -> Optional[str]:
+    """
+    根据最新一期期号推算下一期期号
+
+    Args:
+        historical_data: 历史开奖数据（最新一期在前）
+
+    Returns:
+        下一期期号，无法推算时返回None
+    """
+    if not historical_data:
+        return None
+
+    try:
+        return str(int(historical_data[0]['period']) + 1)
+    except (KeyError, ValueError, TypeError):
+        return None
+
+
+def get_artifact_cos_path(period: str) -> str:
+    """获取指定期号预测产物在COS中的路径"""
+    return f'{PREDICTIONS_PREFIX}/{period}.json'
+
+
+def score_prediction_artifact(artifact: Dict[str, Any], draw: Dict[str, Any],
+                              spiritual: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    用实际开奖对预测产物评分，生成 fusion-weights batch_update 的一条记录
+
+    Args:
+        artifact: 预测产物
+        draw: 目标期开奖数据（front_zone/back_zone）
+        spiritual: 开奖当天返回的灵修预测（见 utils._spiritual_prediction），没有时只对ML预测评分
+
+    Returns:
+        {'period', 'ml_hits', 'ml_total', 'spiritual_hits', 'spiritual_total', ...}
+    """
+    draw_front = set(draw.get('front_zone') or draw.get('front') or [])
+    draw_back = set(draw.get('back_zone') or draw.get('back') or [])
+
+    ml = artifact['prediction']['ensemble_prediction']
+    record = {
+        'period': artifact.get('target_period'),
+        'ml_hits': len(draw_front.intersection(ml['front_zone'])),
+        'ml_total': len(ml['front_zone']),
+        'ml_back_hits': len(draw_back.intersection(ml['back_zone'])),
+        'spiritual_hits': 0,
+        'spiritual_total': 0,
+        'spiritual_back_hits': 0
+    }
+
+    # 没有灵修预测（如开奖日期缺失）时 spiritual_total=0，权重计算会跳过灵修一侧
+    # （早期产物自带的 spiritual_prediction 不是实际返回给用户的号码，不参与评分）
+    if spiritual:
+        record['spiritual_hits'] = len(draw_front.intersection(spiritual['front_zone']))
+        record['spiritual_total'] = len(spiritual['front_zone'])
+        record['spiritual_back_hits'] = len(draw_back.intersection(spiritual['back_zone']))
+
+    return record
+
+
+def build_prediction_payload(predictor, historical_data: List[Dict], data_source: str,
+                             deadline=None) -> Dict[str, Any]:
+    """
+    使用RealMLPredictor生成预测结果（prediction + ml_info）
+
+    Args:
+        predictor: RealMLPredictor 实例
+        historical_data: 历史开奖数据
+        data_source: 数据来源标识
+        deadline: 请求时间预算（在线推理时传入）
+
+    Returns:
+        包含 prediction 和 ml_info 的字典
+    """
+    ensemble_result = predictor.ensemble_predict(deadline=deadline)
+
+    return {
+        'prediction': {
+            'ensemble_prediction': {
+                'front_zone': ensemble_result['front'],
+                'back_zone': ensemble_result['back'],
+                'confidence': ensemble_result['confidence'],
+                'models_used': ensemble_result['total_models'],
+                'cos_models_used': ensemble_result['cos_models_used']
+            },
+            'individual_models': {
+                name: {
+                    'front_zone': pred['front'],
+                    'back_zone': pred['back'],
+                    'confidence': pred['confidence'],
+                    'source': pred['source'],
+                    'description': pred['description']
+                }
+                for name, pred in ensemble_result['individual_predictions'].items()
+            },
+            'fused_probabilities': {
+                'front': ensemble_result['front_proba'],
+                'back': ensemble_result['back_proba']
+            },
+            'based_on_data': {
+                'periods_analyzed': len(historical_data),
+                'data_source': data_source,
+                'hot_numbers_front': predictor.features['front_hot'],
+                'hot_numbers_back': predictor.features['back_hot']
+            }
+        },
+        'ml_info': {
+            'version': 'real_ml',
+            'models': ['XGBoost', 'RandomForest', 'LSTM', 'Transformer'],
+            'model_format': {
+                'xgboost': 'XGBoost Booster (.xgb.npz) / sklearn (.pkl)',
+                'random_forest': 'NumPy (.rf.npz) / sklearn (.pkl)',
+                'lstm': 'ONNX (.onnx)',
+                'transformer': 'ONNX (.onnx)'
+            },
+            'weights': ensemble_result['weights'],
+            'model_sources': ensemble_result['model_sources']
+        }
+    }
+
+
+def build_prediction_artifact(predictor, historical_data: List[Dict], data_source: str) -> Dict[str, Any]:
+    """
+    生成可上传到COS的预测产物
+
+    Args:
+        predictor: RealMLPredictor 实例
+        historical_data: 历史开奖数据（最新一期在前）
+        data_source: 数据来源标识
+
+    Returns:
+        预测产物字典
+    """
+    payload = build_prediction_payload(predictor, historical_data, data_source)
+    target_period = get_next_period(historical_data)
+
+    return {
+        'artifact_version': ARTIFACT_VERSION,
+        'target_period': target_period,
+        'based_on_period': historical_data[0].get('period') if historical_data else None,
+        'generated_at': datetime.now().isoformat(),
+        'prediction': payload['prediction'],
+        'ml_info': payload['ml_info']
+    }
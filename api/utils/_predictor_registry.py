@@ -0,0 +1,257 @@
+"""
+进程级预测器注册表
+- 每个进程只构建一次 RealMLPredictor（模型只加载一次）
+- 历史数据版本变化时增量刷新特征
+- 定期在后台检查模型版本（bundle清单 / models_info.json 的ETag），新版本的全部模型在后台
+  加载完成后一次性替换预测器：请求在开始时取得预测器，整个请求只使用同一版本的模型，
+  旧预测器在进行中的请求结束后释放（旧会话随之回收）
+- 冷启动时缺失的模型（预算不足或加载失败）也由后台检查补加载，请求路径不会因此加锁
+- 线程安全：构建与刷新在锁内完成，热请求只比较数据版本后直接复用
+"""
+import os
+import time
+import threading
+import weakref
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+from utils._real_ml_predictor import RealMLPredictor
+from utils._history_index import get_history_version
+from utils._deadline import Deadline
+
+
+# 检查模型版本的间隔（秒），0 表示不检查（模型只在冷启动时加载）
+MODEL_POLL_INTERVAL = float(os.getenv('MODEL_POLL_INTERVAL', '60'))
+
+# 按是否使用COS模型分别缓存预测器
+_predictors: Dict[bool, RealMLPredictor] = {}
+_lock = threading.Lock()
+_stats = {
+    'builds': 0,
+    'refreshes': 0,
+    'incremental_refreshes': 0,
+    'hits': 0,
+    'model_swaps': 0,
+    'partial_models': 0
+}
+
+# 模型热切换状态
+_swap = {
+    'last_poll': None,  # 上次检查的 time.monotonic()
+    'latest_version': None,
+    'loading_version': None,
+    'last_swap': None,
+    'last_error': None,
+    'thread': None
+}
+_swap_lock = threading.Lock()
+
+# 已被替换、仍被进行中的请求引用的预测器
+_retired = weakref.WeakSet()
+
+
+def get_predictor(historical_data: List[Dict], use_cos_models: bool = True,
+                  deadline: Optional[Deadline] = None) -> RealMLPredictor:
+    """
+    获取进程级预测器
+
+    Args:
+        historical_data: 历史开奖数据（最新一期在前）
+        use_cos_models: 是否使用COS中的真实模型
+        deadline: 请求时间预算（模型加载阶段检查）
+
+    Returns:
+        RealMLPredictor 实例（请求内应一直使用这个实例）
+    """
+    version = get_history_version(historical_data)
+    _maybe_poll_models()
+
+    # 热路径：数据版本未变化时无需加锁（缺失的模型由后台检查补加载）
+    predictor = _predictors.get(use_cos_models)
+    if predictor is not None and predictor.data_version == version:
+        _stats['hits'] += 1
+        return predictor
+
+    with _lock:
+        predictor = _predictors.get(use_cos_models)
+
+        if predictor is None:
+            if use_cos_models:
+                _register_eviction()
+            predictor = RealMLPredictor(historical_data, use_cos_models=use_cos_models, deadline=deadline)
+            _predictors[use_cos_models] = predictor
+            _stats['builds'] += 1
+            if use_cos_models:
+                # 刚加载的模型就是最新版本，下一次检查在一个间隔之后
+                _swap['last_poll'] = time.monotonic()
+                if predictor.missing_models():
+                    _stats['partial_models'] += 1
+            print(f"🧠 预测器已构建（{version[0]}期）")
+            return predictor
+
+        if predictor.data_version != version:
+            incremental = predictor.refresh_data(historical_data)
+            _stats['refreshes'] += 1
+            if incremental:
+                _stats['incremental_refreshes'] += 1
+            print(f"🔄 预测器特征已刷新（{'增量' if incremental else '全量'}，{version[0]}期）")
+
+        else:
+            _stats['hits'] += 1
+
+        return predictor
+
+
+def _register_eviction():
+    """加载器按内存预算淘汰模型时，同时从当前预测器中释放"""
+    try:
+        from utils._cos_data_loader import register_eviction_listener
+        register_eviction_listener(_on_models_evicted)
+    except ImportError:
+        pass
+
+
+def _on_models_evicted(model_names: List[str]):
+    predictor = _predictors.get(True)
+    if predictor is not None:
+        predictor.evict_models(model_names)
+
+
+def _maybe_poll_models():
+    """到达检查间隔时在后台线程检查模型版本，不阻塞请求"""
+    if MODEL_POLL_INTERVAL <= 0 or True not in _predictors:
+        return
+
+    last_poll = _swap['last_poll']
+    if last_poll is not None and time.monotonic() - last_poll < MODEL_POLL_INTERVAL:
+        return
+
+    with _swap_lock:
+        thread = _swap['thread']
+        if thread is not None and thread.is_alive():
+            return
+        if _swap['last_poll'] != last_poll:
+            return
+        _swap['last_poll'] = time.monotonic()
+        _swap['thread'] = threading.Thread(target=_poll_and_swap, name='model-registry', daemon=True)
+        _swap['thread'].start()
+
+
+def _poll_and_swap():
+    """检查模型版本，有新版本时加载全部模型并一次性替换预测器；版本未变化时补加载缺失的模型"""
+    try:
+        from utils._cos_data_loader import poll_models_version, get_models_version, preload_models
+
+        version = poll_models_version()
+        _swap['latest_version'] = version
+
+        current = _predictors.get(True)
+        if current is None:
+            return
+        if version is None or version == current.models_version:
+            _fill_missing_models(current, preload_models)
+            return
+
+        _swap['loading_version'] = version
+        print(f"♻️  发现新模型版本 {version}，后台加载中")
+        names = RealMLPredictor.SKLEARN_MODELS + RealMLPredictor.ONNX_MODELS
+        # 已在后台线程中，同步预热后再切换，切换后的第一个请求不承担首次推理开销
+        loaded, report = preload_models(names, warmup_mode='sync')
+
+        # 加载过程中版本再次变化时放弃这组模型，下次检查再加载
+        if get_models_version() != version:
+            _swap['last_error'] = f"加载期间模型版本已变化: {version}"
+            return
+
+        # 新版本至少要覆盖当前已加载的模型，否则继续使用旧版本
+        previous_names = set(current.models) | set(current.onnx_sessions)
+        missing = sorted(previous_names - set(loaded))
+        if missing:
+            _swap['last_error'] = f"新版本 {version} 缺少模型: {', '.join(missing)}"
+            print(f"⚠️  {_swap['last_error']}，继续使用 {current.models_version}")
+            return
+
+        with _lock:
+            current = _predictors[True]
+            _predictors[True] = current.with_models(loaded, version, report)
+            _retired.add(current)
+            _stats['model_swaps'] += 1
+
+        _swap['last_swap'] = {
+            'from': current.models_version,
+            'to': version,
+            'models': len(loaded),
+            'at': datetime.now().isoformat()
+        }
+        _swap['last_error'] = None
+        print(f"✅ 模型已切换: {current.models_version} -> {version}")
+
+    except Exception as e:
+        _swap['last_error'] = str(e)
+        print(f"⚠️  模型版本检查失败: {str(e)}")
+
+    finally:
+        _swap['loading_version'] = None
+
+
+def _fill_missing_models(current: RealMLPredictor, preload_models):
+    """
+    补加载当前版本中缺失的模型，加载成功后同样以新预测器整体替换
+
+    断路器仍在退避中的模型由加载器直接跳过（不请求COS），每个模型最多在其重试时间到达后探测一次
+    """
+    missing = current.missing_models()
+    if not missing:
+        return
+
+    loaded, report = preload_models(missing, warmup_mode='sync')
+    if not loaded:
+        return
+
+    with _lock:
+        latest = _predictors.get(True)
+        if latest is not current:
+            # 期间已切换到其他版本，放弃这次补加载
+            return
+        models = {**current.models, **current.onnx_sessions, **loaded}
+        _predictors[True] = current.with_models(models, current.models_version, {**current.load_report, **report})
+        _retired.add(current)
+    print(f"🔁 已补加载缺失的模型: {', '.join(sorted(loaded))}")
+
+
+def clear_predictors():
+    """清除所有已构建的预测器"""
+    with _lock:
+        _predictors.clear()
+
+
+def get_models_status() -> Dict[str, Any]:
+    """模型版本状态（/api/health 使用）"""
+    predictor = _predictors.get(True)
+    return {
+        'active_version': predictor.models_version if predictor is not None else None,
+        'latest_version': _swap['latest_version'],
+        'loading_version': _swap['loading_version'],
+        'draining': len(_retired),
+        'last_swap': _swap['last_swap'],
+        'last_error': _swap['last_error'],
+        'poll_interval': MODEL_POLL_INTERVAL
+    }
+
+
+def get_registry_status() -> Dict[str, Any]:
+    """获取注册表状态"""
+    return {
+        'predictors': {
+            ('cos_models' if use_cos else 'fallback_only'): {
+                'data_version': list(predictor.data_version),
+                'models_version': predictor.models_version,
+                'sklearn_models': list(predictor.models.keys()),
+                'onnx_models': list(predictor.onnx_sessions.keys()),
+                'load_report': predictor.load_report
+            }
+            for use_cos, predictor in _predictors.items()
+        },
+        'models': get_models_status(),
+        **_stats
+    }
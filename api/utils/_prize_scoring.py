@@ -0,0 +1,187 @@
+"""
+大乐透奖级评分
+- (前区命中数, 后区命中数) -> 奖级 的查表映射
+- 批量计算：号码矩阵 × 开奖矩阵，一次得到全部奖级
+- 按可配置的奖金假设统计各奖级注数与期望回报
+供回测、融合权重更新和前端命中查询共用
+"""
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # 无numpy环境仍可使用单注 prize_tier
+    np = None
+
+
+# 奖级表：PRIZE_TIERS[前区命中][后区命中]，0 表示未中奖
+#   一等奖 5+2  二等奖 5+1  三等奖 5+0  四等奖 4+2  五等奖 4+1
+#   六等奖 3+2  七等奖 4+0  八等奖 3+1 / 2+2
+#   九等奖 3+0 / 2+1 / 1+2 / 0+2
+PRIZE_TIERS = (
+    (0, 0, 9),  # 前区0个
+    (0, 0, 9),  # 前区1个
+    (0, 9, 8),  # 前区2个
+    (9, 8, 6),  # 前区3个
+    (7, 5, 4),  # 前区4个
+    (3, 2, 1),  # 前区5个
+)
+
+TIER_NAMES = {
+    1: '一等奖', 2: '二等奖', 3: '三等奖', 4: '四等奖', 5: '五等奖',
+    6: '六等奖', 7: '七等奖', 8: '八等奖', 9: '九等奖'
+}
+
+# 默认奖金（元/注，基本投注）；一、二等奖为浮动奖金，此处为估算值
+DEFAULT_PRIZES = {
+    1: 10000000,
+    2: 200000,
+    3: 10000,
+    4: 3000,
+    5: 300,
+    6: 200,
+    7: 100,
+    8: 15,
+    9: 5
+}
+
+# 单注投注金额（元）
+TICKET_COST = 2
+
+
+def prize_tier(front_hits: int, back_hits: int) -> int:
+    """
+    单注奖级
+
+    Args:
+        front_hits: 前区命中个数（0-5）
+        back_hits: 后区命中个数（0-2）
+
+    Returns:
+        奖级（1-9），未中奖返回0
+    """
+    if not (0 <= front_hits <= 5 and 0 <= back_hits <= 2):
+        raise ValueError(f"命中个数超出范围: {front_hits}+{back_hits}")
+    return PRIZE_TIERS[front_hits][back_hits]
+
+
+def to_number_matrix(records: Sequence, zone: str) -> 'np.ndarray':
+    """
+    将号码记录转换为矩阵
+
+    Args:
+        records: 号码列表的列表，或含 front_zone/front、back_zone/back 字段的字典列表
+        zone: 'front' 或 'back'
+
+    Returns:
+        (N, 5) 或 (N, 2) 的整数矩阵
+    """
+    width = 5 if zone == 'front' else 2
+    rows = []
+    for record in records:
+        if isinstance(record, dict):
+            if zone == 'front':
+                record = record.get('front_zone') or record.get('front') or []
+            else:
+                record = record.get('back_zone') or record.get('back') or []
+        rows.append(list(record)[:width])
+    return np.asarray(rows, dtype=np.int16).reshape(-1, width)
+
+
+def _one_hot(numbers: 'np.ndarray', size: int) -> 'np.ndarray':
+    """(N, k) 号码 -> (N, size) 0/1 矩阵（float32，便于BLAS矩阵乘）"""
+    one_hot = np.zeros((numbers.shape[0], size + 1), dtype=np.float32)
+    np.put_along_axis(one_hot, numbers.astype(np.intp), 1.0, axis=1)
+    return one_hot[:, 1:]
+
+
+def tier_matrix(tickets_front, tickets_back, draws_front, draws_back) -> 'np.ndarray':
+    """
+    计算每注号码在每期开奖中的奖级
+
+    Args:
+        tickets_front: (T, 5) 号码前区
+        tickets_back: (T, 2) 号码后区
+        draws_front: (D, 5) 开奖前区
+        draws_back: (D, 2) 开奖后区
+
+    Returns:
+        (T, D) 的奖级矩阵（int8，0为未中奖）
+    """
+    front_hits = _one_hot(np.asarray(tickets_front), 35) @ _one_hot(np.asarray(draws_front), 35).T
+    back_hits = _one_hot(np.asarray(tickets_back), 12) @ _one_hot(np.asarray(draws_back), 12).T
+    table = np.asarray(PRIZE_TIERS, dtype=np.int8)
+    return table[front_hits.astype(np.intp), back_hits.astype(np.intp)]
+
+
+def score_tickets(tickets_front, tickets_back, draws_front, draws_back,
+                  prizes: Optional[Dict[int, float]] = None,
+                  ticket_cost: float = TICKET_COST,
+                  chunk_size: int = 2048) -> Dict[str, Any]:
+    """
+    批量评分：统计全部 (号码, 开奖) 组合的奖级分布和期望回报
+
+    Args:
+        tickets_front: (T, 5) 号码前区
+        tickets_back: (T, 2) 号码后区
+        draws_front: (D, 5) 开奖前区
+        draws_back: (D, 2) 开奖后区
+        prizes: 奖级 -> 奖金（覆盖 DEFAULT_PRIZES 中的对应项）
+        ticket_cost: 单注投注金额
+        chunk_size: 每块处理的号码注数（控制内存）
+
+    Returns:
+        奖级分布、总奖金、每注期望奖金和回报率
+    """
+    prize_table = dict(DEFAULT_PRIZES)
+    if prizes:
+        prize_table.update({int(k): float(v) for k, v in prizes.items()})
+
+    tickets_front = np.asarray(tickets_front)
+    tickets_back = np.asarray(tickets_back)
+    draws_front_hot = _one_hot(np.asarray(draws_front), 35).T
+    draws_back_hot = _one_hot(np.asarray(draws_back), 12).T
+    table = np.asarray(PRIZE_TIERS, dtype=np.int8)
+
+    counts = np.zeros(10, dtype=np.int64)
+    for start in range(0, len(tickets_front), chunk_size):
+        stop = start + chunk_size
+        front_hits = _one_hot(tickets_front[start:stop], 35) @ draws_front_hot
+        back_hits = _one_hot(tickets_back[start:stop], 12) @ draws_back_hot
+        tiers = table[front_hits.astype(np.intp), back_hits.astype(np.intp)]
+        counts += np.bincount(tiers.ravel(), minlength=10)
+
+    evaluations = int(len(tickets_front) * draws_front_hot.shape[1])
+    total_payout = float(sum(counts[tier] * prize_table[tier] for tier in range(1, 10)))
+    expected_payout = total_payout / evaluations if evaluations else 0.0
+
+    return {
+        'tier_counts': {tier: int(counts[tier]) for tier in range(1, 10)},
+        'winning_count': int(counts[1:].sum()),
+        'evaluations': evaluations,
+        'total_payout': total_payout,
+        'expected_payout': round(expected_payout, 6),
+        'ticket_cost': ticket_cost,
+        'expected_return': round(expected_payout / ticket_cost, 6) if ticket_cost else None,
+        'prizes': prize_table
+    }
+
+
+def score_against_history(tickets: List[Dict], history: List[Dict], **kwargs) -> Dict[str, Any]:
+    """
+    以字典形式的号码与历史开奖评分（score_tickets 的便捷封装）
+
+    Args:
+        tickets: [{'front': [...], 'back': [...]}, ...]
+        history: 历史开奖数据
+        **kwargs: 透传给 score_tickets
+
+    Returns:
+        评分结果
+    """
+    return score_tickets(
+        to_number_matrix(tickets, 'front'),
+        to_number_matrix(tickets, 'back'),
+        to_number_matrix(history, 'front'),
+        to_number_matrix(history, 'back'),
+        **kwargs
+    )
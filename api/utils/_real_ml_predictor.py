@@ -1,13 +1,14 @@
 """
 真正的ML预测器 - 使用COS中存储的训练模型
 支持：
-- XGBoost (sklearn格式)
-- RandomForest (sklearn格式)
+- XGBoost (原生Booster服务格式，或sklearn格式)
+- RandomForest (展平的NumPy服务格式，或sklearn格式)
 - LSTM (ONNX格式)
 - Transformer (ONNX格式)
 """
 import os
 import sys
+import copy
 import numpy as np
 from typing import Dict, List, Any, Optional
 from collections import Counter
@@ -16,6 +17,20 @@ from datetime import datetime
 # 添加父目录到路径
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
+from utils._sampling import weighted_sample
+from utils._fusion import normalize, top_numbers, fuse_zone
+from utils._deadline import Deadline, check_deadline
+from utils._history_index import get_history_version
+
+
+# 单个模型推理所需的最少剩余预算（秒）
+INFERENCE_MIN_SECONDS = 0.05
+
+
+class ModelEvicted(Exception):
+    """模型已按内存预算淘汰，融合预测中跳过该模型而不是重新下载"""
+    pass
+
 
 class RealMLPredictor:
     """
@@ -23,37 +38,51 @@ class RealMLPredictor:
     从腾讯云COS加载训练好的模型进行预测
     """
 
-    def __init__(self, historical_data: List[Dict], use_cos_models: bool = True):
+    SKLEARN_MODELS = ['xgboost_front', 'xgboost_back', 'random_forest_front', 'random_forest_back']
+    ONNX_MODELS = ['lstm_front', 'lstm_back', 'transformer_front', 'transformer_back']
+
+    def __init__(self, historical_data: List[Dict], use_cos_models: bool = True,
+                 deadline: Optional[Deadline] = None):
         """
         初始化预测器
 
         Args:
             historical_data: 历史开奖数据
             use_cos_models: 是否使用COS中的真实模型
+            deadline: 请求时间预算（预算不足时跳过的模型由注册表的后台检查补加载）
         """
         self.data = historical_data
         self.use_cos_models = use_cos_models
         self.models = {}
         self.onnx_sessions = {}
+        self.load_report = {}
+        self.models_version = None
+        # 按内存预算淘汰的模型（与加载失败分开记录，不计入 missing_models）
+        self.evicted = set()
+        self._front_counter, self._back_counter = self._count_numbers(historical_data)
         self.features = self._extract_features()
+        self.data_version = get_history_version(historical_data)
 
         # 尝试加载模型
         if use_cos_models:
-            self._load_models()
+            self._load_models(deadline)
 
-    def _extract_features(self) -> Dict[str, Any]:
-        """提取特征用于预测"""
-        front_numbers = []
-        back_numbers = []
+    @staticmethod
+    def _count_numbers(records: List[Dict]):
+        """统计前后区号码出现次数"""
+        front_counter = Counter()
+        back_counter = Counter()
 
-        for record in self.data:
-            front = record.get('front_zone') or record.get('front', [])
-            back = record.get('back_zone') or record.get('back', [])
-            front_numbers.extend(front)
-            back_numbers.extend(back)
+        for record in records:
+            front_counter.update(record.get('front_zone') or record.get('front', []))
+            back_counter.update(record.get('back_zone') or record.get('back', []))
 
-        front_counter = Counter(front_numbers)
-        back_counter = Counter(back_numbers)
+        return front_counter, back_counter
+
+    def _extract_features(self) -> Dict[str, Any]:
+        """提取特征用于预测"""
+        front_counter = self._front_counter
+        back_counter = self._back_counter
 
         return {
             'front_hot': [n for n, _ in front_counter.most_common(10)],
@@ -63,137 +92,282 @@ class RealMLPredictor:
             'total_periods': len(self.data)
         }
 
-    def _load_models(self):
-        """从COS加载所有模型"""
+    def refresh_data(self, historical_data: List[Dict]) -> bool:
+        """
+        历史数据更新后刷新特征（不重新加载模型）
+
+        新数据通常只是在最前面追加了最新几期，此时只统计新增部分；
+        否则（数据被修订或截断）重新全量统计。
+
+        Args:
+            historical_data: 新的历史开奖数据（最新一期在前）
+
+        Returns:
+            是否为增量刷新
+        """
+        new_count = len(historical_data) - len(self.data)
+        incremental = (
+            new_count >= 0
+            and len(self.data) > 0
+            and historical_data[new_count].get('period') == self.data[0].get('period')
+            and historical_data[-1].get('period') == self.data[-1].get('period')
+        )
+
+        if incremental:
+            added_front, added_back = self._count_numbers(historical_data[:new_count])
+            front_counter = self._front_counter + added_front
+            back_counter = self._back_counter + added_back
+        else:
+            front_counter, back_counter = self._count_numbers(historical_data)
+
+        # 整体替换引用，并发读取时不会看到部分更新的计数器
+        self._front_counter, self._back_counter = front_counter, back_counter
+        self.data = historical_data
+        self.features = self._extract_features()
+        self.data_version = get_history_version(historical_data)
+
+        return incremental
+
+    def _load_models(self, deadline: Optional[Deadline] = None):
+        """从COS并行加载所有尚未加载的模型"""
         try:
-            from utils._cos_data_loader import load_sklearn_model, load_onnx_model
-
-            # 加载sklearn模型
-            sklearn_models = ['xgboost_front', 'xgboost_back', 'random_forest_front', 'random_forest_back']
-            for model_name in sklearn_models:
-                try:
-                    self.models[model_name] = load_sklearn_model(model_name)
-                    print(f"✅ 加载模型: {model_name}")
-                except Exception as e:
-                    print(f"⚠️  跳过模型 {model_name}: {e}")
-
-            # 加载ONNX模型
-            onnx_models = ['lstm_front', 'lstm_back', 'transformer_front', 'transformer_back']
-            for model_name in onnx_models:
-                try:
-                    self.onnx_sessions[model_name] = load_onnx_model(model_name)
-                    print(f"✅ 加载ONNX模型: {model_name}")
-                except Exception as e:
-                    print(f"⚠️  跳过ONNX模型 {model_name}: {e}")
+            from utils._cos_data_loader import preload_models, get_models_version
+
+            version = get_models_version()
+            if self.models_version is not None and version != self.models_version:
+                # 模型版本已变化：不向旧版本的模型集合补充新版本的模型，由注册表整体切换
+                return
+            self.models_version = version
+            loaded, self.load_report = preload_models(self.missing_models(), deadline=deadline)
+
+            for model_name, model in loaded.items():
+                if model_name in self.ONNX_MODELS:
+                    self.onnx_sessions[model_name] = model
+                else:
+                    self.models[model_name] = model
 
         except ImportError as e:
             print(f"⚠️  无法导入COS加载器: {e}")
         except Exception as e:
             print(f"⚠️  加载模型时出错: {e}")
 
-    def _prepare_features_for_model(self, zone: str = 'front', sequence_length: int = 10) -> np.ndarray:
+    def missing_models(self) -> List[str]:
+        """尚未加载成功的模型（不含按内存预算淘汰的模型）"""
+        if not self.use_cos_models:
+            return []
+        return ([n for n in self.SKLEARN_MODELS if n not in self.models and n not in self.evicted] +
+                [n for n in self.ONNX_MODELS if n not in self.onnx_sessions and n not in self.evicted])
+
+    def evict_models(self, model_names: List[str]):
+        """
+        释放被加载器按内存预算淘汰的模型
+
+        融合预测跳过已淘汰的模型；单独调用某个模型的预测时才重新加载
+        """
+        for model_name in model_names:
+            self.models.pop(model_name, None)
+            self.onnx_sessions.pop(model_name, None)
+            if model_name in self.SKLEARN_MODELS or model_name in self.ONNX_MODELS:
+                self.evicted.add(model_name)
+
+    def _resident_model(self, model_name: str, store: Dict[str, Any], load_evicted: bool,
+                        deadline: Optional[Deadline] = None) -> Any:
         """
-        准备模型输入特征
+        取得已加载的模型，已淘汰的模型按需重新加载
+
+        Args:
+            model_name: 模型名称
+            store: self.models 或 self.onnx_sessions
+            load_evicted: 已淘汰时是否重新加载（否则抛出 ModelEvicted）
+            deadline: 请求时间预算
+
+        Returns:
+            模型对象或ONNX会话，未加载时返回None
+        """
+        model = store.get(model_name)
+        if model is not None or model_name not in self.evicted:
+            return model
+        if not load_evicted:
+            raise ModelEvicted(f"模型 {model_name} 已按内存预算淘汰")
+
+        from utils._cos_data_loader import load_model_from_cos
+        model = load_model_from_cos(model_name, deadline=deadline)
+        store[model_name] = model
+        self.evicted.discard(model_name)
+        return model
+
+    def _touch(self, model_name: str):
+        """记录模型使用，加载器据此按最近最少使用淘汰"""
+        if not self.use_cos_models:
+            return
+        try:
+            from utils._cos_data_loader import touch_model
+            touch_model(model_name)
+        except ImportError:
+            pass
+
+    def with_models(self, loaded: Dict[str, Any], models_version: Optional[str],
+                    load_report: Dict[str, Any]) -> 'RealMLPredictor':
+        """
+        用一组新版本的模型创建预测器（共享历史数据与特征，不重新加载）
+
+        原预测器不受影响，正在使用它的请求继续用旧模型完成
+
+        Args:
+            loaded: {模型名称: 模型对象或ONNX会话}
+            models_version: 这组模型的版本
+            load_report: 加载报告
+
+        Returns:
+            新的 RealMLPredictor 实例
+        """
+        predictor = copy.copy(self)
+        predictor.models = {name: m for name, m in loaded.items() if name not in self.ONNX_MODELS}
+        predictor.onnx_sessions = {name: m for name, m in loaded.items() if name in self.ONNX_MODELS}
+        predictor.models_version = models_version
+        predictor.load_report = load_report
+        predictor.evicted = set()
+        return predictor
+
+    def ensure_models(self, deadline: Optional[Deadline] = None) -> bool:
+        """
+        补加载之前因预算不足或加载失败而缺失的模型
+
+        已知缺失的模型由加载器的断路器直接跳过，不会重复请求COS
+
+        Args:
+            deadline: 请求时间预算
+
+        Returns:
+            是否已加载全部模型
+        """
+        if self.missing_models():
+            self._load_models(deadline)
+        return not self.missing_models()
+
+    def _prepare_features_for_model(self, sequence_length: int = 10) -> np.ndarray:
+        """
+        准备模型输入特征（与 scripts/train_models.py 的训练特征一致）
+
+        最近 sequence_length 期，每期 前区5个 + 后区2个 号码
 
         Args:
-            zone: 'front' 或 'back'
             sequence_length: 序列长度
 
         Returns:
-            numpy数组格式的特征
+            (sequence_length, 7) 的特征矩阵
         """
-        recent_data = self.data[:sequence_length]
         features = []
 
-        for record in recent_data:
-            if zone == 'front':
-                nums = record.get('front_zone') or record.get('front', [])
-                # 特征：号码本身 + 统计特征
-                feature = nums[:5] if len(nums) >= 5 else nums + [0] * (5 - len(nums))
-            else:
-                nums = record.get('back_zone') or record.get('back', [])
-                feature = nums[:2] if len(nums) >= 2 else nums + [0] * (2 - len(nums))
+        for record in self.data[:sequence_length]:
+            front = list(record.get('front_zone') or record.get('front', []))[:5]
+            back = list(record.get('back_zone') or record.get('back', []))[:2]
+            features.append(front + [0] * (5 - len(front)) + back + [0] * (2 - len(back)))
 
-            features.append(feature)
+        # 历史不足时补零
+        features.extend([[0] * 7] * (sequence_length - len(features)))
 
         return np.array(features, dtype=np.float32)
 
-    def _sklearn_predict(self, model_name: str, zone: str) -> List[int]:
+    @staticmethod
+    def _positive_proba(proba: np.ndarray, estimator=None) -> float:
+        """二分类器输出中"该号码出现"（类别1）的概率"""
+        classes = getattr(estimator, 'classes_', None)
+        if classes is None:
+            return float(proba[0, -1])
+        classes = list(classes)
+        # 训练集中从未出现的号码只有类别0
+        return float(proba[0, classes.index(1)]) if 1 in classes else 0.0
+
+    def _sklearn_proba(self, model_name: str, max_num: int, load_evicted: bool = True,
+                       deadline: Optional[Deadline] = None) -> np.ndarray:
         """
-        使用sklearn模型预测
+        使用sklearn/XGBoost模型计算号码概率
+
+        支持四种训练产物：
+        - XGBoost：每个号码一个 XGBClassifier 组成的列表
+        - XGBoost多输出：单个多标签 XGBClassifier，predict_proba 直接返回 (1, max_num)
+        - 服务格式：XGBoostEvaluator / ForestEvaluator，predict_proba 同样返回 (1, max_num)
+        - RandomForest：MultiOutputClassifier，predict_proba 返回每个输出的 (1, n_classes) 数组
 
         Args:
             model_name: 模型名称
-            zone: 'front' 或 'back'
+            max_num: 号码范围上限（前区35，后区12）
+            load_evicted: 模型已按内存预算淘汰时是否重新加载
+            deadline: 请求时间预算
 
         Returns:
-            预测的号码列表
+            (max_num,) 概率向量
         """
-        if model_name not in self.models:
+        model = self._resident_model(model_name, self.models, load_evicted, deadline)
+        if model is None:
             raise Exception(f"模型 {model_name} 未加载")
+        self._touch(model_name)
+        X = self._prepare_features_for_model().reshape(1, -1)
 
-        model = self.models[model_name]
-        features = self._prepare_features_for_model(zone)
-
-        # 展平特征用于传统ML模型
-        X = features.flatten().reshape(1, -1)
-
-        # 获取预测概率
-        if hasattr(model, 'predict_proba'):
-            proba = model.predict_proba(X)
-            # 选择概率最高的号码
-            max_num = 35 if zone == 'front' else 12
-            count = 5 if zone == 'front' else 2
-
-            if len(proba.shape) > 1 and proba.shape[1] >= max_num:
-                indices = np.argsort(proba[0])[-count:]
-                return sorted([i + 1 for i in indices])
+        if isinstance(model, (list, tuple)):
+            proba = [self._positive_proba(m.predict_proba(X), m) for m in model]
+        else:
+            raw = model.predict_proba(X)
+            if isinstance(raw, list):
+                estimators = getattr(model, 'estimators_', [None] * len(raw))
+                proba = [self._positive_proba(p, est) for p, est in zip(raw, estimators)]
+            else:
+                proba = np.asarray(raw)[0]
 
-        # 如果没有predict_proba，使用predict
-        pred = model.predict(X)
-        return sorted(list(set(int(p) for p in pred.flatten() if 1 <= p <= (35 if zone == 'front' else 12))))[:5 if zone == 'front' else 2]
+        proba = np.asarray(proba, dtype=np.float64)
+        if proba.shape != (max_num,):
+            raise Exception(f"模型 {model_name} 输出维度 {proba.shape} 与号码范围 {max_num} 不符")
+        return proba
 
-    def _onnx_predict(self, model_name: str, zone: str) -> List[int]:
+    def _onnx_proba(self, model_name: str, max_num: int, load_evicted: bool = True,
+                    deadline: Optional[Deadline] = None) -> np.ndarray:
         """
-        使用ONNX模型预测
+        使用ONNX模型计算号码概率
+
+        LSTM 输入为 (1, 10, 7) 序列，Transformer 输入为展平的 (1, 70)，按模型输入维度自动选择
 
         Args:
             model_name: 模型名称
-            zone: 'front' 或 'back'
+            max_num: 号码范围上限
+            load_evicted: 模型已按内存预算淘汰时是否重新加载
+            deadline: 请求时间预算
 
         Returns:
-            预测的号码列表
+            (max_num,) 概率向量
         """
-        if model_name not in self.onnx_sessions:
+        session = self._resident_model(model_name, self.onnx_sessions, load_evicted, deadline)
+        if session is None:
             raise Exception(f"ONNX模型 {model_name} 未加载")
+        self._touch(model_name)
+        features = self._prepare_features_for_model()
 
-        session = self.onnx_sessions[model_name]
-        features = self._prepare_features_for_model(zone)
+        model_input = session.get_inputs()[0]
+        if len(model_input.shape) == 2:
+            X = features.reshape(1, -1)
+        else:
+            X = features.reshape(1, features.shape[0], features.shape[1])
 
-        # ONNX输入通常需要特定形状
-        # 对于LSTM/Transformer，通常是 (batch_size, sequence_length, features)
-        X = features.reshape(1, features.shape[0], features.shape[1])
+        output = session.run(None, {model_input.name: X})[0]
 
-        # 获取输入名称
-        input_name = session.get_inputs()[0].name
-        output_name = session.get_outputs()[0].name
+        proba = np.asarray(output, dtype=np.float64).reshape(-1)
+        if proba.shape[0] < max_num:
+            raise Exception(f"ONNX模型 {model_name} 输出维度 {proba.shape[0]} 小于号码范围 {max_num}")
+        return proba[:max_num]
 
-        # 运行推理
-        result = session.run([output_name], {input_name: X})
-        output = result[0]
+    def _fallback_proba(self, zone: str) -> np.ndarray:
+        """
+        备用概率（当模型不可用时）：热号权重3，其余为1
 
-        # 处理输出
-        max_num = 35 if zone == 'front' else 12
-        count = 5 if zone == 'front' else 2
+        Args:
+            zone: 'front' 或 'back'
 
-        if output.shape[-1] >= max_num:
-            # 输出是概率分布
-            proba = output.flatten()[:max_num]
-            indices = np.argsort(proba)[-count:]
-            return sorted([i + 1 for i in indices])
-        else:
-            # 输出是号码
-            return sorted(list(set(int(p) for p in output.flatten() if 1 <= p <= max_num)))[:count]
+        Returns:
+            (max_num,) 概率向量
+        """
+        hot_nums = set(self.features[f'{zone}_hot'])
+        max_num = 35 if zone == 'front' else 12
+        return normalize([3 if n in hot_nums else 1 for n in range(1, max_num + 1)])
 
     def _fallback_predict(self, zone: str) -> List[int]:
         """
@@ -205,133 +379,151 @@ class RealMLPredictor:
         Returns:
             预测的号码列表
         """
-        import random
-
-        hot_nums = self.features[f'{zone}_hot']
         max_num = 35 if zone == 'front' else 12
         count = 5 if zone == 'front' else 2
 
         # 基于热号的加权随机选择
-        all_nums = list(range(1, max_num + 1))
-        weights = [3 if n in hot_nums else 1 for n in all_nums]
-
-        selected = []
-        available = all_nums.copy()
-        available_weights = weights.copy()
-
-        for _ in range(count):
-            if not available:
-                break
-            total = sum(available_weights)
-            r = random.random() * total
-            cumsum = 0
-            for i, n in enumerate(available):
-                cumsum += available_weights[i]
-                if cumsum >= r:
-                    selected.append(n)
-                    del available_weights[i]
-                    available.remove(n)
-                    break
-
-        return sorted(selected)
-
-    def xgboost_predict(self) -> Dict[str, Any]:
-        """XGBoost模型预测"""
-        try:
-            front = self._sklearn_predict('xgboost_front', 'front')
-            back = self._sklearn_predict('xgboost_back', 'back')
-            source = 'cos_model'
-        except Exception as e:
-            print(f"⚠️  XGBoost预测回退: {e}")
+        return weighted_sample(list(range(1, max_num + 1)), self._fallback_proba(zone), count)
+
+    def _model_result(self, model: str, front_proba: np.ndarray, back_proba: np.ndarray,
+                      source: str, confidence: float, description: str) -> Dict[str, Any]:
+        """
+        组装单模型结果：完整概率向量 + 由概率得到的号码
+
+        模型可用时取概率最高的号码；回退（含模型已淘汰）时按备用概率加权随机选择
+        """
+        if source in ('fallback', 'evicted'):
             front = self._fallback_predict('front')
             back = self._fallback_predict('back')
-            source = 'fallback'
+        else:
+            front = top_numbers(front_proba, 5)
+            back = top_numbers(back_proba, 2)
 
         return {
-            'model': 'XGBoost',
+            'model': model,
             'front': front,
             'back': back,
-            'confidence': 0.72 if source == 'cos_model' else 0.65,
+            'front_proba': normalize(front_proba),
+            'back_proba': normalize(back_proba),
+            'confidence': confidence,
             'source': source,
-            'description': 'XGBoost梯度提升树模型'
+            'description': description
         }
 
-    def random_forest_predict(self) -> Dict[str, Any]:
-        """RandomForest模型预测"""
+    def xgboost_predict(self, deadline: Optional[Deadline] = None, load_evicted: bool = True) -> Dict[str, Any]:
+        """XGBoost模型预测（load_evicted 为False时已淘汰的模型不重新加载，结果来源为 evicted）"""
+        try:
+            check_deadline(deadline, 'inference:xgboost', INFERENCE_MIN_SECONDS, 'fallback')
+            front_proba = self._sklearn_proba('xgboost_front', 35, load_evicted, deadline)
+            back_proba = self._sklearn_proba('xgboost_back', 12, load_evicted, deadline)
+            source = 'cos_model'
+        except ModelEvicted:
+            front_proba = self._fallback_proba('front')
+            back_proba = self._fallback_proba('back')
+            source = 'evicted'
+        except Exception as e:
+            print(f"⚠️  XGBoost预测回退: {e}")
+            front_proba = self._fallback_proba('front')
+            back_proba = self._fallback_proba('back')
+            source = 'fallback'
+
+        return self._model_result(
+            'XGBoost', front_proba, back_proba, source,
+            0.72 if source == 'cos_model' else 0.65,
+            'XGBoost梯度提升树模型'
+        )
+
+    def random_forest_predict(self, deadline: Optional[Deadline] = None, load_evicted: bool = True) -> Dict[str, Any]:
+        """RandomForest模型预测（load_evicted 为False时已淘汰的模型不重新加载，结果来源为 evicted）"""
         try:
-            front = self._sklearn_predict('random_forest_front', 'front')
-            back = self._sklearn_predict('random_forest_back', 'back')
+            check_deadline(deadline, 'inference:random_forest', INFERENCE_MIN_SECONDS, 'fallback')
+            front_proba = self._sklearn_proba('random_forest_front', 35, load_evicted, deadline)
+            back_proba = self._sklearn_proba('random_forest_back', 12, load_evicted, deadline)
             source = 'cos_model'
+        except ModelEvicted:
+            front_proba = self._fallback_proba('front')
+            back_proba = self._fallback_proba('back')
+            source = 'evicted'
         except Exception as e:
             print(f"⚠️  RandomForest预测回退: {e}")
-            front = self._fallback_predict('front')
-            back = self._fallback_predict('back')
+            front_proba = self._fallback_proba('front')
+            back_proba = self._fallback_proba('back')
             source = 'fallback'
 
-        return {
-            'model': 'RandomForest',
-            'front': front,
-            'back': back,
-            'confidence': 0.68 if source == 'cos_model' else 0.62,
-            'source': source,
-            'description': '随机森林集成模型'
-        }
+        return self._model_result(
+            'RandomForest', front_proba, back_proba, source,
+            0.68 if source == 'cos_model' else 0.62,
+            '随机森林集成模型'
+        )
 
-    def lstm_predict(self) -> Dict[str, Any]:
-        """LSTM模型预测"""
+    def lstm_predict(self, deadline: Optional[Deadline] = None, load_evicted: bool = True) -> Dict[str, Any]:
+        """LSTM模型预测（load_evicted 为False时已淘汰的模型不重新加载，结果来源为 evicted）"""
         try:
-            front = self._onnx_predict('lstm_front', 'front')
-            back = self._onnx_predict('lstm_back', 'back')
+            check_deadline(deadline, 'inference:lstm', INFERENCE_MIN_SECONDS, 'fallback')
+            front_proba = self._onnx_proba('lstm_front', 35, load_evicted, deadline)
+            back_proba = self._onnx_proba('lstm_back', 12, load_evicted, deadline)
             source = 'onnx_model'
+        except ModelEvicted:
+            front_proba = self._fallback_proba('front')
+            back_proba = self._fallback_proba('back')
+            source = 'evicted'
         except Exception as e:
             print(f"⚠️  LSTM预测回退: {e}")
-            front = self._fallback_predict('front')
-            back = self._fallback_predict('back')
+            front_proba = self._fallback_proba('front')
+            back_proba = self._fallback_proba('back')
             source = 'fallback'
 
-        return {
-            'model': 'LSTM',
-            'front': front,
-            'back': back,
-            'confidence': 0.75 if source == 'onnx_model' else 0.65,
-            'source': source,
-            'description': '长短期记忆网络时序模型'
-        }
+        return self._model_result(
+            'LSTM', front_proba, back_proba, source,
+            0.75 if source == 'onnx_model' else 0.65,
+            '长短期记忆网络时序模型'
+        )
 
-    def transformer_predict(self) -> Dict[str, Any]:
-        """Transformer模型预测"""
+    def transformer_predict(self, deadline: Optional[Deadline] = None, load_evicted: bool = True) -> Dict[str, Any]:
+        """Transformer模型预测（load_evicted 为False时已淘汰的模型不重新加载，结果来源为 evicted）"""
         try:
-            front = self._onnx_predict('transformer_front', 'front')
-            back = self._onnx_predict('transformer_back', 'back')
+            check_deadline(deadline, 'inference:transformer', INFERENCE_MIN_SECONDS, 'fallback')
+            front_proba = self._onnx_proba('transformer_front', 35, load_evicted, deadline)
+            back_proba = self._onnx_proba('transformer_back', 12, load_evicted, deadline)
             source = 'onnx_model'
+        except ModelEvicted:
+            front_proba = self._fallback_proba('front')
+            back_proba = self._fallback_proba('back')
+            source = 'evicted'
         except Exception as e:
             print(f"⚠️  Transformer预测回退: {e}")
-            front = self._fallback_predict('front')
-            back = self._fallback_predict('back')
+            front_proba = self._fallback_proba('front')
+            back_proba = self._fallback_proba('back')
             source = 'fallback'
 
-        return {
-            'model': 'Transformer',
-            'front': front,
-            'back': back,
-            'confidence': 0.78 if source == 'onnx_model' else 0.65,
-            'source': source,
-            'description': 'Transformer注意力机制模型'
-        }
+        return self._model_result(
+            'Transformer', front_proba, back_proba, source,
+            0.78 if source == 'onnx_model' else 0.65,
+            'Transformer注意力机制模型'
+        )
 
-    def ensemble_predict(self) -> Dict[str, Any]:
+    def ensemble_predict(self, method: str = 'log_linear', deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         """
-        融合预测 - 综合所有模型结果
+        融合预测 - 在概率层面融合所有模型
+
+        各模型的 35/12 维概率向量堆叠为矩阵后一次加权池化，
+        号码、概率向量和置信度都来自同一次融合结果
+
+        已按内存预算淘汰的模型不参与融合（不在请求中重新下载），全部被淘汰时仍使用所有结果
+
+        Args:
+            method: 融合方式，'log_linear'（默认）或 'linear'
+            deadline: 请求时间预算，预算用完后剩余模型使用备用概率
 
         Returns:
             融合预测结果
         """
         # 获取各模型预测
         predictions = {
-            'xgboost': self.xgboost_predict(),
-            'random_forest': self.random_forest_predict(),
-            'lstm': self.lstm_predict(),
-            'transformer': self.transformer_predict()
+            'xgboost': self.xgboost_predict(deadline, load_evicted=False),
+            'random_forest': self.random_forest_predict(deadline, load_evicted=False),
+            'lstm': self.lstm_predict(deadline, load_evicted=False),
+            'transformer': self.transformer_predict(deadline, load_evicted=False)
         }
 
         # 模型权重
@@ -342,39 +534,42 @@ class RealMLPredictor:
             'transformer': 0.25
         }
 
-        # 前区投票
-        front_scores = {}
-        for model_name, pred in predictions.items():
-            w = weights[model_name]
-            for i, n in enumerate(pred['front']):
-                front_scores[n] = front_scores.get(n, 0) + w * (5 - i)
-
-        # 后区投票
-        back_scores = {}
-        for model_name, pred in predictions.items():
-            w = weights[model_name]
-            for i, n in enumerate(pred['back']):
-                back_scores[n] = back_scores.get(n, 0) + w * (2 - i)
+        evicted = [name for name, pred in predictions.items() if pred['source'] == 'evicted']
+        names = [name for name in predictions if name not in evicted] or list(predictions)
+        model_weights = [weights[name] for name in names]
+        front_fused = fuse_zone([predictions[n]['front_proba'] for n in names], model_weights, 5, method, 35)
+        back_fused = fuse_zone([predictions[n]['back_proba'] for n in names], model_weights, 2, method, 12)
 
-        # 选择得分最高的号码
-        front = sorted(sorted(front_scores.keys(), key=lambda x: front_scores[x], reverse=True)[:5])
-        back = sorted(sorted(back_scores.keys(), key=lambda x: back_scores[x], reverse=True)[:2])
-
-        # 计算平均置信度
-        avg_confidence = sum(pred['confidence'] * weights[name] for name, pred in predictions.items())
+        # 计算参与融合的模型的加权平均置信度
+        avg_confidence = sum(predictions[n]['confidence'] * weights[n] for n in names) / sum(model_weights)
 
         # 统计模型来源
         sources = {name: pred['source'] for name, pred in predictions.items()}
         cos_model_count = sum(1 for s in sources.values() if s in ['cos_model', 'onnx_model'])
 
+        # 概率向量转为列表，便于JSON序列化
+        for pred in predictions.values():
+            pred['front_proba'] = [round(float(p), 6) for p in pred['front_proba']]
+            pred['back_proba'] = [round(float(p), 6) for p in pred['back_proba']]
+
         return {
             'model': 'Ensemble',
-            'front': front,
-            'back': back,
+            'front': front_fused['numbers'],
+            'back': back_fused['numbers'],
             'confidence': round(avg_confidence, 3),
+            'front_proba': [round(float(p), 6) for p in front_fused['proba']],
+            'back_proba': [round(float(p), 6) for p in back_fused['proba']],
+            'fusion': {
+                'method': method,
+                'front_coverage': front_fused['coverage'],
+                'front_lift': front_fused['lift'],
+                'back_coverage': back_fused['coverage'],
+                'back_lift': back_fused['lift']
+            },
             'individual_predictions': predictions,
             'weights': weights,
             'model_sources': sources,
+            'evicted_models': evicted,
             'cos_models_used': cos_model_count,
             'total_models': len(predictions),
             'training_periods': self.features['total_periods'],
@@ -382,15 +577,11 @@ class RealMLPredictor:
         }
 
     def get_all_predictions(self) -> Dict[str, Any]:
-        """获取所有模型的预测结果"""
+        """获取所有模型的预测结果（单模型结果复用融合时的计算，不重复推理）"""
+        ensemble = self.ensemble_predict()
         return {
-            'ensemble': self.ensemble_predict(),
-            'individual': {
-                'xgboost': self.xgboost_predict(),
-                'random_forest': self.random_forest_predict(),
-                'lstm': self.lstm_predict(),
-                'transformer': self.transformer_predict()
-            },
+            'ensemble': ensemble,
+            'individual': ensemble['individual_predictions'],
             'features': self.features,
             'timestamp': datetime.now().isoformat()
         }
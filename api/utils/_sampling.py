@@ -0,0 +1,157 @@
+"""
+加权无放回抽样（Gumbel-max top-k）
+- 对每个权重加独立Gumbel噪声后取前k大，一步完成k个号码的无放回抽样
+- 支持一次性抽取大量独立号码组合（按块生成，内存占用恒定）
+- 单组抽样使用等价的纯Python实现（Efraimidis-Spirakis键值法），无需numpy
+"""
+import math
+import random
+import heapq
+from typing import List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # 无numpy环境（简化版预测器）仍可使用单组抽样
+    np = None
+
+
+# 批量抽样时每块的号码组合数（35号码 × 65536行 ≈ 9MB float32）
+DEFAULT_CHUNK_SIZE = 65536
+
+
+def _make_rng(seed):
+    """
+    构造numpy随机数生成器
+
+    seed 为 None 时从标准库 random 派生种子，
+    这样调用方已有的 random.seed(...) 仍能保证结果可复现
+    """
+    if isinstance(seed, np.random.Generator):
+        return seed
+    if seed is None:
+        seed = random.getrandbits(64)
+    return np.random.default_rng(seed)
+
+
+def _inverse_weights(weights) -> 'np.ndarray':
+    """权重取倒数（0权重 -> inf，永远不会被抽中）"""
+    w = np.asarray(weights, dtype=np.float32)
+    if w.ndim != 1 or w.size == 0:
+        raise ValueError("weights 必须是非空一维序列")
+    if np.any(w < 0) or not np.all(np.isfinite(w)):
+        raise ValueError("weights 必须是非负有限值")
+    with np.errstate(divide='ignore'):
+        return 1.0 / w
+
+
+def gumbel_top_k(weights, k: int, n_draws: int = 1, seed=None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> 'np.ndarray':
+    """
+    Gumbel-max top-k：一次抽取 n_draws 组、每组 k 个不重复的下标
+
+    实现上使用等价的指数竞赛形式：log(w) - log(E) 正是 log(w) + Gumbel 噪声，
+    因此取 E / w 最小的k个即为Gumbel top-k，省去两次对数运算（E ~ Exp(1)）
+
+    Args:
+        weights: 长度为N的非负权重
+        k: 每组抽取个数（k <= N）
+        n_draws: 独立抽取的组数
+        seed: 随机种子（int / numpy Generator / None）
+        chunk_size: 每块生成的组数
+
+    Returns:
+        形状为 (n_draws, k) 的下标矩阵，每行按下标升序
+    """
+    inv_w = _inverse_weights(weights)
+    n = inv_w.shape[0]
+    if not 0 < k <= n:
+        raise ValueError(f"k 必须在 1..{n} 之间: {k}")
+
+    rng = _make_rng(seed)
+    index_dtype = np.int16 if n < 2 ** 15 else np.int32
+    result = np.empty((n_draws, k), dtype=index_dtype)
+
+    for start in range(0, n_draws, chunk_size):
+        stop = min(start + chunk_size, n_draws)
+        keys = rng.standard_exponential(size=(stop - start, n), dtype=np.float32)
+        with np.errstate(invalid='ignore'):
+            keys *= inv_w
+        if k < n:
+            top = np.argpartition(keys, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(n), keys.shape)
+        result[start:stop] = np.sort(top, axis=1)
+
+    return result
+
+
+def _python_weighted_sample(weights: Sequence[float], k: int, rng: random.Random) -> List[int]:
+    """纯Python实现：键值 log(u)/w 取前k大（与Gumbel top-k同分布）"""
+    keys = []
+    for i, w in enumerate(weights):
+        if w < 0:
+            raise ValueError("weights 必须是非负有限值")
+        if w == 0:
+            keys.append((-math.inf, i))
+        else:
+            u = rng.random() or 1e-300
+            keys.append((math.log(u) / w, i))
+    return sorted(i for _, i in heapq.nlargest(k, keys))
+
+
+def weighted_sample(numbers: Sequence[int], weights: Sequence[float], k: int,
+                    seed: Optional[int] = None) -> List[int]:
+    """
+    按权重从 numbers 中无放回抽取 k 个号码
+
+    Args:
+        numbers: 候选号码
+        weights: 对应权重（非负）
+        k: 抽取个数（超过候选数时取全部）
+        seed: 随机种子（int；None 时使用标准库 random 的全局状态）
+
+    Returns:
+        升序排列的号码列表
+    """
+    if len(numbers) != len(weights):
+        raise ValueError("numbers 与 weights 长度不一致")
+
+    k = min(k, len(numbers))
+    if k <= 0:
+        return []
+
+    # 单组抽样用纯Python一次遍历即可，避免构造numpy生成器的固定开销
+    rng = random.Random(seed) if seed is not None else random
+    indices = _python_weighted_sample(weights, k, rng)
+
+    return sorted(int(numbers[i]) for i in indices)
+
+
+def weighted_sample_batch(numbers: Sequence[int], weights: Sequence[float], k: int,
+                          n_tickets: int, seed=None,
+                          chunk_size: int = DEFAULT_CHUNK_SIZE) -> 'np.ndarray':
+    """
+    批量抽取 n_tickets 组相互独立的号码组合
+
+    Args:
+        numbers: 候选号码
+        weights: 对应权重（非负）
+        k: 每组号码个数
+        n_tickets: 组数
+        seed: 随机种子
+        chunk_size: 每块生成的组数
+
+    Returns:
+        形状为 (n_tickets, k) 的号码矩阵，每行升序
+    """
+    if np is None:
+        raise ImportError("批量抽样需要安装 numpy")
+    if len(numbers) != len(weights):
+        raise ValueError("numbers 与 weights 长度不一致")
+
+    numbers_arr = np.asarray(numbers)
+    indices = gumbel_top_k(weights, k, n_tickets, seed, chunk_size)
+    tickets = numbers_arr[indices]
+    if np.any(np.diff(numbers_arr) < 0):
+        tickets.sort(axis=1)
+    return tickets
@@ -0,0 +1,50 @@
+"""
+每日灵修预测
+- /api/spiritual 的 GET 预测只由北京时间日期决定，同一天所有请求返回同一注
+- 开奖后融合权重任务（scripts/update_fusion_weights.py）按开奖日期重新推算当天返回的预测并评分，
+  请求路径上不需要读写COS
+"""
+import hashlib
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+
+# 开奖日期按北京时间（UTC+8）计算
+BEIJING_TZ = timezone(timedelta(hours=8))
+
+
+def get_beijing_date(now: Optional[datetime] = None) -> str:
+    """
+    当前北京时间日期
+
+    Args:
+        now: 指定时间（默认当前时间，无时区时按UTC处理）
+
+    Returns:
+        'YYYY-MM-DD'
+    """
+    now = now or datetime.now(timezone.utc)
+    if now.tzinfo is None:
+        now = now.replace(tzinfo=timezone.utc)
+    return now.astimezone(BEIJING_TZ).date().isoformat()
+
+
+def daily_spiritual_prediction(date: str) -> Dict[str, Any]:
+    """
+    指定日期的灵修预测（跨进程稳定：种子取日期的md5）
+
+    Args:
+        date: 'YYYY-MM-DD'（北京时间）
+
+    Returns:
+        {'front_zone': [...], 'back_zone': [...], 'intensity': float}
+    """
+    seed = int(hashlib.md5(f'spiritual:{date}'.encode()).hexdigest()[:8], 16)
+    rng = random.Random(seed)
+
+    front_zone = sorted(rng.sample(range(1, 36), 5))
+    back_zone = sorted(rng.sample(range(1, 13), 2))
+    intensity = round(rng.uniform(0.6, 0.9), 2)
+
+    return {'front_zone': front_zone, 'back_zone': back_zone, 'intensity': intensity}
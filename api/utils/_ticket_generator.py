@@ -0,0 +1,101 @@
+"""
+批量号码生成
+- 基于融合概率向量一次生成N注互不重复的号码
+- 按块抽样（内存占用与N无关），哈希集合去重
+- 以生成器形式逐注产出，便于NDJSON流式输出
+"""
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from utils._sampling import weighted_sample_batch
+
+
+# 单次请求允许生成的最大注数
+MAX_TICKET_COUNT = 100000
+
+# 每块抽样的注数
+DEFAULT_CHUNK_SIZE = 4096
+
+# 连续多少块没有产生新号码时停止（概率过于集中，可组合数不足）
+MAX_STALLED_CHUNKS = 8
+
+FRONT_NUMBERS = np.arange(1, 36)
+BACK_NUMBERS = np.arange(1, 13)
+
+
+def _ticket_keys(fronts: np.ndarray, backs: np.ndarray) -> np.ndarray:
+    """
+    将号码组合编码为64位整数（前区35位掩码 + 后区12位掩码）
+
+    Args:
+        fronts: (n, 5) 前区号码
+        backs: (n, 2) 后区号码
+
+    Returns:
+        (n,) uint64 键值
+    """
+    one = np.uint64(1)
+    front_bits = np.bitwise_or.reduce(one << (fronts.astype(np.uint64) - one), axis=1)
+    back_bits = np.bitwise_or.reduce(one << (backs.astype(np.uint64) - one), axis=1)
+    return front_bits | (back_bits << np.uint64(35))
+
+
+def iter_unique_tickets(front_proba: Sequence[float], back_proba: Sequence[float], count: int,
+                        seed: Optional[int] = None,
+                        chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Dict[str, List[int]]]:
+    """
+    逐注生成互不重复的号码
+
+    Args:
+        front_proba: 前区35个号码的概率
+        back_proba: 后区12个号码的概率
+        count: 需要生成的注数
+        seed: 随机种子
+        chunk_size: 每块抽样注数
+
+    Yields:
+        {'front_zone': [...], 'back_zone': [...]}
+    """
+    if len(front_proba) != 35 or len(back_proba) != 12:
+        raise ValueError("概率向量长度必须为前区35、后区12")
+
+    count = min(int(count), MAX_TICKET_COUNT)
+    rng = np.random.default_rng(seed)
+    seen = set()
+    stalled = 0
+
+    while len(seen) < count and stalled < MAX_STALLED_CHUNKS:
+        size = min(chunk_size, max(count - len(seen), 64))
+        fronts = weighted_sample_batch(FRONT_NUMBERS, front_proba, 5, size, seed=rng)
+        backs = weighted_sample_batch(BACK_NUMBERS, back_proba, 2, size, seed=rng)
+        keys = _ticket_keys(fronts, backs).tolist()
+
+        produced = 0
+        for key, front, back in zip(keys, fronts.tolist(), backs.tolist()):
+            if key in seen:
+                continue
+            seen.add(key)
+            produced += 1
+            yield {'front_zone': front, 'back_zone': back}
+            if len(seen) >= count:
+                break
+
+        stalled = stalled + 1 if produced == 0 else 0
+
+
+def generate_tickets(front_proba: Sequence[float], back_proba: Sequence[float], count: int,
+                     seed: Optional[int] = None) -> List[Dict[str, List[int]]]:
+    """
+    一次性生成N注互不重复的号码（小批量时使用）
+
+    Args:
+        front_proba: 前区35个号码的概率
+        back_proba: 后区12个号码的概率
+        count: 注数
+        seed: 随机种子
+
+    Returns:
+        号码列表
+    """
+    return list(iter_unique_tickets(front_proba, back_proba, count, seed))
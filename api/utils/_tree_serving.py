@@ -0,0 +1,260 @@
+"""
+树模型的轻量服务格式（不依赖 pickle / scikit-learn）
+- XGBoost：每个号码一个原生 Booster（或一个多输出 Booster），UBJSON 原始字节拼接后存入 .npz（*.xgb.npz），
+  加载时直接交给 xgboost.Booster，无需导入 sklearn 包装类
+- RandomForest：所有输出的所有树展平为连续节点数组（feature / threshold / left / right / value），
+  存入 .npz（*.rf.npz），用纯 NumPy 对一批样本同时遍历全部树
+两种格式的 predict_proba 都返回 (n_samples, n_outputs) 的"该号码出现"概率，
+与原模型的类别1概率一致（RandomForest 在浮点误差范围内）
+"""
+import io
+from typing import Any, Dict, List, Union
+
+import numpy as np
+
+
+SERVING_FORMAT_VERSION = 1
+XGB_SUFFIX = '.xgb.npz'
+RF_SUFFIX = '.rf.npz'
+
+
+def _open_npz(source: Union[str, bytes]):
+    """从文件路径或字节加载 .npz（不允许 pickle 对象）"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(bytes(source))
+    return np.load(source, allow_pickle=False)
+
+
+def _positive_index(classes) -> int:
+    """类别1在 classes_ 中的下标；训练集中从未出现的号码只有类别0，返回-1"""
+    classes = list(classes)
+    return classes.index(1) if 1 in classes else -1
+
+
+# ==================== XGBoost ====================
+
+def export_xgboost(models: Union[List[Any], Any], path: str) -> Dict[str, Any]:
+    """
+    将 XGBoost 模型导出为原生 Booster 格式
+
+    Args:
+        models: 每个号码一个 XGBClassifier 的列表，或单个多输出 XGBClassifier（train_xgboost 的产物）
+        path: 输出文件路径（*.xgb.npz）
+
+    Returns:
+        导出信息
+    """
+    multi_output = not isinstance(models, (list, tuple))
+    if multi_output:
+        models = [models]
+
+    raws = []
+    positive = []
+    for clf in models:
+        raws.append(np.frombuffer(bytes(clf.get_booster().save_raw('ubj')), dtype=np.uint8))
+        positive.append(_positive_index(getattr(clf, 'classes_', [0, 1])) >= 0)
+
+    offsets = np.cumsum([0] + [len(raw) for raw in raws]).astype(np.int64)
+    np.savez(
+        path,
+        kind=np.array('xgboost'),
+        format_version=np.array(SERVING_FORMAT_VERSION),
+        boosters=np.concatenate(raws) if raws else np.zeros(0, dtype=np.uint8),
+        offsets=offsets,
+        positive=np.array(positive, dtype=bool),
+        multi_output=np.array(multi_output)
+    )
+    return {'kind': 'xgboost', 'multi_output': multi_output, 'n_boosters': len(models), 'path': path}
+
+
+class XGBoostEvaluator:
+    """原生 Booster 集合：按号码逐个推理，多输出模型一次推理得到全部号码"""
+
+    def __init__(self, boosters: List[Any], positive: np.ndarray, multi_output: bool = False):
+        self.boosters = boosters
+        self.positive = positive
+        self.multi_output = multi_output
+        self.n_outputs = len(boosters)
+
+    @classmethod
+    def from_npz(cls, npz) -> 'XGBoostEvaluator':
+        import xgboost as xgb
+
+        raw = npz['boosters']
+        offsets = npz['offsets']
+        boosters = []
+        for start, end in zip(offsets[:-1], offsets[1:]):
+            booster = xgb.Booster()
+            booster.load_model(bytearray(raw[start:end].tobytes()))
+            boosters.append(booster)
+        multi_output = bool(npz['multi_output']) if 'multi_output' in npz.files else False
+        return cls(boosters, npz['positive'], multi_output)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """
+        Args:
+            X: (n_samples, n_features) 特征
+
+        Returns:
+            (n_samples, n_outputs) 类别1概率
+        """
+        X = np.asarray(X, dtype=np.float32)
+        if self.multi_output:
+            return np.asarray(self.boosters[0].inplace_predict(X), dtype=np.float64).reshape(X.shape[0], -1)
+
+        proba = np.zeros((X.shape[0], self.n_outputs), dtype=np.float64)
+        for i, booster in enumerate(self.boosters):
+            if self.positive[i]:
+                proba[:, i] = booster.inplace_predict(X)
+        return proba
+
+
+# ==================== RandomForest ====================
+
+def export_random_forest(model: Any, path: str) -> Dict[str, Any]:
+    """
+    将 MultiOutputClassifier(RandomForestClassifier) 展平为节点数组
+
+    每个叶子节点的 value 为该叶子上类别1的比例；叶子的左右子节点指向自身，
+    遍历固定步数（最大深度）后所有样本都停在叶子上
+
+    Args:
+        model: train_random_forest 的产物
+        path: 输出文件路径（*.rf.npz）
+
+    Returns:
+        导出信息
+    """
+    feature, threshold, left, right, value = [], [], [], [], []
+    roots = []
+    max_depth = 0
+    offset = 0
+
+    for forest in model.estimators_:
+        pos = _positive_index(forest.classes_)
+        output_roots = []
+        for tree in forest.estimators_:
+            t = tree.tree_
+            n_nodes = t.node_count
+            index = np.arange(n_nodes, dtype=np.int64)
+            is_leaf = t.children_left == -1
+
+            counts = t.value[:, 0, :]
+            totals = counts.sum(axis=1)
+            leaf_value = np.zeros(n_nodes) if pos < 0 else counts[:, pos] / np.where(totals > 0, totals, 1)
+
+            feature.append(np.where(is_leaf, 0, t.feature).astype(np.int32))
+            threshold.append(np.where(is_leaf, 0.0, t.threshold))
+            left.append((np.where(is_leaf, index, t.children_left) + offset).astype(np.int32))
+            right.append((np.where(is_leaf, index, t.children_right) + offset).astype(np.int32))
+            value.append(leaf_value)
+
+            output_roots.append(offset)
+            max_depth = max(max_depth, t.max_depth)
+            offset += n_nodes
+        roots.append(output_roots)
+
+    np.savez(
+        path,
+        kind=np.array('random_forest'),
+        format_version=np.array(SERVING_FORMAT_VERSION),
+        feature=np.concatenate(feature),
+        threshold=np.concatenate(threshold),
+        left=np.concatenate(left),
+        right=np.concatenate(right),
+        value=np.concatenate(value),
+        roots=np.array(roots, dtype=np.int32),
+        max_depth=np.array(max_depth)
+    )
+    return {'kind': 'random_forest', 'n_outputs': len(roots), 'n_nodes': offset, 'path': path}
+
+
+class ForestEvaluator:
+    """展平的随机森林，纯 NumPy 推理"""
+
+    def __init__(self, feature, threshold, left, right, value, roots, max_depth):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.n_outputs = roots.shape[0]
+
+    @classmethod
+    def from_npz(cls, npz) -> 'ForestEvaluator':
+        return cls(npz['feature'], npz['threshold'], npz['left'], npz['right'],
+                   npz['value'], npz['roots'], npz['max_depth'])
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """
+        Args:
+            X: (n_samples, n_features) 特征
+
+        Returns:
+            (n_samples, n_outputs) 类别1概率（每个输出为其全部树的平均）
+        """
+        # 与 sklearn 一致：特征先转为 float32 再与 float64 阈值比较
+        X = np.asarray(X, dtype=np.float32)
+        rows = np.arange(X.shape[0])[:, None]
+        nodes = np.broadcast_to(self.roots.reshape(1, -1), (X.shape[0], self.roots.size)).copy()
+
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+
+        leaf = self.value[nodes].reshape(X.shape[0], self.n_outputs, -1)
+        return leaf.mean(axis=2)
+
+
+# ==================== 通用 ====================
+
+def serving_suffix(model_name: str):
+    """模型名对应的服务格式后缀，不支持的模型返回None"""
+    if 'random_forest' in model_name:
+        return RF_SUFFIX
+    if 'xgboost' in model_name:
+        return XGB_SUFFIX
+    return None
+
+
+def export_serving_model(model: Any, path_prefix: str) -> Dict[str, Any]:
+    """
+    按模型类型导出服务格式
+
+    Args:
+        model: XGBClassifier 列表、多输出 XGBClassifier 或 MultiOutputClassifier
+        path_prefix: 输出路径前缀（如 models/xgboost_front），自动追加后缀
+
+    Returns:
+        导出信息（含实际路径）
+    """
+    if isinstance(model, (list, tuple)) or hasattr(model, 'get_booster'):
+        return export_xgboost(model, path_prefix + XGB_SUFFIX)
+    if hasattr(model, 'estimators_') and hasattr(model.estimators_[0], 'estimators_'):
+        return export_random_forest(model, path_prefix + RF_SUFFIX)
+    raise ValueError(f"不支持导出服务格式的模型类型: {type(model).__name__}")
+
+
+def load_serving_model(source: Union[str, bytes]):
+    """
+    加载服务格式模型
+
+    Args:
+        source: 文件路径或文件内容
+
+    Returns:
+        XGBoostEvaluator 或 ForestEvaluator
+    """
+    with _open_npz(source) as npz:
+        version = int(npz['format_version'])
+        if version != SERVING_FORMAT_VERSION:
+            raise ValueError(f"不支持的服务格式版本: {version}")
+
+        kind = str(npz['kind'])
+        if kind == 'xgboost':
+            return XGBoostEvaluator.from_npz(npz)
+        if kind == 'random_forest':
+            return ForestEvaluator.from_npz(npz)
+    raise ValueError(f"未知服务格式: {kind}")
@@ -152,19 +152,98 @@ class TencentCOSClient:
                 'error': str(e)
             }
 
-    def upload_json(self, data: Any, cos_path: str) -> Dict[str, Any]:
+    def download_bytes(self, cos_path: str) -> bytes:
+        """
+        从COS下载对象到内存（不落盘）
+
+        Args:
+            cos_path: COS上的路径
+
+        Returns:
+            对象内容
+        """
+        print(f"📥 下载到内存: cos://{self.bucket}/{cos_path}")
+
+        try:
+            response = self.client.get_object(
+                Bucket=self.bucket,
+                Key=cos_path
+            )
+            data = response['Body'].get_raw_stream().read()
+
+            print(f"✅ 下载成功！大小: {len(data) / 1024:.2f} KB")
+            return data
+
+        except Exception as e:
+            print(f"❌ 下载失败: {str(e)}")
+            raise Exception(f"下载失败: {str(e)}")
+
+    def download_range(self, cos_path: str, start: int, end: int) -> bytes:
+        """
+        按字节范围下载对象的一部分（HTTP Range，闭区间）
+
+        Args:
+            cos_path: COS上的路径
+            start: 起始字节
+            end: 结束字节（包含）
+
+        Returns:
+            该范围的内容
+        """
+        print(f"📥 范围下载: cos://{self.bucket}/{cos_path} [{start}-{end}]")
+
+        try:
+            response = self.client.get_object(
+                Bucket=self.bucket,
+                Key=cos_path,
+                Range=f'bytes={start}-{end}'
+            )
+            data = response['Body'].get_raw_stream().read()
+
+            if len(data) != end - start + 1:
+                raise Exception(f"范围长度不符: {len(data)} != {end - start + 1}")
+            return data
+
+        except Exception as e:
+            print(f"❌ 下载失败: {str(e)}")
+            raise Exception(f"下载失败: {str(e)}")
+
+    def get_object_info(self, cos_path: str) -> Dict[str, Any]:
+        """
+        获取对象元信息（不下载内容）
+
+        Args:
+            cos_path: COS上的路径
+
+        Returns:
+            {'etag': ..., 'size': ...}
+        """
+        response = self.client.head_object(
+            Bucket=self.bucket,
+            Key=cos_path
+        )
+        return {
+            'etag': response.get('ETag', '').strip('"'),
+            'size': int(response.get('Content-Length', 0))
+        }
+
+    def upload_json(self, data: Any, cos_path: str, compact: bool = False) -> Dict[str, Any]:
         """
         上传JSON数据到COS
 
         Args:
             data: 要上传的数据（将被序列化为JSON）
             cos_path: COS上的路径
+            compact: 是否使用紧凑格式（无缩进和多余空格）
 
         Returns:
             上传结果信息
         """
         with tempfile.NamedTemporaryFile(mode='w', encoding='utf-8', suffix='.json', delete=False) as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+            if compact:
+                json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+            else:
+                json.dump(data, f, ensure_ascii=False, indent=2)
             temp_path = f.name
 
         try:
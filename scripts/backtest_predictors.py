@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+逐期前推（walk-forward）回测
+对历史上每一期 t：只用 t 之前的开奖构建预测器 -> 预测第 t 期 -> 按奖级评分
+
+覆盖的预测器:
+  real_ml         api/utils/_real_ml_predictor.RealMLPredictor（融合预测）
+  simple_ml       api/utils/_ml_predictor.MLPredictor（综合推荐组）
+  latest_results  api/latest-results.py 中的 MLPredictor（融合预测）
+
+各期按连续区间分配到进程池；每个进程从最早一期向后推进，训练集每步只在最前面新增一期：
+  real_ml         通过 refresh_data 增量更新特征
+  simple_ml       全历史频率（冷热号）取自累计计数器，其余特征只看固定窗口
+  latest_results  get_frequency 取自累计计数器，近期频率只看最近50期
+每期的工作量与历史长度无关，整段回测不再是 O(n²)。
+
+环境变量:
+  BACKTEST_PREDICTORS   逗号分隔的预测器名（默认全部）
+  BACKTEST_STEPS        回测期数上限（默认全部可用期）
+  BACKTEST_MIN_HISTORY  构建预测器所需的最少历史期数（默认50）
+  BACKTEST_WORKERS      进程数（默认CPU核数）
+  BACKTEST_USE_COS      RealMLPredictor 是否加载COS模型（默认否）
+  BACKTEST_OUTPUT       结果JSON输出路径（可选）
+
+COS中的模型是用全部历史训练的，回测早期各期时已"见过"答案（前视泄漏）。
+启用 BACKTEST_USE_COS 时 real_ml 的结果标记 leakage: true，不参与排名。
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'api'))
+
+import io
+import json
+import time
+import contextlib
+import importlib.util
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+
+PREDICTORS = ('real_ml', 'simple_ml', 'latest_results')
+
+LATEST_RESULTS_PATH = os.path.join(os.path.dirname(__file__), '..', 'api', 'latest-results.py')
+
+
+def load_history():
+    """加载历史数据（最新一期在前），统一补齐 front/back 与 front_zone/back_zone 两套字段"""
+    data = None
+    cos_configured = all([
+        os.getenv('TENCENT_SECRET_ID'),
+        os.getenv('TENCENT_SECRET_KEY'),
+        os.getenv('TENCENT_COS_BUCKET'),
+        os.getenv('TENCENT_COS_REGION')
+    ])
+    if cos_configured:
+        try:
+            from utils._cos_data_loader import get_lottery_data
+            data = get_lottery_data()
+        except Exception as e:
+            print(f"⚠️  从COS加载数据失败: {e}")
+
+    if not data:
+        from utils._lottery_data import lottery_data
+        data = lottery_data
+
+    history = []
+    for record in data:
+        front = list(record.get('front_zone') or record.get('front') or [])
+        back = list(record.get('back_zone') or record.get('back') or [])
+        history.append({
+            'period': record.get('period'),
+            'date': record.get('date', ''),
+            'front_zone': front,
+            'back_zone': back,
+            'front': front,
+            'back': back
+        })
+    return history
+
+
+def _load_latest_results_module():
+    """按文件路径导入 api/latest-results.py（文件名含连字符）"""
+    spec = importlib.util.spec_from_file_location('latest_results', LATEST_RESULTS_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class _RealMLAdapter:
+    """RealMLPredictor：进程内只构建一次，之后逐期增量刷新"""
+
+    def __init__(self, use_cos_models):
+        from utils._real_ml_predictor import RealMLPredictor
+        self.cls = RealMLPredictor
+        self.use_cos_models = use_cos_models
+        self.predictor = None
+
+    def predict(self, train):
+        if self.predictor is None:
+            self.predictor = self.cls(train, use_cos_models=self.use_cos_models)
+        else:
+            self.predictor.refresh_data(train)
+        result = self.predictor.ensemble_predict()
+        return result['front'], result['back']
+
+
+class _RunningCounts:
+    """
+    训练集的前后区号码计数
+
+    训练集每步只在最前面新增一期，此时只统计新增部分；否则全量重算。
+    新增部分的计数器放在前面相加，键顺序与对整个训练集 Counter.update 一致，
+    most_common 在并列时的顺序也与每期重建相同。
+    """
+
+    def __init__(self):
+        self.front = Counter()
+        self.back = Counter()
+        self.data = []
+
+    @staticmethod
+    def _count(records):
+        front, back = Counter(), Counter()
+        for record in records:
+            front.update(record.get('front_zone') or record.get('front') or [])
+            back.update(record.get('back_zone') or record.get('back') or [])
+        return front, back
+
+    def update(self, train):
+        new_count = len(train) - len(self.data)
+        incremental = (
+            new_count >= 0
+            and len(self.data) > 0
+            and train[new_count].get('period') == self.data[0].get('period')
+            and train[-1].get('period') == self.data[-1].get('period')
+        )
+
+        if incremental:
+            added_front, added_back = self._count(train[:new_count])
+            self.front, self.back = added_front + self.front, added_back + self.back
+        else:
+            self.front, self.back = self._count(train)
+        self.data = train
+
+
+class _SimpleMLAdapter:
+    """_ml_predictor.MLPredictor：取"综合推荐"组，冷热号取自累计计数器"""
+
+    def __init__(self):
+        from utils._ml_features import LotteryFeatureExtractor
+        from utils._ml_predictor import MLPredictor
+
+        counts = self.counts = _RunningCounts()
+
+        class CountedFeatureExtractor(LotteryFeatureExtractor):
+            """不再展开全部历史号码，频率直接取累计计数"""
+
+            def __init__(self, historical_data):
+                self.data = historical_data
+
+            def calculate_frequency(self, zone='front', top_n=10):
+                counter = counts.front if zone == 'front' else counts.back
+                return [num for num, count in counter.most_common(top_n)]
+
+            def calculate_cold_numbers(self, zone='front', bottom_n=10):
+                counter = counts.front if zone == 'front' else counts.back
+                max_num = 35 if zone == 'front' else 12
+                return sorted(range(1, max_num + 1), key=lambda x: counter.get(x, 0))[:bottom_n]
+
+        class CountedMLPredictor(MLPredictor):
+            def __init__(self, historical_data):
+                self.data = historical_data
+                self.feature_extractor = CountedFeatureExtractor(historical_data)
+                self.features = self.feature_extractor.extract_all_features()
+
+        self.cls = CountedMLPredictor
+
+    def predict(self, train):
+        self.counts.update(train)
+        predictions = self.cls(train).generate_predictions(5)
+        best = predictions[-1]
+        return best['front_zone'], best['back_zone']
+
+
+class _LatestResultsAdapter:
+    """api/latest-results.py 中的 MLPredictor，全历史频率取自累计计数器"""
+
+    def __init__(self):
+        base = _load_latest_results_module().MLPredictor
+        counts = self.counts = _RunningCounts()
+
+        class CountedMLPredictor(base):
+            def get_frequency(self, zone='front'):
+                return Counter(counts.front if zone == 'front' else counts.back)
+
+        self.cls = CountedMLPredictor
+
+    def predict(self, train):
+        self.counts.update(train)
+        result = self.cls(train).ensemble_predict()
+        return result['front'], result['back']
+
+
+def _make_adapter(name, use_cos_models):
+    if name == 'real_ml':
+        return _RealMLAdapter(use_cos_models)
+    if name == 'simple_ml':
+        return _SimpleMLAdapter()
+    if name == 'latest_results':
+        return _LatestResultsAdapter()
+    raise ValueError(f"未知预测器: {name}")
+
+
+def has_leakage(name, use_cos_models):
+    """预测器是否使用了用全部历史训练的COS模型"""
+    return name == 'real_ml' and use_cos_models
+
+
+def rank_predictors(results):
+    """按前区平均命中、回报率排名，存在前视泄漏的结果不参与"""
+    ranked = [name for name, result in results.items() if not result['summary']['leakage']]
+    return sorted(
+        ranked,
+        key=lambda n: (results[n]['summary']['avg_front_hits'], results[n]['summary']['return_rate']),
+        reverse=True
+    )
+
+
+def run_chunk(name, history, steps, use_cos_models):
+    """
+    进程池任务：按时间顺序回测一段连续的期
+
+    Args:
+        name: 预测器名
+        history: 完整历史（最新一期在前）
+        steps: 目标期下标列表
+        use_cos_models: RealMLPredictor 是否加载COS模型
+
+    Returns:
+        每期的评分记录
+    """
+    from utils._prize_scoring import prize_tier
+
+    adapter = _make_adapter(name, use_cos_models)
+    records = []
+
+    # 下标越大越早；从最早的一期开始，训练集每步只在最前面新增一期
+    for t in sorted(steps, reverse=True):
+        target = history[t]
+        train = history[t + 1:]
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            front, back = adapter.predict(train)
+
+        front_hits = len(set(front) & set(target['front_zone']))
+        back_hits = len(set(back) & set(target['back_zone']))
+        records.append({
+            'period': target['period'],
+            'front': sorted(front),
+            'back': sorted(back),
+            'front_hits': front_hits,
+            'back_hits': back_hits,
+            'prize_tier': prize_tier(min(front_hits, 5), min(back_hits, 2))
+        })
+
+    return records
+
+
+def split_steps(steps, n_chunks):
+    """将目标期按连续区间均分"""
+    n_chunks = max(1, min(n_chunks, len(steps)))
+    size = -(-len(steps) // n_chunks)
+    return [steps[i:i + size] for i in range(0, len(steps), size)]
+
+
+def summarize(records):
+    """汇总单个预测器的回测结果"""
+    from utils._prize_scoring import DEFAULT_PRIZES, TICKET_COST
+
+    n = len(records)
+    tiers = Counter(r['prize_tier'] for r in records)
+    payout = sum(DEFAULT_PRIZES[tier] * count for tier, count in tiers.items() if tier)
+
+    return {
+        'steps': n,
+        'avg_front_hits': round(sum(r['front_hits'] for r in records) / n, 4) if n else 0,
+        'avg_back_hits': round(sum(r['back_hits'] for r in records) / n, 4) if n else 0,
+        'front_hit_distribution': dict(sorted(Counter(r['front_hits'] for r in records).items())),
+        'tier_counts': {tier: tiers.get(tier, 0) for tier in range(1, 10)},
+        'win_rate': round(sum(c for t, c in tiers.items() if t) / n, 4) if n else 0,
+        'total_payout': payout,
+        'return_rate': round(payout / (n * TICKET_COST), 4) if n else 0
+    }
+
+
+def main():
+    names = [n.strip() for n in os.getenv('BACKTEST_PREDICTORS', ','.join(PREDICTORS)).split(',') if n.strip()]
+    min_history = int(os.getenv('BACKTEST_MIN_HISTORY', '50'))
+    workers = int(os.getenv('BACKTEST_WORKERS', str(os.cpu_count() or 1)))
+    output_path = os.getenv('BACKTEST_OUTPUT')
+
+    use_cos_models = os.getenv('BACKTEST_USE_COS', '').lower() in ('1', 'true', 'yes')
+
+    history = load_history()
+    steps = list(range(0, len(history) - min_history))
+    max_steps = os.getenv('BACKTEST_STEPS')
+    if max_steps:
+        steps = steps[:int(max_steps)]
+
+    print("=" * 70)
+    print("📈 逐期前推回测")
+    print("=" * 70)
+    print(f"   历史数据: {len(history)} 期")
+    print(f"   回测期数: {len(steps)}（最少历史 {min_history} 期）")
+    print(f"   预测器: {', '.join(names)}")
+    print(f"   进程数: {workers}")
+    print(f"   COS模型: {'是（real_ml 存在前视泄漏，不参与排名）' if use_cos_models else '否'}")
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for name in names:
+            start = time.perf_counter()
+            chunks = split_steps(steps, workers)
+            futures = [pool.submit(run_chunk, name, history, chunk, use_cos_models) for chunk in chunks]
+            records = [r for f in futures for r in f.result()]
+            records.sort(key=lambda r: r['period'])
+            elapsed = time.perf_counter() - start
+
+            summary = summarize(records)
+            summary['elapsed_seconds'] = round(elapsed, 2)
+            summary['leakage'] = has_leakage(name, use_cos_models)
+            results[name] = {'summary': summary, 'records': records}
+
+            print(f"\n🔍 {name}  ({elapsed:.1f}s){'  ⚠️ 前视泄漏' if summary['leakage'] else ''}")
+            print(f"   平均命中: 前区 {summary['avg_front_hits']} / 后区 {summary['avg_back_hits']}")
+            print(f"   前区命中分布: {summary['front_hit_distribution']}")
+            print(f"   中奖率: {summary['win_rate']:.2%}  回报率: {summary['return_rate']:.2%}")
+
+    ranking = rank_predictors(results)
+    print(f"\n🏆 排名（前区平均命中）: {' > '.join(ranking) if ranking else '-'}")
+
+    if output_path:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'generated_at': datetime.now().isoformat(),
+                'total_periods': len(history),
+                'min_history': min_history,
+                'use_cos_models': use_cos_models,
+                'ranking': ranking,
+                'results': results
+            }, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 结果已保存: {output_path}")
+
+
+if __name__ == '__main__':
+    main()
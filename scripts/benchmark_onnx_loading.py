@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ONNX模型加载方式基准测试：加载耗时 + 峰值内存（RSS）
+
+对比三种方式（每次在独立子进程中运行，峰值RSS互不影响）:
+  temp_file   旧方式：下载到临时文件 -> InferenceSession(路径) -> 删除
+  memory      对象内容读入内存 -> InferenceSession(bytes)
+  disk_cache  磁盘缓存已存在 -> InferenceSession(缓存路径)，由onnxruntime直接读取文件
+
+"下载"用读取本地模型文件代替，只比较加载路径本身的开销
+
+运行: python scripts/benchmark_onnx_loading.py [模型路径]
+默认使用 models/lstm_front.onnx；不存在时生成一个约 BENCH_MODEL_MB（默认20）MB 的测试模型
+环境变量 BENCH_RUNS 控制每种方式的重复次数（默认5，取中位数）
+"""
+import sys
+import os
+import json
+import time
+import shutil
+import resource
+import statistics
+import subprocess
+import tempfile
+
+
+MODES = ('temp_file', 'memory', 'disk_cache')
+
+
+def _peak_rss_mb() -> float:
+    """当前进程峰值RSS（MB）：优先读 /proc 的 VmHWM，否则用 ru_maxrss（Linux下单位为KB）"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _reset_peak_rss():
+    """重置峰值RSS（Linux 4.0+），使峰值只反映之后的加载过程"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+def run_child(mode: str, model_path: str):
+    """子进程：按指定方式加载一次模型，输出JSON结果"""
+    import onnxruntime as ort
+
+    # 排除 onnxruntime 导入本身的内存峰值
+    _reset_peak_rss()
+    baseline = _peak_rss_mb()
+    start = time.perf_counter()
+
+    if mode == 'temp_file':
+        with open(model_path, 'rb') as src:
+            data = src.read()
+        with tempfile.NamedTemporaryFile(suffix='.onnx', delete=False) as f:
+            f.write(data)
+            temp_path = f.name
+        del data
+        try:
+            session = ort.InferenceSession(temp_path, providers=['CPUExecutionProvider'])
+        finally:
+            os.unlink(temp_path)
+
+    elif mode == 'memory':
+        with open(model_path, 'rb') as src:
+            data = src.read()
+        session = ort.InferenceSession(data, providers=['CPUExecutionProvider'])
+        del data
+
+    else:
+        session = ort.InferenceSession(model_path, providers=['CPUExecutionProvider'])
+
+    load_ms = (time.perf_counter() - start) * 1000
+    assert session.get_inputs()
+
+    print(json.dumps({
+        'load_ms': load_ms,
+        'peak_rss_mb': _peak_rss_mb(),
+        'delta_rss_mb': _peak_rss_mb() - baseline
+    }))
+
+
+def build_test_model(path: str, size_mb: int):
+    """生成一个指定大小的测试模型（70维输入 -> 若干全连接层 -> 35维sigmoid输出）"""
+    import numpy as np
+    from onnx import helper, numpy_helper, TensorProto, save
+
+    hidden = 1024
+    n_layers = max(1, int(size_mb * 1024 * 1024 / (hidden * hidden * 4)))
+    rng = np.random.default_rng(0)
+
+    initializers = [numpy_helper.from_array(rng.standard_normal((70, hidden)).astype(np.float32), 'w_in')]
+    nodes = [helper.make_node('MatMul', ['x', 'w_in'], ['h0'])]
+    for i in range(n_layers):
+        initializers.append(numpy_helper.from_array(
+            rng.standard_normal((hidden, hidden)).astype(np.float32) * 0.01, f'w{i}'))
+        nodes.append(helper.make_node('MatMul', [f'h{i}', f'w{i}'], [f'm{i}']))
+        nodes.append(helper.make_node('Relu', [f'm{i}'], [f'h{i + 1}']))
+    initializers.append(numpy_helper.from_array(rng.standard_normal((hidden, 35)).astype(np.float32), 'w_out'))
+    nodes.append(helper.make_node('MatMul', [f'h{n_layers}', 'w_out'], ['logits']))
+    nodes.append(helper.make_node('Sigmoid', ['logits'], ['y']))
+
+    graph = helper.make_graph(
+        nodes, 'benchmark_model',
+        [helper.make_tensor_value_info('x', TensorProto.FLOAT, [None, 70])],
+        [helper.make_tensor_value_info('y', TensorProto.FLOAT, [None, 35])],
+        initializers
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid('', 13)])
+    model.ir_version = 8
+    save(model, path)
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        run_child(sys.argv[2], sys.argv[3])
+        return
+
+    runs = int(os.getenv('BENCH_RUNS', '5'))
+    model_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(
+        os.path.dirname(__file__), '..', 'models', 'lstm_front.onnx')
+
+    temp_dir = None
+    if not os.path.exists(model_path):
+        temp_dir = tempfile.mkdtemp()
+        model_path = os.path.join(temp_dir, 'benchmark_model.onnx')
+        print(f"⚠️  未找到模型文件，生成测试模型...")
+        build_test_model(model_path, int(os.getenv('BENCH_MODEL_MB', '20')))
+
+    print("=" * 70)
+    print("⏱️  ONNX模型加载基准测试")
+    print("=" * 70)
+    print(f"   模型: {model_path}")
+    print(f"   大小: {os.path.getsize(model_path) / 1024 / 1024:.2f} MB")
+    print(f"   重复: {runs} 次（取中位数）")
+
+    try:
+        print(f"\n{'方式':<12}{'加载耗时(ms)':>14}{'峰值RSS(MB)':>14}{'加载增量RSS(MB)':>18}")
+        for mode in MODES:
+            results = []
+            for _ in range(runs):
+                output = subprocess.run(
+                    [sys.executable, __file__, '--child', mode, model_path],
+                    capture_output=True, text=True, check=True
+                ).stdout
+                results.append(json.loads(output.strip().splitlines()[-1]))
+
+            load_ms = statistics.median(r['load_ms'] for r in results)
+            peak = statistics.median(r['peak_rss_mb'] for r in results)
+            delta = statistics.median(r['delta_rss_mb'] for r in results)
+            print(f"{mode:<12}{load_ms:>14.1f}{peak:>14.1f}{delta:>18.1f}")
+    finally:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+LSTM / Transformer 的 INT8 量化报告：fp32 vs dynamic vs static
+
+对每个模型比较:
+  文件大小
+  会话加载     创建 InferenceSession 的耗时中位数
+  批次延迟     batch = 1 / 32 / 1024 的推理耗时中位数
+  概率漂移     测试集上与 fp32 概率的最大 / 平均绝对误差，以及每个样本概率最高的5个号码的重合率
+
+运行: python scripts/benchmark_onnx_quantization.py
+models/ 下存在 <name>.onnx 时使用训练产物，否则用 verify_numpy_nets.py 生成相同结构的随机权重模型；
+静态量化使用训练集校准（data/training/training_data.pkl，不存在时使用随机数据）
+环境变量 BENCH_RUNS 控制会话加载重复次数（默认5），BENCH_INFER_RUNS 控制推理次数（默认50）
+"""
+import os
+import sys
+import time
+import pickle
+import shutil
+import statistics
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'api'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from utils._onnx_quantize import QUANT_MODES, quantize_onnx_model, reshape_for_input
+from verify_numpy_nets import MODEL_NAMES, synthesize
+
+
+MODELS_DIR = os.path.join(os.path.dirname(__file__), '..', 'models')
+BATCH_SIZES = (1, 32, 1024)
+TOP_K = 5
+
+
+def load_features():
+    """训练集（校准）与测试集（漂移）特征"""
+    path = os.path.join(os.path.dirname(__file__), '..', 'data', 'training', 'training_data.pkl')
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            data = pickle.load(f)
+        return data['X_train'], data['X_test']
+
+    print("⚠️  未找到训练数据，使用随机数据")
+    rng = np.random.default_rng(42)
+    X = rng.integers(1, 36, (1200, 70)).astype(np.float32)
+    return X[:1000], X[1000:]
+
+
+def median_ms(fn, runs: int) -> float:
+    fn()
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def new_session(path: str):
+    import onnxruntime as ort
+    return ort.InferenceSession(path, providers=['CPUExecutionProvider'])
+
+
+def top_k_overlap(a: np.ndarray, b: np.ndarray) -> float:
+    """两组概率中每个样本前K个号码的平均重合比例"""
+    top_a = np.argsort(-a, axis=1)[:, :TOP_K]
+    top_b = np.argsort(-b, axis=1)[:, :TOP_K]
+    return float(np.mean([len(set(x) & set(y)) / TOP_K for x, y in zip(top_a, top_b)]))
+
+
+def main():
+    runs = int(os.getenv('BENCH_RUNS', '5'))
+    infer_runs = int(os.getenv('BENCH_INFER_RUNS', '50'))
+    X_train, X_test = load_features()
+
+    print("=" * 70)
+    print("⏱️  ONNX INT8 量化报告")
+    print("=" * 70)
+    print(f"   校准样本: {X_train.shape[0]}，测试样本: {X_test.shape[0]}")
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        batch_header = ''.join(f"{f'b={n}(ms)':>12}" for n in BATCH_SIZES)
+        print(f"\n{'模型':<20}{'版本':<9}{'大小(KB)':>10}{'加载(ms)':>10}{batch_header}"
+              f"{'最大漂移':>10}{'平均漂移':>10}{f'Top{TOP_K}重合':>9}")
+
+        for name in MODEL_NAMES:
+            fp32_path = os.path.join(MODELS_DIR, f'{name}.onnx')
+            if not os.path.exists(fp32_path):
+                fp32_path, _ = synthesize(name, temp_dir)
+
+            variants = {'fp32': fp32_path}
+            for mode in QUANT_MODES:
+                output_path = os.path.join(temp_dir, f'{name}.{mode}.int8.onnx')
+                variants[mode] = quantize_onnx_model(fp32_path, output_path, mode, X_train)['path']
+
+            reference = None
+            for variant, path in variants.items():
+                session = new_session(path)
+                model_input = session.get_inputs()[0]
+                run = lambda x: session.run(None, {model_input.name: x})[0]
+
+                proba = run(reshape_for_input(X_test, model_input.shape))
+                if reference is None:
+                    reference = proba
+                drift = np.abs(proba - reference)
+
+                latencies = []
+                for batch_size in BATCH_SIZES:
+                    rows = np.resize(np.arange(X_test.shape[0]), batch_size)
+                    x = reshape_for_input(X_test[rows], model_input.shape)
+                    latencies.append(median_ms(lambda: run(x), infer_runs))
+
+                print(f"{name:<20}{variant:<9}{os.path.getsize(path) / 1024:>10.1f}"
+                      f"{median_ms(lambda: new_session(path), runs):>10.1f}"
+                      + ''.join(f'{ms:>12.3f}' for ms in latencies)
+                      + f"{drift.max():>10.4f}{drift.mean():>10.4f}{top_k_overlap(proba, reference):>9.2f}")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
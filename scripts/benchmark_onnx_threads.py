@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ONNX会话配置基准测试：intra-op 线程数 × 图优化级别 对 LSTM / Transformer 推理延迟的影响
+
+每个模型、每种配置：创建会话（记录会话创建耗时）-> 预热 -> 重复推理取中位数/P95
+另外对比"首次加载并保存优化图"与"加载已优化文件"的会话创建耗时
+
+运行: python scripts/benchmark_onnx_threads.py
+默认使用 models/lstm_front.onnx 与 models/transformer_front.onnx；不存在时生成结构相近的测试模型
+环境变量:
+  BENCH_THREADS     逗号分隔的 intra-op 线程数（默认 1,2,4 及CPU核数）
+  BENCH_OPT_LEVELS  逗号分隔的图优化级别（默认 disabled,basic,all）
+  BENCH_RUNS        每种配置的推理次数（默认200）
+  BENCH_BATCH       每次推理的批大小（默认1，即单次请求）
+"""
+import os
+import sys
+import time
+import shutil
+import statistics
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'api'))
+
+from utils._onnx_session import build_session_options, create_session, optimized_model_path
+
+
+MODELS_DIR = os.path.join(os.path.dirname(__file__), '..', 'models')
+
+
+def build_lstm_model(path: str, hidden: int = 128):
+    """生成LSTM测试模型：(batch, 10, 7) -> LSTM -> Dense(35) -> sigmoid"""
+    from onnx import helper, numpy_helper, TensorProto, save
+
+    rng = np.random.default_rng(0)
+    initializers = [
+        numpy_helper.from_array((rng.standard_normal((1, 4 * hidden, 7)) * 0.1).astype(np.float32), 'W'),
+        numpy_helper.from_array((rng.standard_normal((1, 4 * hidden, hidden)) * 0.1).astype(np.float32), 'R'),
+        numpy_helper.from_array(np.zeros((1, 8 * hidden), dtype=np.float32), 'B'),
+        numpy_helper.from_array((rng.standard_normal((hidden, 35)) * 0.1).astype(np.float32), 'w_out'),
+        numpy_helper.from_array(np.zeros(35, dtype=np.float32), 'b_out'),
+        numpy_helper.from_array(np.array([0], dtype=np.int64), 'axis0')
+    ]
+    nodes = [
+        # Keras 导出为 batch-first，ONNX LSTM 默认 time-first
+        helper.make_node('Transpose', ['x'], ['x_t'], perm=[1, 0, 2]),
+        helper.make_node('LSTM', ['x_t', 'W', 'R', 'B'], ['', 'h_n'], hidden_size=hidden),
+        helper.make_node('Squeeze', ['h_n', 'axis0'], ['h']),
+        helper.make_node('MatMul', ['h', 'w_out'], ['m']),
+        helper.make_node('Add', ['m', 'b_out'], ['logits']),
+        helper.make_node('Sigmoid', ['logits'], ['y'])
+    ]
+    graph = helper.make_graph(
+        nodes, 'lstm_benchmark',
+        [helper.make_tensor_value_info('x', TensorProto.FLOAT, [None, 10, 7])],
+        [helper.make_tensor_value_info('y', TensorProto.FLOAT, [None, 35])],
+        initializers
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid('', 13)])
+    model.ir_version = 8
+    save(model, path)
+
+
+def build_transformer_model(path: str, d_model: int = 64, tokens: int = 10):
+    """生成Transformer测试模型：(batch, 70) -> 10个token × d_model -> 自注意力 + FFN -> Dense(35) -> sigmoid"""
+    from onnx import helper, numpy_helper, TensorProto, save
+
+    rng = np.random.default_rng(0)
+
+    def weight(name, shape):
+        return numpy_helper.from_array((rng.standard_normal(shape) * 0.1).astype(np.float32), name)
+
+    initializers = [
+        weight('w_embed', (7, d_model)),
+        weight('w_q', (d_model, d_model)), weight('w_k', (d_model, d_model)), weight('w_v', (d_model, d_model)),
+        weight('w_ff1', (d_model, 4 * d_model)), weight('w_ff2', (4 * d_model, d_model)),
+        weight('w_out', (tokens * d_model, 35)),
+        numpy_helper.from_array(np.zeros(4 * d_model, dtype=np.float32), 'b_ff1'),
+        numpy_helper.from_array(np.array([1.0 / np.sqrt(d_model)], dtype=np.float32), 'scale'),
+        numpy_helper.from_array(np.array([-1, tokens, 7], dtype=np.int64), 'shape_tokens'),
+        numpy_helper.from_array(np.array([-1, tokens * d_model], dtype=np.int64), 'shape_flat')
+    ]
+    nodes = [
+        helper.make_node('Reshape', ['x', 'shape_tokens'], ['tok']),
+        helper.make_node('MatMul', ['tok', 'w_embed'], ['e']),
+        helper.make_node('MatMul', ['e', 'w_q'], ['q']),
+        helper.make_node('MatMul', ['e', 'w_k'], ['k']),
+        helper.make_node('MatMul', ['e', 'w_v'], ['v']),
+        helper.make_node('Transpose', ['k'], ['k_t'], perm=[0, 2, 1]),
+        helper.make_node('MatMul', ['q', 'k_t'], ['scores_raw']),
+        helper.make_node('Mul', ['scores_raw', 'scale'], ['scores']),
+        helper.make_node('Softmax', ['scores'], ['attn'], axis=-1),
+        helper.make_node('MatMul', ['attn', 'v'], ['ctx']),
+        helper.make_node('Add', ['e', 'ctx'], ['res1']),
+        helper.make_node('MatMul', ['res1', 'w_ff1'], ['ff1_raw']),
+        helper.make_node('Add', ['ff1_raw', 'b_ff1'], ['ff1_bias']),
+        helper.make_node('Relu', ['ff1_bias'], ['ff1']),
+        helper.make_node('MatMul', ['ff1', 'w_ff2'], ['ff2']),
+        helper.make_node('Add', ['res1', 'ff2'], ['res2']),
+        helper.make_node('Reshape', ['res2', 'shape_flat'], ['flat']),
+        helper.make_node('MatMul', ['flat', 'w_out'], ['logits']),
+        helper.make_node('Sigmoid', ['logits'], ['y'])
+    ]
+    graph = helper.make_graph(
+        nodes, 'transformer_benchmark',
+        [helper.make_tensor_value_info('x', TensorProto.FLOAT, [None, 70])],
+        [helper.make_tensor_value_info('y', TensorProto.FLOAT, [None, 35])],
+        initializers
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid('', 13)])
+    model.ir_version = 8
+    save(model, path)
+
+
+def resolve_model(name: str, builder, temp_dir: str) -> str:
+    """优先使用 models/ 下的真实模型，否则生成测试模型"""
+    path = os.path.join(MODELS_DIR, f'{name}.onnx')
+    if os.path.exists(path):
+        return path
+
+    path = os.path.join(temp_dir, f'{name}.onnx')
+    print(f"⚠️  未找到 {name}.onnx，生成测试模型")
+    builder(path)
+    return path
+
+
+def make_input(session, batch: int) -> np.ndarray:
+    """按模型输入维度生成随机输入（与 _onnx_proba 相同：3维为序列，2维为展平特征）"""
+    rank = len(session.get_inputs()[0].shape)
+    shape = (batch, 10, 7) if rank == 3 else (batch, 70)
+    return np.random.default_rng(1).random(shape, dtype=np.float32)
+
+
+def bench_inference(session, batch: int, runs: int) -> dict:
+    """预热后重复推理，返回延迟中位数与P95（毫秒）"""
+    input_name = session.get_inputs()[0].name
+    x = make_input(session, batch)
+
+    for _ in range(10):
+        session.run(None, {input_name: x})
+
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        session.run(None, {input_name: x})
+        timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+    return {
+        'median_ms': statistics.median(timings),
+        'p95_ms': timings[int(len(timings) * 0.95) - 1]
+    }
+
+
+def base_profile(threads: int, opt_level: str) -> dict:
+    return {
+        'intra_op_threads': threads,
+        'inter_op_threads': 1,
+        'graph_optimization_level': opt_level,
+        'execution_mode': 'sequential',
+        'enable_mem_arena': True,
+        'enable_mem_pattern': True
+    }
+
+
+def sweep(model_path: str, threads_list, opt_levels, batch: int, runs: int):
+    """线程数 × 图优化级别 扫描"""
+    import onnxruntime as ort
+
+    print(f"\n{'线程':>6}{'优化级别':>12}{'建会话(ms)':>14}{'中位数(ms)':>14}{'P95(ms)':>12}")
+    best = None
+    for opt_level in opt_levels:
+        for threads in threads_list:
+            profile = base_profile(threads, opt_level)
+            start = time.perf_counter()
+            session = ort.InferenceSession(model_path, build_session_options(profile),
+                                           providers=['CPUExecutionProvider'])
+            create_ms = (time.perf_counter() - start) * 1000
+
+            result = bench_inference(session, batch, runs)
+            print(f"{threads:>6}{opt_level:>12}{create_ms:>14.1f}"
+                  f"{result['median_ms']:>14.3f}{result['p95_ms']:>12.3f}")
+
+            if best is None or result['median_ms'] < best[2]:
+                best = (threads, opt_level, result['median_ms'])
+
+    print(f"🏆 最快配置: ONNX_INTRA_OP_THREADS={best[0]} ONNX_GRAPH_OPT_LEVEL={best[1]}"
+          f"（中位数 {best[2]:.3f} ms）")
+
+
+def bench_optimized_cache(model_path: str, name: str, temp_dir: str):
+    """对比首次加载（优化并保存）与加载已优化文件的会话创建耗时"""
+    profile = base_profile(1, 'all')
+    cache_dir = os.path.join(temp_dir, 'cache')
+    optimized_path = optimized_model_path(cache_dir, name, 'bench', profile)
+
+    start = time.perf_counter()
+    _, state_first = create_session(model_path, optimized_path, profile)
+    first_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    _, state_again = create_session(model_path, optimized_path, profile)
+    again_ms = (time.perf_counter() - start) * 1000
+
+    print(f"   首次加载（{state_first}）: {first_ms:.1f} ms，"
+          f"加载已优化文件（{state_again}）: {again_ms:.1f} ms")
+
+
+def main():
+    cpu_count = os.cpu_count() or 1
+    default_threads = sorted({1, 2, 4, cpu_count})
+    threads_list = [int(t) for t in os.getenv('BENCH_THREADS', ','.join(map(str, default_threads))).split(',')]
+    opt_levels = os.getenv('BENCH_OPT_LEVELS', 'disabled,basic,all').split(',')
+    runs = int(os.getenv('BENCH_RUNS', '200'))
+    batch = int(os.getenv('BENCH_BATCH', '1'))
+
+    print("=" * 70)
+    print("⏱️  ONNX会话配置基准测试")
+    print("=" * 70)
+    print(f"   CPU核数: {cpu_count}")
+    print(f"   批大小: {batch}，每种配置推理 {runs} 次")
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        for name, builder in (('lstm_front', build_lstm_model),
+                              ('transformer_front', build_transformer_model)):
+            model_path = resolve_model(name, builder, temp_dir)
+            print(f"\n📊 {name}: {model_path}")
+            sweep(model_path, threads_list, opt_levels, batch, runs)
+            bench_optimized_cache(model_path, name, temp_dir)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+加权无放回抽样基准测试
+对比原有逐个抽取（每次重新归一化 + list.remove）与 Gumbel top-k 向量化抽样
+在 1 / 1千 / 1百万 组号码下的耗时
+
+运行: python scripts/benchmark_sampling.py
+环境变量 BENCH_LEGACY_MAX 控制旧实现实际运行的最大组数（超过则按单组耗时估算）
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'api'))
+
+import random
+import time
+
+from utils._sampling import weighted_sample, weighted_sample_batch
+
+
+def legacy_weighted_choice(numbers, weights, k):
+    """原 MLPredictor.weighted_random_choice 实现"""
+    total_weight = sum(weights)
+    probabilities = [w / total_weight for w in weights]
+    selected = []
+    available_indices = list(range(len(numbers)))
+    for _ in range(k):
+        if not available_indices:
+            break
+        current_probs = [probabilities[i] for i in available_indices]
+        current_total = sum(current_probs)
+        current_probs = [p / current_total for p in current_probs]
+        chosen_idx = random.choices(available_indices, weights=current_probs, k=1)[0]
+        selected.append(numbers[chosen_idx])
+        available_indices.remove(chosen_idx)
+    return sorted(selected)
+
+
+def timed(func, *args, **kwargs):
+    """运行函数并返回 (结果, 耗时秒)"""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    legacy_max = int(os.getenv('BENCH_LEGACY_MAX', '10000'))
+
+    numbers = list(range(1, 36))
+    weights = [10 + (n % 7) * 2 for n in numbers]
+
+    # 预热（numpy 首次调用的初始化开销不计入）
+    weighted_sample_batch(numbers, weights, 5, 16, seed=0)
+
+    print("=" * 70)
+    print("⏱️  加权无放回抽样基准（前区 35选5）")
+    print("=" * 70)
+    print(f"{'组数':>10} | {'旧实现':>14} | {'weighted_sample循环':>20} | {'Gumbel批量':>12} | {'加速比':>8}")
+    print("-" * 70)
+
+    for n_tickets in (1, 1000, 1000000):
+        # 旧实现：逐组、逐号码抽取
+        legacy_runs = min(n_tickets, legacy_max)
+        _, legacy_time = timed(lambda: [legacy_weighted_choice(numbers, weights, 5) for _ in range(legacy_runs)])
+        legacy_note = ''
+        if legacy_runs < n_tickets:
+            legacy_time = legacy_time / legacy_runs * n_tickets
+            legacy_note = '*'
+
+        # 共享抽样器：逐组调用
+        loop_runs = min(n_tickets, legacy_max)
+        _, loop_time = timed(lambda: [weighted_sample(numbers, weights, 5) for _ in range(loop_runs)])
+        loop_note = ''
+        if loop_runs < n_tickets:
+            loop_time = loop_time / loop_runs * n_tickets
+            loop_note = '*'
+
+        # 共享抽样器：一次性批量
+        tickets, batch_time = timed(weighted_sample_batch, numbers, weights, 5, n_tickets, seed=42)
+        assert tickets.shape == (n_tickets, 5)
+
+        speedup = legacy_time / batch_time if batch_time > 0 else float('inf')
+        print(f"{n_tickets:>10} | {legacy_time * 1000:>12.2f}ms{legacy_note:1} | "
+              f"{loop_time * 1000:>18.2f}ms{loop_note:1} | {batch_time * 1000:>10.2f}ms | {speedup:>7.1f}x")
+
+    print("-" * 70)
+    print(f"* 超过 {legacy_max} 组时按实测单组耗时线性估算")
+
+
+if __name__ == '__main__':
+    main()
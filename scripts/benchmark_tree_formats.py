@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+树模型服务格式对比：pickle（sklearn/xgboost对象） vs 服务格式（*.xgb.npz / *.rf.npz）
+
+对每个模型比较:
+  文件大小
+  冷加载耗时   独立子进程中 导入依赖 + 反序列化 的总耗时（对应Serverless冷启动）
+  推理耗时     单个样本 (1, 70) 的预测延迟中位数
+  概率差异     两种格式类别1概率的最大绝对误差
+
+运行: python scripts/benchmark_tree_formats.py
+默认使用 models/ 下的 xgboost_front / random_forest_front .pkl；
+不存在时按 train_models.py 的超参数在训练数据（或随机数据）上训练
+环境变量 BENCH_RUNS 控制冷加载重复次数（默认3），BENCH_INFER_RUNS 控制推理次数（默认200）
+"""
+import os
+import sys
+import json
+import time
+import pickle
+import shutil
+import statistics
+import subprocess
+import tempfile
+
+import numpy as np
+
+API_DIR = os.path.join(os.path.dirname(__file__), '..', 'api')
+sys.path.insert(0, API_DIR)
+
+from utils._tree_serving import export_serving_model, load_serving_model
+
+
+MODELS_DIR = os.path.join(os.path.dirname(__file__), '..', 'models')
+MODEL_NAMES = ('xgboost_front', 'random_forest_front')
+
+
+def run_child(fmt: str, path: str):
+    """子进程：导入依赖并加载一次模型，输出耗时"""
+    start = time.perf_counter()
+    if fmt == 'pickle':
+        with open(path, 'rb') as f:
+            pickle.load(f)
+    else:
+        sys.path.insert(0, API_DIR)
+        from utils._tree_serving import load_serving_model
+        load_serving_model(path)
+    print(json.dumps({'load_ms': (time.perf_counter() - start) * 1000}))
+
+
+def load_training_matrix():
+    """训练数据：优先使用 data/training/training_data.pkl，否则生成随机数据"""
+    path = os.path.join(os.path.dirname(__file__), '..', 'data', 'training', 'training_data.pkl')
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            data = pickle.load(f)
+        return data['X_train'], data['y_front_train']
+
+    print("⚠️  未找到训练数据，使用随机数据")
+    rng = np.random.default_rng(42)
+    X = rng.integers(1, 36, (500, 70)).astype(np.float64)
+    y = (rng.random((500, 35)) < 5 / 35).astype(int)
+    return X, y
+
+
+def train_models(temp_dir: str) -> dict:
+    """按 train_models.py 的超参数训练前区模型并保存为 pickle"""
+    import xgboost as xgb
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.multioutput import MultiOutputClassifier
+
+    X, y = load_training_matrix()
+
+    print("🎯 训练 RandomForest...")
+    rf = MultiOutputClassifier(RandomForestClassifier(n_estimators=100, max_depth=10, random_state=42, n_jobs=-1))
+    rf.fit(X, y)
+
+    print("🎯 训练 XGBoost...")
+    xgb_models = [
+        xgb.XGBClassifier(n_estimators=50, max_depth=5, learning_rate=0.1, random_state=42,
+                          tree_method='hist', eval_metric='logloss').fit(X, y[:, i])
+        for i in range(y.shape[1])
+    ]
+
+    paths = {}
+    for name, model in (('xgboost_front', xgb_models), ('random_forest_front', rf)):
+        paths[name] = os.path.join(temp_dir, f'{name}.pkl')
+        with open(paths[name], 'wb') as f:
+            pickle.dump(model, f)
+    return paths
+
+
+def pickle_proba(model, X: np.ndarray) -> np.ndarray:
+    """与 RealMLPredictor._sklearn_proba 相同的方式从 pickle 模型取类别1概率"""
+    if isinstance(model, (list, tuple)):
+        columns = [m.predict_proba(X) for m in model]
+        estimators = model
+    else:
+        columns = model.predict_proba(X)
+        if isinstance(columns, np.ndarray):
+            # 多输出XGBoost：已是 (n_samples, n_outputs) 的类别1概率
+            return columns
+        estimators = model.estimators_
+
+    result = []
+    for proba, est in zip(columns, estimators):
+        classes = list(est.classes_)
+        result.append(proba[:, classes.index(1)] if 1 in classes else np.zeros(X.shape[0]))
+    return np.array(result).T
+
+
+def cold_load_ms(fmt: str, path: str, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, __file__, '--child', fmt, path],
+            capture_output=True, text=True, check=True
+        ).stdout
+        timings.append(json.loads(output.strip().splitlines()[-1])['load_ms'])
+    return statistics.median(timings)
+
+
+def infer_ms(predict, X: np.ndarray, runs: int) -> float:
+    for _ in range(5):
+        predict(X)
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        predict(X)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        run_child(sys.argv[2], sys.argv[3])
+        return
+
+    runs = int(os.getenv('BENCH_RUNS', '3'))
+    infer_runs = int(os.getenv('BENCH_INFER_RUNS', '200'))
+
+    print("=" * 70)
+    print("⏱️  树模型服务格式对比")
+    print("=" * 70)
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        paths = {name: os.path.join(MODELS_DIR, f'{name}.pkl') for name in MODEL_NAMES}
+        if not all(os.path.exists(p) for p in paths.values()):
+            print("⚠️  未找到 models/ 下的模型，重新训练测试模型")
+            paths = train_models(temp_dir)
+
+        X_eval = np.random.default_rng(0).integers(1, 36, (200, 70)).astype(np.float64)
+        X_one = X_eval[:1]
+
+        print(f"\n{'模型':<22}{'格式':<10}{'大小(KB)':>10}{'冷加载(ms)':>12}{'推理(ms)':>10}{'最大误差':>12}")
+        for name in MODEL_NAMES:
+            with open(paths[name], 'rb') as f:
+                model = pickle.load(f)
+            serving_path = export_serving_model(model, os.path.join(temp_dir, name))['path']
+            evaluator = load_serving_model(serving_path)
+
+            reference = pickle_proba(model, X_eval)
+            diff = float(np.abs(evaluator.predict_proba(X_eval) - reference).max())
+
+            rows = (
+                ('pickle', paths[name], lambda X: pickle_proba(model, X), 0.0),
+                ('serving', serving_path, evaluator.predict_proba, diff)
+            )
+            for fmt, path, predict, error in rows:
+                print(f"{name:<22}{fmt:<10}{os.path.getsize(path) / 1024:>10.1f}"
+                      f"{cold_load_ms(fmt, path, runs):>12.1f}{infer_ms(predict, X_one, infer_runs):>10.3f}"
+                      f"{error:>12.2e}")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
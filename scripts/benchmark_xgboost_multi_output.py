@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+XGBoost 训练方式对比：每个号码一个分类器（当前） vs 单个多输出模型
+
+  per_column           35 个 XGBClassifier 串行训练，推理需要 35 次 predict_proba
+  one_output_per_tree  单个 Booster，每个号码各自的树（XGB_MULTI_STRATEGY=one_output_per_tree）
+  multi_output_tree    单个 Booster，向量叶子的树（XGB_MULTI_STRATEGY=multi_output_tree）
+
+对比: 训练耗时、pickle大小、服务格式（*.xgb.npz）大小、单次请求推理延迟、测试集 Hamming Loss / LogLoss
+
+运行: python scripts/benchmark_xgboost_multi_output.py
+训练数据优先使用 data/training/training_data.pkl，否则生成随机数据
+环境变量 BENCH_INFER_RUNS 控制推理次数（默认200）
+"""
+import os
+import sys
+import time
+import pickle
+import shutil
+import statistics
+import tempfile
+
+import numpy as np
+import xgboost as xgb
+from sklearn.metrics import hamming_loss, log_loss
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'api'))
+
+from utils._tree_serving import export_xgboost, load_serving_model
+
+
+MODES = ('per_column', 'one_output_per_tree', 'multi_output_tree')
+
+# 与 train_models.train_xgboost 相同的超参数
+XGB_PARAMS = dict(n_estimators=50, max_depth=5, learning_rate=0.1, random_state=42,
+                  tree_method='hist', eval_metric='logloss')
+
+
+def load_data():
+    """前区训练/测试数据"""
+    path = os.path.join(os.path.dirname(__file__), '..', 'data', 'training', 'training_data.pkl')
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            data = pickle.load(f)
+        return data['X_train'], data['y_front_train'], data['X_test'], data['y_front_test']
+
+    print("⚠️  未找到训练数据，使用随机数据")
+    rng = np.random.default_rng(42)
+    X = rng.integers(1, 36, (600, 70)).astype(np.float64)
+    y = (rng.random((600, 35)) < 5 / 35).astype(int)
+    return X[:500], y[:500], X[500:], y[500:]
+
+
+def train(mode: str, X, y):
+    if mode == 'per_column':
+        return [xgb.XGBClassifier(**XGB_PARAMS).fit(X, y[:, i]) for i in range(y.shape[1])]
+    return xgb.XGBClassifier(multi_strategy=mode, **XGB_PARAMS).fit(X, y)
+
+
+def predict_proba(model, X) -> np.ndarray:
+    """与 RealMLPredictor._sklearn_proba 相同的调用方式"""
+    if isinstance(model, list):
+        return np.array([m.predict_proba(X)[:, 1] for m in model]).T
+    return model.predict_proba(X)
+
+
+def median_ms(fn, runs: int) -> float:
+    for _ in range(5):
+        fn()
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    infer_runs = int(os.getenv('BENCH_INFER_RUNS', '200'))
+    X_train, y_train, X_test, y_test = load_data()
+    X_one = X_test[:1]
+
+    print("=" * 70)
+    print("⏱️  XGBoost 多输出训练对比")
+    print("=" * 70)
+    print(f"   训练集: {X_train.shape}，输出: {y_train.shape[1]}")
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        print(f"\n{'方式':<22}{'训练(s)':>9}{'pkl(KB)':>10}{'npz(KB)':>10}"
+              f"{'推理pkl(ms)':>13}{'推理npz(ms)':>13}{'Hamming':>9}{'LogLoss':>9}")
+        for mode in MODES:
+            start = time.perf_counter()
+            model = train(mode, X_train, y_train)
+            train_s = time.perf_counter() - start
+
+            pkl_path = os.path.join(temp_dir, f'{mode}.pkl')
+            with open(pkl_path, 'wb') as f:
+                pickle.dump(model, f)
+            npz_path = export_xgboost(model, os.path.join(temp_dir, f'{mode}.xgb.npz'))['path']
+            evaluator = load_serving_model(npz_path)
+
+            proba = predict_proba(model, X_test)
+            assert np.allclose(evaluator.predict_proba(X_test), proba)
+            hamming = hamming_loss(y_test, (proba >= 0.5).astype(int))
+            logloss = np.mean([log_loss(y_test[:, i], proba[:, i], labels=[0, 1]) for i in range(y_test.shape[1])])
+
+            print(f"{mode:<22}{train_s:>9.2f}"
+                  f"{os.path.getsize(pkl_path) / 1024:>10.1f}{os.path.getsize(npz_path) / 1024:>10.1f}"
+                  f"{median_ms(lambda: predict_proba(model, X_one), infer_runs):>13.3f}"
+                  f"{median_ms(lambda: evaluator.predict_proba(X_one), infer_runs):>13.3f}"
+                  f"{hamming:>9.4f}{logloss:>9.4f}")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
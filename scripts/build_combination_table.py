@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+生成前区全组合表（C(35,5) = 324,632 注）并演示向量化过滤耗时
+
+运行: python scripts/build_combination_table.py [输出路径]
+默认输出到 COMBINATION_TABLE_PATH 或系统临时目录
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'api'))
+
+import time
+
+from utils._combination_table import (
+    save_combination_table, load_combination_table, filter_mask, sample_matching, get_table_path
+)
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else get_table_path()
+
+    print("=" * 70)
+    print("🧮 生成前区全组合表")
+    print("=" * 70)
+
+    start = time.perf_counter()
+    save_combination_table(path)
+    build_time = time.perf_counter() - start
+    print(f"✅ 已保存: {path}")
+    print(f"   文件大小: {os.path.getsize(path) / 1024 / 1024:.2f} MB")
+    print(f"   生成耗时: {build_time * 1000:.0f} ms")
+
+    start = time.perf_counter()
+    table = load_combination_table(path)
+    print(f"   加载耗时(内存映射): {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    # 示例：和值80-120、奇数2-3个、跨度>=20、无三连号
+    filters = dict(sum_range=(80, 120), odd_counts=[2, 3], span_range=(20, None), max_run=2)
+
+    start = time.perf_counter()
+    matched = int(filter_mask(table, **filters).sum())
+    filter_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    sample = sample_matching(5, seed=42, table=table, **filters)
+    sample_time = time.perf_counter() - start
+
+    print("\n📊 示例过滤: 和值80-120 / 奇数2-3 / 跨度>=20 / 无三连号")
+    print(f"   匹配组合: {matched} / {len(table)}")
+    print(f"   过滤耗时: {filter_time * 1000:.2f} ms")
+    print(f"   抽样耗时: {sample_time * 1000:.2f} ms")
+    for row in sample:
+        print(f"   {row.tolist()}")
+
+
+if __name__ == '__main__':
+    main()
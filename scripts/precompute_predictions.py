@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+预计算下一期预测并发布到腾讯云COS
+在数据采集（upload_latest_to_cos.py）之后运行：
+1. 一次性加载全部模型
+2. 计算融合预测和各模型预测
+3. 上传紧凑的 predictions/<period>.json，供 /api/predict 直接读取
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'api'))
+
+import json
+from datetime import datetime
+
+
+def load_history():
+    """加载历史数据：优先COS，否则使用本地数据"""
+    try:
+        from utils._cos_data_loader import get_lottery_data
+        data = get_lottery_data(force_refresh=True)
+        if data:
+            return data, 'tencent_cos'
+    except Exception as e:
+        print(f"⚠️  从COS加载数据失败: {e}")
+
+    from utils._lottery_data import lottery_data
+    return lottery_data, 'local_backup'
+
+
+def main():
+    """主函数"""
+    print("=" * 70)
+    print("🔮 预计算下期预测")
+    print(f"⏰ 执行时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("=" * 70)
+
+    cos_configured = all([
+        os.getenv('TENCENT_SECRET_ID'),
+        os.getenv('TENCENT_SECRET_KEY'),
+        os.getenv('TENCENT_COS_BUCKET'),
+        os.getenv('TENCENT_COS_REGION')
+    ])
+
+    if not cos_configured:
+        print("❌ 腾讯云COS未配置，无法发布预测")
+        sys.exit(1)
+
+    from utils._real_ml_predictor import RealMLPredictor
+    from utils._prediction_artifact import build_prediction_artifact, get_artifact_cos_path
+    from utils.tencent_cos import get_cos_client
+
+    historical_data, data_source = load_history()
+    print(f"\n📚 历史数据: {len(historical_data)} 期 ({data_source})")
+
+    if len(historical_data) < 10:
+        print(f"❌ 历史数据不足: {len(historical_data)}期")
+        sys.exit(1)
+
+    # 模型只加载一次
+    print("\n📦 加载模型...")
+    predictor = RealMLPredictor(historical_data, use_cos_models=True)
+
+    print("\n🎯 计算预测...")
+    artifact = build_prediction_artifact(predictor, historical_data, data_source)
+    period = artifact['target_period']
+
+    if not period:
+        print("❌ 无法推算目标期号")
+        sys.exit(1)
+
+    ensemble = artifact['prediction']['ensemble_prediction']
+    print(f"   目标期号: {period}")
+    print(f"   前区: {ensemble['front_zone']}")
+    print(f"   后区: {ensemble['back_zone']}")
+    print(f"   COS模型: {ensemble['cos_models_used']}/{ensemble['models_used']}")
+
+    cos_path = get_artifact_cos_path(period)
+    print(f"\n📤 发布预测: {cos_path} ({len(json.dumps(artifact, ensure_ascii=False, separators=(',', ':')))} 字节)")
+
+    client = get_cos_client()
+    result = client.upload_json(artifact, cos_path, compact=True)
+
+    if result['success']:
+        print("\n" + "=" * 70)
+        print(f"✅ 第 {period} 期预测已发布")
+        print("=" * 70)
+        sys.exit(0)
+    else:
+        print("\n" + "=" * 70)
+        print(f"❌ 发布失败: {result.get('error')}")
+        print("=" * 70)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -143,8 +143,59 @@ def train_random_forest(X_train, y_train, X_test, y_test, zone='front'):
     }
 
 
+def train_xgboost_multi_output(X_train, y_train, X_test, y_test, zone='front', strategy='multi_output_tree'):
+    """
+    训练单个多输出XGBoost模型（多标签），一次 predict_proba 得到全部号码的概率
+
+    strategy:
+      one_output_per_tree  每个号码各自的树，但在同一个Booster中一起训练和推理
+      multi_output_tree    向量叶子的树，所有号码共享树结构
+    """
+    print(f"\n{'='*60}")
+    print(f"训练XGBoost多输出模型 - {zone}区（{strategy}）")
+    print(f"{'='*60}")
+
+    model = xgb.XGBClassifier(
+        n_estimators=50,
+        max_depth=5,
+        learning_rate=0.1,
+        random_state=42,
+        tree_method='hist',
+        multi_strategy=strategy,
+        eval_metric='logloss'
+    )
+
+    print(f"🎯 开始训练 {y_train.shape[1]} 个输出...")
+    model.fit(X_train, y_train)
+
+    train_loss = hamming_loss(y_train, model.predict(X_train))
+    test_loss = hamming_loss(y_test, model.predict(X_test))
+
+    print(f"✅ 训练完成")
+    print(f"   训练集 Hamming Loss: {train_loss:.4f}")
+    print(f"   测试集 Hamming Loss: {test_loss:.4f}")
+
+    return model, {
+        'train_loss': float(train_loss),
+        'test_loss': float(test_loss),
+        'model_type': 'XGBoost',
+        'zone': zone,
+        'n_models': 1,
+        'multi_strategy': strategy
+    }
+
+
 def train_xgboost(X_train, y_train, X_test, y_test, zone='front'):
-    """训练XGBoost模型"""
+    """
+    训练XGBoost模型
+
+    默认每个号码训练一个 XGBClassifier；设置环境变量 XGB_MULTI_STRATEGY
+    （one_output_per_tree / multi_output_tree）时改为训练单个多输出模型
+    """
+    strategy = os.getenv('XGB_MULTI_STRATEGY', '')
+    if strategy:
+        return train_xgboost_multi_output(X_train, y_train, X_test, y_test, zone, strategy)
+
     print(f"\n{'='*60}")
     print(f"训练XGBoost模型 - {zone}区")
     print(f"{'='*60}")
@@ -362,10 +413,23 @@ def convert_keras_to_onnx(model, model_name, input_shape, output_dir):
             shutil.rmtree(temp_dir, ignore_errors=True)
 
 
-def save_models(models, output_dir='models'):
-    """保存所有模型"""
+def save_models(models, output_dir='models', calibration_data=None):
+    """
+    保存所有模型
+
+    环境变量 ONNX_QUANTIZE=dynamic/static 时额外导出 INT8 量化的 ONNX 模型（*.int8.onnx），
+    静态量化使用 calibration_data（训练集特征）校准
+    """
     os.makedirs(output_dir, exist_ok=True)
 
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'api'))
+    from utils._model_bundle import build_bundle
+    from utils._tree_serving import export_serving_model
+    from utils._numpy_nets import NN_SUFFIX, export_keras_lstm, export_keras_transformer
+    from utils._onnx_quantize import INT8_SUFFIX, quantize_onnx_model
+
+    quantize_mode = os.getenv('ONNX_QUANTIZE', '').lower()
+
     saved_info = {'models': {}}
 
     # 先保存所有 sklearn/xgboost 模型（这些不会失败）
@@ -383,6 +447,17 @@ def save_models(models, output_dir='models'):
             }
             print(f"💾 已保存: {model_name}")
 
+            # 同时导出不依赖 pickle/sklearn 的服务格式（XGBoost原生Booster / 展平的随机森林）
+            try:
+                serving = export_serving_model(model, f'{output_dir}/{model_name}')
+                saved_info['models'][model_name]['serving'] = {
+                    'kind': serving['kind'],
+                    'path': serving['path']
+                }
+                print(f"💾 已导出服务格式: {serving['path']}")
+            except Exception as e:
+                print(f"⚠️  导出 {model_name} 服务格式失败: {e}")
+
     # 然后保存 Keras 模型（可能需要转换为 ONNX）
     print("\n📦 保存 Keras 模型...")
     for model_name, (model, metadata) in models.items():
@@ -416,6 +491,34 @@ def save_models(models, output_dir='models'):
             except Exception as e:
                 print(f"❌ 保存 {model_name} 失败: {e}")
 
+        # 同时导出纯 NumPy 权重（*.nn.npz），服务端未安装 onnxruntime 时使用
+        if model_name in saved_info['models'] and saved_info['models'][model_name]['type'] != 'sklearn':
+            export = export_keras_lstm if 'lstm' in model_name.lower() else export_keras_transformer
+            try:
+                serving = export(model, f'{output_dir}/{model_name}{NN_SUFFIX}')
+                saved_info['models'][model_name]['serving'] = {
+                    'kind': serving['kind'],
+                    'path': serving['path']
+                }
+                print(f"💾 已导出NumPy权重: {serving['path']}")
+            except Exception as e:
+                print(f"⚠️  导出 {model_name} NumPy权重失败: {e}")
+
+        # 可选：INT8 量化的 ONNX 模型（ONNX_MODEL_VARIANT=int8 时加载）
+        if quantize_mode and saved_info['models'].get(model_name, {}).get('format') == 'onnx':
+            try:
+                quantized = quantize_onnx_model(
+                    saved_info['models'][model_name]['path'],
+                    f'{output_dir}/{model_name}{INT8_SUFFIX}',
+                    quantize_mode,
+                    calibration_data
+                )
+                saved_info['models'][model_name]['quantized'] = quantized
+                print(f"💾 已导出INT8模型（{quantize_mode}）: {quantized['path']} "
+                      f"({quantized['fp32_size'] / 1024:.0f}KB -> {quantized['size'] / 1024:.0f}KB)")
+            except Exception as e:
+                print(f"⚠️  量化 {model_name} 失败: {e}")
+
     # 保存模型信息
     saved_info['version'] = '2.0.0'
     saved_info['trained_at'] = datetime.now().isoformat()
@@ -425,6 +528,11 @@ def save_models(models, output_dir='models'):
         json.dump(saved_info, f, ensure_ascii=False, indent=2)
 
     print(f"\n📋 模型信息已保存: {info_path}")
+
+    # 打包为单个bundle（附带偏移与sha256清单），服务端可一次下载或按范围读取
+    compress = os.getenv('MODEL_BUNDLE_COMPRESS', '0').lower() in ('1', 'true', 'yes')
+    build_bundle(output_dir, saved_info, compress=compress)
+
     return saved_info
 
 
@@ -454,8 +562,11 @@ def upload_to_cos(output_dir='models'):
 
     client = get_cos_client()
 
-    # 上传所有模型文件
-    for filename in os.listdir(output_dir):
+    # 上传所有模型文件；bundle清单最后上传，保证清单指向的bundle已经就绪
+    from utils._model_bundle import MANIFEST_FILENAME
+
+    filenames = sorted(os.listdir(output_dir), key=lambda name: name == MANIFEST_FILENAME)
+    for filename in filenames:
         local_path = os.path.join(output_dir, filename)
         cos_path = f'models/{filename}'
 
@@ -544,7 +655,7 @@ def main():
     print("💾 保存模型 (sklearn -> .pkl, keras -> .onnx)")
     print(f"{'='*70}")
 
-    saved_info = save_models(models, output_dir='models')
+    saved_info = save_models(models, output_dir='models', calibration_data=X_train)
 
     # 上传到COS
     upload_to_cos(output_dir='models')
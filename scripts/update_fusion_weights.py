@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+开奖后自动更新融合权重
+在预计算预测（precompute_predictions.py）之后运行：
+1. 列出COS中已存储的预测产物 predictions/<period>.json
+2. 找出已开奖、但尚未反馈过的期（含历史遗漏的期，一次补齐）
+3. 并发下载产物，按开奖日期推算当天 /api/spiritual 返回的灵修预测，用实际开奖评分
+   （开奖日期缺失的期只对ML评分）
+4. 按期号顺序一次性 POST batch_update 到 /api/fusion-weights
+5. 成功后更新反馈状态 state/fusion_feed.json
+
+环境变量:
+  FUSION_WEIGHTS_URL      /api/fusion-weights 的完整地址（必需）
+  FUSION_FEED_WORKERS     并发下载线程数（默认8）
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'api'))
+
+import re
+import json
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+
+# 已反馈期号的状态文件（COS）
+FEED_STATE_PATH = 'state/fusion_feed.json'
+
+ARTIFACT_KEY_PATTERN = re.compile(r'^predictions/(\d+)\.json$')
+
+
+def load_feed_state(client):
+    """读取已反馈的期号集合"""
+    if not client.file_exists(FEED_STATE_PATH):
+        return set()
+    try:
+        state = client.download_json(FEED_STATE_PATH)
+        return set(state.get('fed_periods', []))
+    except Exception as e:
+        print(f"⚠️  读取反馈状态失败，按全部未反馈处理: {e}")
+        return set()
+
+
+def list_artifact_periods(client):
+    """列出COS中所有预测产物的期号"""
+    from utils._prediction_artifact import PREDICTIONS_PREFIX
+
+    periods = []
+    for item in client.list_files(prefix=f'{PREDICTIONS_PREFIX}/'):
+        match = ARTIFACT_KEY_PATTERN.match(item['key'])
+        if match:
+            periods.append(match.group(1))
+    return periods
+
+
+def download_artifacts(client, periods, workers):
+    """并发下载预测产物，返回 {period: artifact}（失败的期跳过）"""
+    from utils._prediction_artifact import get_artifact_cos_path
+
+    def fetch(period):
+        try:
+            return period, client.download_json(get_artifact_cos_path(period))
+        except Exception as e:
+            print(f"⚠️  第 {period} 期产物下载失败: {e}")
+            return period, None
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        return {period: artifact for period, artifact in pool.map(fetch, periods) if artifact}
+
+
+def post_batch_update(url, records):
+    """一次性提交全部评分记录"""
+    body = json.dumps({'action': 'batch_update', 'records': records}, ensure_ascii=False).encode('utf-8')
+    req = urllib.request.Request(url, data=body, method='POST')
+    req.add_header('Content-Type', 'application/json')
+    with urllib.request.urlopen(req, timeout=30) as resp:
+        return json.loads(resp.read().decode('utf-8'))
+
+
+def main():
+    """主函数"""
+    print("=" * 70)
+    print("⚖️  更新融合权重")
+    print(f"⏰ 执行时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("=" * 70)
+
+    url = os.getenv('FUSION_WEIGHTS_URL')
+    if not url:
+        print("❌ 未配置 FUSION_WEIGHTS_URL")
+        sys.exit(1)
+
+    from utils._cos_data_loader import get_lottery_data
+    from utils._prediction_artifact import score_prediction_artifact
+    from utils._spiritual_prediction import daily_spiritual_prediction
+    from utils.tencent_cos import get_cos_client
+
+    client = get_cos_client()
+    history = get_lottery_data(force_refresh=True)
+    draws = {str(record['period']): record for record in history}
+    print(f"\n📚 历史数据: {len(history)} 期")
+
+    fed = load_feed_state(client)
+    pending = sorted(
+        (p for p in list_artifact_periods(client) if p in draws and p not in fed),
+        key=int
+    )
+    print(f"📋 待反馈: {len(pending)} 期（已反馈 {len(fed)} 期）")
+
+    if not pending:
+        print("\n✅ 没有需要反馈的新期")
+        sys.exit(0)
+
+    workers = int(os.getenv('FUSION_FEED_WORKERS', '8'))
+    artifacts = download_artifacts(client, pending, workers)
+    records = []
+    for period in pending:
+        if period not in artifacts:
+            continue
+        draw_date = draws[period].get('date')
+        spiritual = daily_spiritual_prediction(draw_date) if draw_date else None
+        records.append(score_prediction_artifact(artifacts[period], draws[period], spiritual))
+
+    for record in records:
+        spiritual = f"{record['spiritual_hits']}/{record['spiritual_total']}" if record['spiritual_total'] else '-'
+        print(f"   第 {record['period']} 期: ML {record['ml_hits']}/{record['ml_total']}  灵修 {spiritual}")
+
+    if not records:
+        print("\n❌ 没有可评分的产物")
+        sys.exit(1)
+
+    print(f"\n📤 提交 batch_update: {len(records)} 条记录")
+    try:
+        result = post_batch_update(url, records)
+    except Exception as e:
+        print(f"❌ 提交失败: {e}")
+        sys.exit(1)
+
+    if result.get('status') != 'success':
+        print(f"❌ 权重更新失败: {result.get('message')}")
+        sys.exit(1)
+
+    fed.update(record['period'] for record in records)
+    client.upload_json({
+        'fed_periods': sorted(fed, key=int),
+        'updated_at': datetime.now().isoformat()
+    }, FEED_STATE_PATH, compact=True)
+
+    weights = result.get('weights', {})
+    print("\n" + "=" * 70)
+    print(f"✅ {result.get('message')}  当前权重: ML {weights.get('ml')} / 灵修 {weights.get('spiritual')}")
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
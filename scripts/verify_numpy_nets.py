@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+校验纯 NumPy 的 LSTM / Transformer 推理与 ONNX 输出一致，并对比冷启动耗时
+
+  models/ 下同时存在 <name>.onnx 与 <name>.nn.npz 时直接对比训练产物；
+  否则按 train_models.py 的结构生成随机 Keras 布局权重，分别保存为 .nn.npz，
+  并用相同权重手工构建等价的 ONNX 图（onnxruntime 的 LSTM / LayerNormalization 算子）
+
+冷启动 = 独立子进程中 导入依赖 + 加载模型 + 首次推理 的耗时（中位数）
+
+运行: python scripts/verify_numpy_nets.py
+环境变量 BENCH_RUNS 控制冷启动重复次数（默认5）
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import statistics
+import subprocess
+import tempfile
+
+import numpy as np
+
+API_DIR = os.path.join(os.path.dirname(__file__), '..', 'api')
+sys.path.insert(0, API_DIR)
+
+from utils._numpy_nets import NN_SUFFIX, KERAS_LN_EPSILON, save_net, load_net
+
+
+MODELS_DIR = os.path.join(os.path.dirname(__file__), '..', 'models')
+MODEL_NAMES = ('lstm_front', 'lstm_back', 'transformer_front', 'transformer_back')
+
+
+def run_child(engine: str, path: str):
+    """子进程：导入推理依赖、加载模型并完成一次推理"""
+    start = time.perf_counter()
+    if engine == 'onnx':
+        import onnxruntime as ort
+        session = ort.InferenceSession(path, providers=['CPUExecutionProvider'])
+    else:
+        sys.path.insert(0, API_DIR)
+        from utils._numpy_nets import load_net
+        session = load_net(path)
+
+    model_input = session.get_inputs()[0]
+    shape = [1] + [int(n) for n in model_input.shape[1:]]
+    session.run(None, {model_input.name: np.zeros(shape, dtype=np.float32)})
+    print(json.dumps({'ms': (time.perf_counter() - start) * 1000}))
+
+
+# ==================== 随机 Keras 布局权重 ====================
+
+def _rand(rng, *shape, scale=0.2):
+    return (rng.standard_normal(shape) * scale).astype(np.float32)
+
+
+def random_lstm_weights(rng, output_dim: int) -> dict:
+    """create_lstm_model：LSTM(64) -> LSTM(32) -> Dense(64) -> Dense(out)"""
+    return {
+        'lstm1_kernel': _rand(rng, 7, 256), 'lstm1_recurrent': _rand(rng, 64, 256), 'lstm1_bias': _rand(rng, 256),
+        'lstm2_kernel': _rand(rng, 64, 128), 'lstm2_recurrent': _rand(rng, 32, 128), 'lstm2_bias': _rand(rng, 128),
+        'dense1_kernel': _rand(rng, 32, 64), 'dense1_bias': _rand(rng, 64),
+        'out_kernel': _rand(rng, 64, output_dim), 'out_bias': _rand(rng, output_dim)
+    }
+
+
+def random_transformer_weights(rng, output_dim: int) -> dict:
+    """create_transformer_model：Dense(128) -> (16, 8) -> MHA(4, 8) -> LN -> FFN(64, 8) -> LN -> Dense(128) -> Dense(out)"""
+    weights = {
+        'embed_kernel': _rand(rng, 70, 128, scale=0.05), 'embed_bias': _rand(rng, 128),
+        'ff1_kernel': _rand(rng, 8, 64), 'ff1_bias': _rand(rng, 64),
+        'ff2_kernel': _rand(rng, 64, 8), 'ff2_bias': _rand(rng, 8),
+        'ln1_gamma': 1 + _rand(rng, 8), 'ln1_beta': _rand(rng, 8),
+        'ln2_gamma': 1 + _rand(rng, 8), 'ln2_beta': _rand(rng, 8),
+        'dense_kernel': _rand(rng, 128, 128), 'dense_bias': _rand(rng, 128),
+        'out_kernel': _rand(rng, 128, output_dim), 'out_bias': _rand(rng, output_dim),
+        'mha_output_kernel': _rand(rng, 4, 8, 8), 'mha_output_bias': _rand(rng, 8),
+        'seq_shape': np.array([16, 8]),
+        'ln_epsilon': np.array(KERAS_LN_EPSILON)
+    }
+    for name in ('query', 'key', 'value'):
+        weights[f'mha_{name}_kernel'] = _rand(rng, 8, 4, 8)
+        weights[f'mha_{name}_bias'] = _rand(rng, 4, 8)
+    return weights
+
+
+# ==================== 用相同权重构建 ONNX 图 ====================
+
+def _keras_gates_to_onnx(matrix: np.ndarray) -> np.ndarray:
+    """Keras 门顺序 i, f, c, o（最后一维） -> ONNX 门顺序 i, o, f, c（第一维）"""
+    i, f, c, o = np.split(matrix, 4, axis=-1)
+    return np.concatenate([i, o, f, c], axis=-1).T
+
+
+def lstm_onnx(w: dict, path: str):
+    from onnx import helper, numpy_helper
+
+    init = []
+
+    def const(name, value):
+        init.append(numpy_helper.from_array(np.asarray(value), name))
+        return name
+
+    nodes = [helper.make_node('Transpose', ['x'], ['x_t'], perm=[1, 0, 2])]
+    seq = 'x_t'
+    for layer in ('lstm1', 'lstm2'):
+        units = w[f'{layer}_recurrent'].shape[0]
+        W = const(f'{layer}_W', _keras_gates_to_onnx(w[f'{layer}_kernel'])[None])
+        R = const(f'{layer}_R', _keras_gates_to_onnx(w[f'{layer}_recurrent'])[None])
+        bias = _keras_gates_to_onnx(w[f'{layer}_bias'][None])[:, 0]
+        B = const(f'{layer}_B', np.concatenate([bias, np.zeros_like(bias)])[None].astype(np.float32))
+        nodes.append(helper.make_node('LSTM', [seq, W, R, B], [f'{layer}_Y', f'{layer}_h'], hidden_size=units))
+        nodes.append(helper.make_node('Squeeze', [f'{layer}_Y', const(f'{layer}_axis', np.array([1]))], [f'{layer}_seq']))
+        seq = f'{layer}_seq'
+
+    nodes += [
+        helper.make_node('Squeeze', ['lstm2_h', const('axis0', np.array([0]))], ['h']),
+        helper.make_node('MatMul', ['h', const('d1_k', w['dense1_kernel'])], ['d1_m']),
+        helper.make_node('Add', ['d1_m', const('d1_b', w['dense1_bias'])], ['d1_a']),
+        helper.make_node('Relu', ['d1_a'], ['d1']),
+        helper.make_node('MatMul', ['d1', const('out_k', w['out_kernel'])], ['out_m']),
+        helper.make_node('Add', ['out_m', const('out_b', w['out_bias'])], ['out_a']),
+        helper.make_node('Sigmoid', ['out_a'], ['y'])
+    ]
+    _save_graph(nodes, init, [None, 10, 7], w['out_kernel'].shape[1], path)
+
+
+def transformer_onnx(w: dict, path: str):
+    from onnx import helper, numpy_helper
+
+    init = []
+
+    def const(name, value):
+        init.append(numpy_helper.from_array(np.asarray(value), name))
+        return name
+
+    heads, key_dim = w['mha_query_kernel'].shape[1:]
+    eps = float(w['ln_epsilon'])
+    nodes = [
+        helper.make_node('MatMul', ['x', const('embed_k', w['embed_kernel'])], ['e_m']),
+        helper.make_node('Add', ['e_m', const('embed_b', w['embed_bias'])], ['e_a']),
+        helper.make_node('Reshape', ['e_a', const('seq_shape', np.array([0, 16, 8]))], ['h0'])
+    ]
+    head_shape = const('head_shape', np.array([0, 16, heads, key_dim]))
+    for name in ('query', 'key', 'value'):
+        kernel = w[f'mha_{name}_kernel'].reshape(8, heads * key_dim)
+        nodes += [
+            helper.make_node('MatMul', ['h0', const(f'{name}_k', kernel)], [f'{name}_m']),
+            helper.make_node('Add', [f'{name}_m', const(f'{name}_b', w[f'mha_{name}_bias'].reshape(-1))], [f'{name}_a']),
+            helper.make_node('Reshape', [f'{name}_a', head_shape], [f'{name}_r']),
+            helper.make_node('Transpose', [f'{name}_r'], [f'{name}_t'], perm=[0, 2, 1, 3])
+        ]
+    nodes += [
+        helper.make_node('Mul', ['query_t', const('scale', np.array(1 / np.sqrt(key_dim), dtype=np.float32))], ['q']),
+        helper.make_node('Transpose', ['key_t'], ['k_t'], perm=[0, 1, 3, 2]),
+        helper.make_node('MatMul', ['q', 'k_t'], ['scores']),
+        helper.make_node('Softmax', ['scores'], ['attn'], axis=-1),
+        helper.make_node('MatMul', ['attn', 'value_t'], ['ctx']),
+        helper.make_node('Transpose', ['ctx'], ['ctx_t'], perm=[0, 2, 1, 3]),
+        helper.make_node('Reshape', ['ctx_t', const('ctx_shape', np.array([0, 16, heads * key_dim]))], ['ctx_r']),
+        helper.make_node('MatMul', ['ctx_r', const('o_k', w['mha_output_kernel'].reshape(heads * key_dim, 8))], ['o_m']),
+        helper.make_node('Add', ['o_m', const('o_b', w['mha_output_bias'])], ['mha']),
+        helper.make_node('Add', ['h0', 'mha'], ['res1']),
+        helper.make_node('LayerNormalization', ['res1', const('ln1_g', w['ln1_gamma']), const('ln1_b', w['ln1_beta'])],
+                         ['h1'], axis=-1, epsilon=eps),
+        helper.make_node('MatMul', ['h1', const('ff1_k', w['ff1_kernel'])], ['ff1_m']),
+        helper.make_node('Add', ['ff1_m', const('ff1_b', w['ff1_bias'])], ['ff1_a']),
+        helper.make_node('Relu', ['ff1_a'], ['ff1']),
+        helper.make_node('MatMul', ['ff1', const('ff2_k', w['ff2_kernel'])], ['ff2_m']),
+        helper.make_node('Add', ['ff2_m', const('ff2_b', w['ff2_bias'])], ['ff2']),
+        helper.make_node('Add', ['h1', 'ff2'], ['res2']),
+        helper.make_node('LayerNormalization', ['res2', const('ln2_g', w['ln2_gamma']), const('ln2_b', w['ln2_beta'])],
+                         ['h2'], axis=-1, epsilon=eps),
+        helper.make_node('Reshape', ['h2', const('flat_shape', np.array([0, 128]))], ['flat']),
+        helper.make_node('MatMul', ['flat', const('d_k', w['dense_kernel'])], ['d_m']),
+        helper.make_node('Add', ['d_m', const('d_b', w['dense_bias'])], ['d_a']),
+        helper.make_node('Relu', ['d_a'], ['d']),
+        helper.make_node('MatMul', ['d', const('out_k', w['out_kernel'])], ['out_m']),
+        helper.make_node('Add', ['out_m', const('out_b', w['out_bias'])], ['out_a']),
+        helper.make_node('Sigmoid', ['out_a'], ['y'])
+    ]
+    _save_graph(nodes, init, [None, 70], w['out_kernel'].shape[1], path)
+
+
+def _save_graph(nodes, initializers, input_shape, output_dim, path):
+    from onnx import helper, TensorProto, save
+
+    graph = helper.make_graph(
+        nodes, 'numpy_net_reference',
+        [helper.make_tensor_value_info('x', TensorProto.FLOAT, input_shape)],
+        [helper.make_tensor_value_info('y', TensorProto.FLOAT, [None, output_dim])],
+        initializers
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid('', 17)])
+    model.ir_version = 8
+    save(model, path)
+
+
+def synthesize(name: str, temp_dir: str):
+    """生成一对等价的 .onnx / .nn.npz 测试模型"""
+    rng = np.random.default_rng(MODEL_NAMES.index(name))
+    output_dim = 35 if name.endswith('front') else 12
+    onnx_path = os.path.join(temp_dir, f'{name}.onnx')
+    npz_path = os.path.join(temp_dir, name + NN_SUFFIX)
+
+    if name.startswith('lstm'):
+        weights = random_lstm_weights(rng, output_dim)
+        save_net(npz_path, 'lstm', weights, [None, 10, 7])
+        lstm_onnx(weights, onnx_path)
+    else:
+        weights = random_transformer_weights(rng, output_dim)
+        save_net(npz_path, 'transformer', weights, [None, 70])
+        transformer_onnx(weights, onnx_path)
+    return onnx_path, npz_path
+
+
+def cold_start_ms(engine: str, path: str, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, __file__, '--child', engine, path],
+            capture_output=True, text=True, check=True
+        ).stdout
+        timings.append(json.loads(output.strip().splitlines()[-1])['ms'])
+    return statistics.median(timings)
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        run_child(sys.argv[2], sys.argv[3])
+        return
+
+    import onnxruntime as ort
+
+    runs = int(os.getenv('BENCH_RUNS', '5'))
+
+    print("=" * 70)
+    print("🔍 纯 NumPy 网络 vs ONNX")
+    print("=" * 70)
+
+    temp_dir = tempfile.mkdtemp()
+    failed = False
+    try:
+        print(f"\n{'模型':<20}{'最大误差':>12}{'冷启动onnx(ms)':>16}{'冷启动numpy(ms)':>17}{'npz(KB)':>10}")
+        for name in MODEL_NAMES:
+            onnx_path = os.path.join(MODELS_DIR, f'{name}.onnx')
+            npz_path = os.path.join(MODELS_DIR, name + NN_SUFFIX)
+            if not (os.path.exists(onnx_path) and os.path.exists(npz_path)):
+                onnx_path, npz_path = synthesize(name, temp_dir)
+
+            session = ort.InferenceSession(onnx_path, providers=['CPUExecutionProvider'])
+            net = load_net(npz_path)
+
+            model_input = session.get_inputs()[0]
+            shape = [256] + [int(n) for n in model_input.shape[1:]]
+            x = np.random.default_rng(0).random(shape, dtype=np.float32)
+            expected = session.run(None, {model_input.name: x})[0]
+            diff = float(np.abs(net.predict(x) - expected).max())
+            failed = failed or diff > 1e-4
+
+            print(f"{name:<20}{diff:>12.2e}{cold_start_ms('onnx', onnx_path, runs):>16.1f}"
+                  f"{cold_start_ms('numpy', npz_path, runs):>17.1f}{os.path.getsize(npz_path) / 1024:>10.1f}")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    print("\n✅ 输出一致" if not failed else "\n❌ 输出存在差异（容差 1e-4）")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
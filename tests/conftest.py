@@ -0,0 +1,58 @@
+"""
+测试公共配置
+- 把 api/ 加入 sys.path，与部署时相同地以 utils.xxx 导入
+- 未安装腾讯云COS SDK时注册一个空的 qcloud_cos 模块，只为让加载器可以导入；
+  测试中的COS访问全部通过 FakeCOSClient 完成，不会发出网络请求
+"""
+import os
+import sys
+import json
+import types
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'api'))
+
+try:
+    import qcloud_cos  # noqa: F401
+except ImportError:
+    _sdk = types.ModuleType('qcloud_cos')
+    _sdk.CosConfig = _sdk.CosS3Client = object
+    sys.modules['qcloud_cos'] = _sdk
+
+
+class FakeCOSClient:
+    """内存中的COS客户端，files 为 {cos_path: bytes}"""
+
+    def __init__(self, files=None):
+        self.files = dict(files or {})
+        self.requests = []
+
+    def download_bytes(self, cos_path):
+        self.requests.append(cos_path)
+        if cos_path not in self.files:
+            raise Exception(f'NoSuchKey: {cos_path}')
+        return self.files[cos_path]
+
+    def download_json(self, cos_path):
+        return json.loads(self.download_bytes(cos_path))
+
+    def download_range(self, cos_path, start, end):
+        return self.download_bytes(cos_path)[start:end + 1]
+
+    def file_exists(self, cos_path):
+        return cos_path in self.files
+
+
+@pytest.fixture
+def loader(monkeypatch):
+    """已清空缓存、COS指向 FakeCOSClient、不使用bundle的加载器模块"""
+    import utils._cos_data_loader as loader
+
+    client = FakeCOSClient()
+    loader.clear_cache()
+    monkeypatch.setattr(loader, 'get_cos_client', lambda: client)
+    monkeypatch.setattr(loader, 'MODEL_BUNDLE_ENABLED', False)
+    loader.fake_client = client
+    yield loader
+    loader.clear_cache()
@@ -0,0 +1,58 @@
+"""
+回测适配器：累计计数器逐期增量更新，与每期按前缀重建的特征一致（含并列时的冷热号顺序）
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+import backtest_predictors  # noqa: E402
+
+
+@pytest.fixture(scope='module')
+def history():
+    from utils._lottery_data import lottery_data
+
+    return [
+        {**r, 'front': r['front_zone'], 'back': r['back_zone']} for r in lottery_data[:120]
+    ]
+
+
+def _walk(history, start=60):
+    """与 run_chunk 相同：从最早一期开始，训练集每步在最前面新增一期"""
+    for t in range(start, -1, -1):
+        yield history[t + 1:]
+
+
+def test_running_counts_match_full_count(history):
+    counts = backtest_predictors._RunningCounts()
+    for train in _walk(history):
+        counts.update(train)
+        front, back = backtest_predictors._RunningCounts._count(train)
+        assert list(counts.front.items()) == list(front.items())
+        assert list(counts.back.items()) == list(back.items())
+
+    # 训练集不是前缀扩展时全量重算
+    counts.update(history[30:60])
+    assert counts.front == backtest_predictors._RunningCounts._count(history[30:60])[0]
+
+
+def test_simple_ml_features_match_rebuild(history):
+    from utils._ml_features import LotteryFeatureExtractor
+
+    adapter = backtest_predictors._SimpleMLAdapter()
+    for train in _walk(history):
+        adapter.counts.update(train)
+        assert adapter.cls(train).features == LotteryFeatureExtractor(train).extract_all_features()
+
+
+def test_latest_results_frequency_matches_rebuild(history):
+    adapter = backtest_predictors._LatestResultsAdapter()
+    base = adapter.cls.__bases__[0]
+    for train in _walk(history):
+        adapter.counts.update(train)
+        incremental, rebuilt = adapter.cls(train), base(train)
+        for zone in ('front', 'back'):
+            assert list(incremental.get_frequency(zone).most_common()) == list(rebuilt.get_frequency(zone).most_common())
+        assert incremental.xgboost_predict()['front_proba'] == rebuilt.xgboost_predict()['front_proba']
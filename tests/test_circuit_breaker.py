@@ -0,0 +1,133 @@
+"""加载器断路器（负缓存）的状态转换"""
+import time
+
+import pytest
+
+
+def _expire(loader, key):
+    """让断开状态的断路器立即到达重试时间"""
+    loader._cache['circuit_breakers'][key]['retry_at'] = time.monotonic() - 1
+
+
+def test_failure_opens_breaker_with_backoff(loader):
+    loader._breaker_failure('sklearn:x', Exception('NoSuchKey'))
+
+    breaker = loader._cache['circuit_breakers']['sklearn:x']
+    assert breaker['state'] == 'open'
+    assert breaker['failures'] == 1
+    assert breaker['backoff'] == loader.BREAKER_BASE_DELAY
+    assert breaker['missing'] is True
+
+    with pytest.raises(loader.ArtifactUnavailableError):
+        loader._breaker_check('sklearn:x')
+
+
+def test_consecutive_failures_double_backoff_up_to_max(loader):
+    for _ in range(20):
+        loader._breaker_failure('sklearn:x', Exception('timeout'))
+
+    breaker = loader._cache['circuit_breakers']['sklearn:x']
+    assert breaker['backoff'] == loader.BREAKER_MAX_DELAY
+    assert breaker['missing'] is False
+
+
+def test_half_open_allows_single_probe(loader):
+    loader._breaker_failure('sklearn:x', Exception('timeout'))
+    _expire(loader, 'sklearn:x')
+
+    loader._breaker_check('sklearn:x')
+    assert loader._cache['circuit_breakers']['sklearn:x']['state'] == 'half_open'
+
+    # 探测进行中，其余请求继续跳过
+    with pytest.raises(loader.ArtifactUnavailableError):
+        loader._breaker_check('sklearn:x')
+
+
+def test_probe_success_closes_breaker(loader):
+    loader._breaker_failure('sklearn:x', Exception('timeout'))
+    _expire(loader, 'sklearn:x')
+    loader._breaker_check('sklearn:x')
+
+    loader._breaker_success('sklearn:x')
+    assert 'sklearn:x' not in loader._cache['circuit_breakers']
+    loader._breaker_check('sklearn:x')
+
+
+def test_probe_failure_reopens_with_longer_backoff(loader):
+    loader._breaker_failure('sklearn:x', Exception('timeout'))
+    _expire(loader, 'sklearn:x')
+    loader._breaker_check('sklearn:x')
+
+    loader._breaker_failure('sklearn:x', Exception('timeout'))
+    breaker = loader._cache['circuit_breakers']['sklearn:x']
+    assert breaker['state'] == 'open'
+    assert breaker['backoff'] == 2 * loader.BREAKER_BASE_DELAY
+
+
+def test_missing_model_load_opens_breaker_and_skips_cos(loader):
+    with pytest.raises(Exception):
+        loader.load_sklearn_model('xgboost_front')
+    requests = len(loader.fake_client.requests)
+
+    with pytest.raises(loader.ArtifactUnavailableError):
+        loader.load_sklearn_model('xgboost_front')
+    assert len(loader.fake_client.requests) == requests
+
+
+@pytest.mark.parametrize('load', ['load_sklearn_model', 'load_onnx_model'])
+def test_deadline_skip_does_not_consume_half_open_probe(loader, load):
+    from utils._deadline import Deadline, DeadlineExceeded
+
+    model_name = 'xgboost_front' if load == 'load_sklearn_model' else 'lstm_front'
+    key = f"{'sklearn' if load == 'load_sklearn_model' else 'onnx'}:{model_name}"
+    loader._breaker_failure(key, Exception('timeout'))
+    _expire(loader, key)
+
+    with pytest.raises(DeadlineExceeded):
+        getattr(loader, load)(model_name, deadline=Deadline(budget_ms=1))
+
+    # 预算不足的请求没有探测，断路器仍等待下一个探测请求
+    breaker = loader._cache['circuit_breakers'][key]
+    assert breaker['state'] == 'open'
+    loader._breaker_check(key)
+    assert breaker['state'] == 'half_open'
+
+
+def test_deadline_skip_keeps_prediction_artifact_probe(loader):
+    from utils._deadline import Deadline
+
+    loader._breaker_failure('prediction:25001', Exception('timeout'))
+    _expire(loader, 'prediction:25001')
+
+    assert loader.load_prediction_artifact('25001', deadline=Deadline(budget_ms=1)) is None
+    assert loader._cache['circuit_breakers']['prediction:25001']['state'] == 'open'
+
+
+def test_missing_prediction_artifact_is_short_negative_cache(loader, monkeypatch):
+    monkeypatch.setattr(loader, 'ARTIFACT_MISSING_TTL', 5)
+
+    for _ in range(4):
+        assert loader.load_prediction_artifact('25002') is None
+        breaker = loader._cache['circuit_breakers']['prediction:25002']
+        assert breaker['missing'] is True
+        assert breaker['backoff'] == 5
+        assert breaker['failures'] == 0
+        _expire(loader, 'prediction:25002')
+
+    # 产物发布后，负缓存到期即可读到
+    loader.fake_client.files['predictions/25002.json'] = b'{"prediction": {}}'
+    assert loader.load_prediction_artifact('25002') == {'prediction': {}}
+    assert 'prediction:25002' not in loader._cache['circuit_breakers']
+
+
+def test_prediction_artifact_transport_errors_still_back_off(loader, monkeypatch):
+    def timeout(path):
+        raise Exception('Connection timed out')
+
+    monkeypatch.setattr(loader.fake_client, 'download_json', timeout)
+    for failures in range(1, 4):
+        loader.load_prediction_artifact('25003')
+        breaker = loader._cache['circuit_breakers']['prediction:25003']
+        assert breaker['failures'] == failures
+        assert breaker['backoff'] == loader.BREAKER_BASE_DELAY * 2 ** (failures - 1)
+        _expire(loader, 'prediction:25003')
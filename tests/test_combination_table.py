@@ -0,0 +1,85 @@
+"""
+前区全组合表：属性与过滤条件与逐注计算一致
+"""
+import itertools
+
+import numpy as np
+import pytest
+
+from utils._combination_table import (
+    TOTAL_COMBINATIONS, build_combination_table, filter_mask, load_combination_table, numbers_to_mask,
+    sample_matching
+)
+
+
+@pytest.fixture(scope='module')
+def table():
+    return build_combination_table()
+
+
+@pytest.fixture(scope='module')
+def combos(table):
+    return [tuple(row) for row in table['numbers'].tolist()]
+
+
+def _attributes(numbers):
+    diffs = {b - a for a, b in itertools.combinations(numbers, 2)}
+    runs, run = [1], 1
+    for a, b in zip(numbers, numbers[1:]):
+        run = run + 1 if b - a == 1 else 1
+        runs.append(run)
+    return {
+        'sum': sum(numbers),
+        'span': numbers[-1] - numbers[0],
+        'odd': sum(n % 2 for n in numbers),
+        'big': sum(n >= 18 for n in numbers),
+        'ac': len(diffs) - 4,
+        'max_run': max(runs),
+        'consec_pairs': sum(b - a == 1 for a, b in zip(numbers, numbers[1:])),
+        'mask': sum(1 << (n - 1) for n in numbers)
+    }
+
+
+def test_table_holds_every_combination_once(table, combos):
+    assert len(table) == TOTAL_COMBINATIONS
+    assert combos == list(itertools.combinations(range(1, 36), 5))
+
+
+def test_attributes_match_brute_force(table, combos):
+    rng = np.random.default_rng(3)
+    rows = np.concatenate([[0, len(table) - 1], rng.choice(len(table), 3000, replace=False)])
+    for row in rows:
+        expected = _attributes(combos[row])
+        for field, value in expected.items():
+            assert int(table[field][row]) == value, (combos[row], field)
+
+
+@pytest.mark.parametrize('filters, predicate', [
+    (dict(sum_range=(80, 120), odd_counts=[2, 3], span_range=(20, None), max_run=2),
+     lambda a, n: 80 <= a['sum'] <= 120 and a['odd'] in (2, 3) and a['span'] >= 20 and a['max_run'] <= 2),
+    (dict(big_counts=[0, 5], ac_range=(None, 4)),
+     lambda a, n: a['big'] in (0, 5) and a['ac'] <= 4),
+    (dict(include=[7, 21], exclude=[1, 2, 3]),
+     lambda a, n: {7, 21} <= set(n) and not {1, 2, 3} & set(n)),
+])
+def test_filters_match_brute_force(table, combos, filters, predicate):
+    mask = filter_mask(table, **filters)
+    expected = np.array([predicate(_attributes(n), n) for n in combos])
+    assert np.array_equal(mask, expected)
+
+
+def test_numbers_to_mask():
+    assert int(numbers_to_mask([1, 35])) == 1 | (1 << 34)
+
+
+def test_sample_matching_is_uniform_subset(table):
+    tickets = sample_matching(50, seed=1, table=table, include=[5], sum_range=(60, 100))
+    assert tickets.shape == (50, 5)
+    assert len({tuple(t) for t in tickets.tolist()}) == 50
+    assert all(5 in t and 60 <= sum(t) <= 100 for t in tickets.tolist())
+    assert np.array_equal(tickets, sample_matching(50, seed=1, table=table, include=[5], sum_range=(60, 100)))
+
+
+def test_load_round_trip(tmp_path, table):
+    loaded = load_combination_table(str(tmp_path / 'combos.npy'))
+    assert np.array_equal(loaded, table)
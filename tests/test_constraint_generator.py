@@ -0,0 +1,144 @@
+"""
+约束驱动的号码生成：结果与在 C(35,5)×C(12,2) 上逐注过滤、按联合概率排序一致
+"""
+import itertools
+import math
+
+import numpy as np
+import pytest
+
+import utils._constraint_generator as generator
+from utils._combination_table import build_combination_table
+from utils._constraint_generator import MAX_CONSTRAINED_TICKETS, constrained_top_tickets, validate_constraints
+
+
+LAST_DRAW = [3, 9, 14, 22, 30]
+
+
+@pytest.fixture(scope='module')
+def table():
+    return build_combination_table()
+
+
+@pytest.fixture(autouse=True)
+def in_memory_table(table, monkeypatch):
+    monkeypatch.setattr(generator, 'load_combination_table', lambda: table)
+
+
+@pytest.fixture(scope='module')
+def proba():
+    rng = np.random.default_rng(7)
+    front = rng.dirichlet(np.ones(35))
+    back = rng.dirichlet(np.ones(12))
+    return front.tolist(), back.tolist()
+
+
+def _in_range(value, value_range):
+    low, high = value_range
+    return (low is None or value >= low) and (high is None or value <= high)
+
+
+def _front_ok(numbers, c):
+    """逐注检查前区约束（与表内属性独立实现）"""
+    runs, run = [1], 1
+    for a, b in zip(numbers, numbers[1:]):
+        run = run + 1 if b - a == 1 else 1
+        runs.append(run)
+    zones = [sum(lo <= n <= hi for n in numbers) for lo, hi in generator.FRONT_ZONES]
+    checks = [
+        ('sum_range', lambda v: _in_range(sum(numbers), v)),
+        ('span_range', lambda v: _in_range(numbers[-1] - numbers[0], v)),
+        ('odd_counts', lambda v: sum(n % 2 for n in numbers) in v),
+        ('big_counts', lambda v: sum(n >= 18 for n in numbers) in v),
+        ('ac_range', lambda v: _in_range(len({b - a for a, b in itertools.combinations(numbers, 2)}) - 4, v)),
+        ('max_run', lambda v: max(runs) <= v),
+        ('include', lambda v: set(v) <= set(numbers)),
+        ('exclude', lambda v: not set(v) & set(numbers)),
+        ('max_overlap_last', lambda v: len(set(numbers) & set(LAST_DRAW)) <= v),
+        ('zone_distribution', lambda v: all(
+            spec is None or _in_range(count, spec if isinstance(spec, list) else (spec, spec))
+            for count, spec in zip(zones, v)
+        )),
+    ]
+    return all(check(c[name]) for name, check in checks if name in c)
+
+
+def _brute_force(front_proba, back_proba, n, c):
+    fronts = [f for f in itertools.combinations(range(1, 36), 5) if _front_ok(f, c)]
+    backs = [b for b in itertools.combinations(range(1, 13), 2) if not set(b) & set(c.get('exclude_back', []))]
+    scored = [
+        (sum(math.log(front_proba[x - 1]) for x in f) + sum(math.log(back_proba[x - 1]) for x in b), list(f), list(b))
+        for f in fronts for b in backs
+    ]
+    scored.sort(key=lambda item: -item[0])
+    return scored[:n], len(fronts), len(backs)
+
+
+@pytest.mark.parametrize('constraints', [
+    {'include': [5, 17], 'exclude_back': list(range(1, 9))},
+    {'include': [2, 11, 29], 'odd_counts': [2, 3], 'span_range': [20, None]},
+    {'include': [7], 'sum_range': [60, 90], 'max_run': 1, 'ac_range': [5, 6], 'exclude_back': [1, 2, 3]},
+    {'include': [12, 24], 'zone_distribution': [2, [1, 2], None], 'max_overlap_last': 0, 'big_counts': [1, 2]},
+    {'exclude': list(range(13, 36)), 'exclude_back': [12]},
+])
+def test_matches_brute_force(proba, constraints):
+    front_proba, back_proba = proba
+    expected, front_count, back_count = _brute_force(front_proba, back_proba, 20, constraints)
+
+    result = constrained_top_tickets(front_proba, back_proba, 20, constraints, LAST_DRAW)
+
+    assert result['front_candidates'] == front_count
+    assert result['back_candidates'] == back_count
+    assert [(t['front_zone'], t['back_zone']) for t in result['tickets']] == [(f, b) for _, f, b in expected]
+    assert [t['log_score'] for t in result['tickets']] == [round(s, 4) for s, _, _ in expected]
+
+
+def test_tickets_sorted_by_joint_score(proba):
+    result = constrained_top_tickets(*proba, 200, {'include': [1]})
+    scores = [t['log_score'] for t in result['tickets']]
+    assert len(scores) == 200
+    assert scores == sorted(scores, reverse=True)
+    assert len({(tuple(t['front_zone']), tuple(t['back_zone'])) for t in result['tickets']}) == 200
+
+
+def test_unsatisfiable_constraints_return_no_tickets(proba):
+    result = constrained_top_tickets(*proba, 10, {'sum_range': [10, 14]})
+    assert result == {'tickets': [], 'front_candidates': 0, 'back_candidates': 66}
+
+    result = constrained_top_tickets(*proba, 10, {'exclude_back': list(range(1, 13))})
+    assert result['tickets'] == [] and result['back_candidates'] == 0
+
+
+def test_count_is_clamped(proba):
+    assert constrained_top_tickets(*proba, 0)['tickets'] == []
+    assert constrained_top_tickets(*proba, -5)['tickets'] == []
+    assert len(constrained_top_tickets(*proba, MAX_CONSTRAINED_TICKETS + 500)['tickets']) == MAX_CONSTRAINED_TICKETS
+    # 候选不足时返回全部候选
+    assert len(constrained_top_tickets(*proba, 50, {'include': [1, 2, 3, 4]}, None)['tickets']) == 50
+    assert len(constrained_top_tickets(*proba, 50, {'include': [1, 2, 3, 4], 'exclude_back': list(range(3, 13))})['tickets']) == 31
+
+
+def test_validate_constraints_normalizes():
+    assert validate_constraints(None) == {}
+    assert validate_constraints({
+        'sum_range': 100, 'odd_counts': 3, 'max_run': '2', 'zone_distribution': [2, [1, 2], None], 'include': None
+    }) == {'sum_range': [100, 100], 'odd_counts': [3], 'max_run': 2, 'zone_distribution': [[2, 2], [1, 2], None]}
+
+
+@pytest.mark.parametrize('constraints', [
+    [1, 2],
+    {'sum': [80, 120]},
+    {'sum_range': [80]},
+    {'sum_range': [120, 80]},
+    {'sum_range': 'abc'},
+    {'odd_counts': {'min': 2}},
+    {'max_run': 1.5},
+    {'max_run': True},
+    {'include': 5},
+    {'exclude': [0, 36]},
+    {'exclude_back': [13]},
+    {'zone_distribution': [2, 2]},
+])
+def test_invalid_constraints_raise_value_error(constraints):
+    with pytest.raises(ValueError):
+        validate_constraints(constraints)
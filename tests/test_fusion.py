@@ -0,0 +1,62 @@
+"""
+概率级融合：线性 / 对数线性池化与逐元素计算一致
+"""
+import numpy as np
+import pytest
+
+from utils._fusion import MIN_PROBA, coverage, fuse, fuse_zone, normalize, stack_probas, top_numbers
+
+
+def test_normalize_and_stack():
+    assert np.allclose(normalize([1, 3]), [0.25, 0.75])
+    assert np.allclose(normalize([0, 0, 0, 0]), 0.25)
+    matrix = stack_probas([[2, 2, 0], [0, 0, 0], [-1, 1, 1]], 3)
+    assert np.allclose(matrix, [[0.5, 0.5, 0], [1 / 3] * 3, [0, 0.5, 0.5]])
+    with pytest.raises(ValueError):
+        stack_probas([[1, 2]], 3)
+
+
+def test_linear_pooling():
+    matrix = stack_probas([[0.7, 0.2, 0.1], [0.1, 0.2, 0.7]], 3)
+    fused = fuse(matrix, [3, 1], 'linear')
+    assert np.allclose(fused, 0.75 * matrix[0] + 0.25 * matrix[1])
+
+
+def test_log_linear_pooling():
+    rng = np.random.default_rng(0)
+    matrix = stack_probas(rng.random((4, 35)), 35)
+    weights = [0.25, 0.2, 0.3, 0.25]
+    fused = fuse(matrix, weights, 'log_linear')
+
+    expected = np.ones(35)
+    for w, row in zip(weights, matrix):
+        expected *= row ** w
+    assert np.allclose(fused, expected / expected.sum())
+
+
+def test_log_linear_floor_prevents_veto():
+    matrix = stack_probas([[0.5, 0.5, 0.0], [0.4, 0.3, 0.3]], 3)
+    fused = fuse(matrix, [1, 1], 'log_linear')
+    expected = np.sqrt(np.maximum(matrix[0], MIN_PROBA) * matrix[1])
+    assert fused[2] > 0
+    assert np.allclose(fused, expected / expected.sum())
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        fuse(np.ones((1, 3)) / 3, [1], 'vote')
+
+
+def test_top_numbers_and_coverage():
+    proba = normalize([1, 5, 3, 5, 1])
+    assert top_numbers(proba, 2) == [2, 4]
+    result = coverage(proba, [2, 4])
+    assert result['coverage'] == pytest.approx(10 / 15, abs=1e-4)
+    assert result['lift'] == pytest.approx((10 / 15) / (2 / 5), abs=1e-4)
+
+
+def test_fuse_zone_identical_models_keep_distribution():
+    vector = normalize(np.arange(1, 13))
+    result = fuse_zone([vector, vector, vector], [0.5, 0.3, 0.2], 2, size=12)
+    assert np.allclose(result['proba'], vector)
+    assert result['numbers'] == [11, 12]
@@ -0,0 +1,86 @@
+"""
+历史开奖位图索引：查询结果与逐期集合比较一致
+"""
+import random
+
+import pytest
+
+from utils._history_index import HistoryIndex, get_history_index
+
+
+def _random_history(n, seed=5):
+    rng = random.Random(seed)
+    return [
+        {
+            'period': str(24001 + i),
+            'front_zone': sorted(rng.sample(range(1, 36), 5)),
+            'back_zone': sorted(rng.sample(range(1, 13), 2))
+        }
+        for i in range(n)
+    ]
+
+
+def _brute_force(history, front, back, min_front, min_back):
+    return [
+        i for i, record in enumerate(history)
+        if len(set(front) & set(record['front_zone'])) >= min_front
+        and len(set(back) & set(record['back_zone'])) >= min_back
+    ]
+
+
+@pytest.mark.parametrize('min_front, min_back', [(0, 0), (1, 0), (2, 1), (3, 0), (3, 2), (5, 0), (0, 2)])
+def test_query_matches_brute_force(min_front, min_back):
+    history = _random_history(400)
+    index = HistoryIndex(history)
+    rng = random.Random(min_front * 10 + min_back)
+
+    for _ in range(50):
+        front = sorted(rng.sample(range(1, 36), 5))
+        back = sorted(rng.sample(range(1, 13), 2))
+        result = index.query(front, back, min_front, min_back)
+        expected = _brute_force(history, front, back, min_front, min_back)
+
+        assert result['total'] == len(expected)
+        assert [m['period'] for m in result['matches']] == [history[i]['period'] for i in expected]
+        for match in result['matches']:
+            assert match['front_hits'] >= min_front and match['back_hits'] >= min_back
+
+
+def test_exact_draw_is_first_prize():
+    history = _random_history(50)
+    target = history[17]
+    result = HistoryIndex(history).query(target['front_zone'], target['back_zone'], 5, 2)
+    assert result['total'] >= 1
+    match = next(m for m in result['matches'] if m['period'] == target['period'])
+    assert match['prize_tier'] == 1 and match['prize_name'] == '一等奖'
+
+
+def test_limit_duplicates_and_out_of_range_numbers():
+    history = _random_history(200)
+    index = HistoryIndex(history)
+    full = index.query([1, 2, 3, 4, 5], [1, 2], 1)
+    limited = index.query([1, 2, 3, 4, 5], [1, 2], 1, limit=3)
+    assert limited['total'] == full['total']
+    assert limited['matches'] == full['matches'][:3]
+
+    # 重复号码只算一次；超出范围的号码忽略
+    assert index.match_bitmap([1, 1, 2], [], 2) == index.match_bitmap([1, 2], [], 2)
+    assert index.match_bitmap([1, 40], [], 2) == 0
+
+
+def test_query_many_accepts_both_field_names():
+    history = _random_history(100)
+    index = HistoryIndex(history)
+    results = index.query_many([
+        {'front': [5, 4, 3, 2, 1], 'back': [2, 1]},
+        {'front_zone': [1, 2, 3, 4, 5], 'back_zone': [1, 2]}
+    ], min_front=2)
+    assert results[0]['total'] == results[1]['total']
+    assert results[0]['front'] == [1, 2, 3, 4, 5]
+
+
+def test_index_cache_rebuilds_on_new_data():
+    history = _random_history(30)
+    first = get_history_index(history)
+    assert get_history_index(list(history)) is first
+    assert get_history_index(history + _random_history(1, seed=9)) is not first
@@ -0,0 +1,107 @@
+"""
+模型bundle：按清单偏移切片 / Range读取得到的成员与原文件逐字节一致
+"""
+import os
+import json
+import zipfile
+
+import pytest
+
+from utils._model_bundle import (
+    BundleChecksumError, build_bundle, decode_member, extract_member, member_range
+)
+from conftest import FakeCOSClient
+
+
+def _write(directory, name, data):
+    path = os.path.join(directory, name)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return path
+
+
+@pytest.fixture
+def saved_info(tmp_path):
+    directory = str(tmp_path)
+    return directory, {
+        'trained_at': '2026-01-01T00:00:00',
+        'models': {
+            'xgboost_front': {
+                'path': _write(directory, 'xgboost_front.pkl', b'pickle' * 1000),
+                'format': 'pkl',
+                'metadata': {'n_features': 70},
+                'serving': {'path': _write(directory, 'xgboost_front.xgb.npz', os.urandom(4096))}
+            },
+            'lstm_front': {
+                'path': _write(directory, 'lstm_front.onnx', os.urandom(10000)),
+                'format': 'onnx',
+                'quantized': {'path': _write(directory, 'lstm_front.int8.onnx', os.urandom(3000))}
+            },
+            'lstm_keras': {
+                'path': _write(directory, 'lstm_keras.keras', b'keras'),
+                'format': 'keras'
+            }
+        }
+    }
+
+
+def _original(directory, entry):
+    with open(os.path.join(directory, entry['file']), 'rb') as f:
+        return f.read()
+
+
+@pytest.mark.parametrize('compress', [False, True])
+def test_extract_member_round_trip(saved_info, compress):
+    directory, info = saved_info
+    manifest = build_bundle(directory, info, compress=compress)
+    with open(os.path.join(directory, 'bundle.zip'), 'rb') as f:
+        bundle = f.read()
+
+    assert set(manifest['members']) == {
+        'xgboost_front', 'xgboost_front.xgb.npz', 'lstm_front', 'lstm_front.int8.onnx'
+    }
+    assert manifest['bundle_size'] == len(bundle)
+    for name, entry in manifest['members'].items():
+        assert extract_member(bundle, entry) == _original(directory, entry), name
+
+    # 清单同样写入bundle内，普通zip工具可以正常读取
+    with zipfile.ZipFile(os.path.join(directory, 'bundle.zip')) as zf:
+        assert json.loads(zf.read('manifest.json'))['version'] == manifest['version']
+        for entry in manifest['members'].values():
+            assert zf.read(entry['file']) == _original(directory, entry)
+
+
+def test_member_range_round_trip(saved_info):
+    directory, info = saved_info
+    manifest = build_bundle(directory, info)
+    with open(os.path.join(directory, 'bundle.zip'), 'rb') as f:
+        client = FakeCOSClient({'models/bundle.zip': f.read()})
+
+    for entry in manifest['members'].values():
+        start, end = member_range(entry)
+        assert end - start + 1 == entry['size']
+        raw = client.download_range('models/bundle.zip', start, end)
+        assert decode_member(raw, entry) == _original(directory, entry)
+
+
+def test_corrupted_member_is_rejected(saved_info):
+    directory, info = saved_info
+    manifest = build_bundle(directory, info)
+    with open(os.path.join(directory, 'bundle.zip'), 'rb') as f:
+        bundle = bytearray(f.read())
+
+    entry = manifest['members']['lstm_front']
+    bundle[entry['offset']] ^= 0xFF
+    with pytest.raises(BundleChecksumError):
+        extract_member(bytes(bundle), entry)
+    with pytest.raises(BundleChecksumError):
+        decode_member(b'short', entry)
+
+
+def test_version_follows_content(saved_info):
+    directory, info = saved_info
+    first = build_bundle(directory, info)['version']
+    assert build_bundle(directory, info)['version'] == first
+
+    _write(directory, 'lstm_front.onnx', os.urandom(10000))
+    assert build_bundle(directory, info)['version'] != first
@@ -0,0 +1,104 @@
+"""
+模型内存统计：按最近最少使用的顺序淘汰，已淘汰的模型在融合预测中跳过
+"""
+import numpy as np
+import pytest
+
+from utils._model_memory import ModelMemory
+from utils._real_ml_predictor import RealMLPredictor
+
+
+MB = 1024 * 1024
+
+
+def test_no_budget_never_evicts():
+    memory = ModelMemory(budget=0)
+    for name in 'abcd':
+        assert memory.record(name, 'pkl', payload_bytes=100 * MB) == []
+    assert list(memory.entries) == list('abcd')
+
+
+def test_evicts_least_recently_loaded_first():
+    memory = ModelMemory(budget=3 * MB)
+    assert memory.record('a', 'pkl', payload_bytes=MB) == []
+    assert memory.record('b', 'pkl', payload_bytes=MB) == []
+    assert memory.record('c', 'pkl', payload_bytes=MB) == []
+    assert memory.record('d', 'pkl', payload_bytes=2 * MB) == ['a', 'b']
+    assert list(memory.entries) == ['c', 'd']
+    assert memory.evictions == 2
+
+
+def test_touch_moves_model_to_most_recent():
+    memory = ModelMemory(budget=3 * MB)
+    for name in 'abc':
+        memory.record(name, 'pkl', payload_bytes=MB)
+    memory.touch('a')
+    assert memory.record('d', 'pkl', payload_bytes=MB) == ['b']
+    assert list(memory.entries) == ['c', 'a', 'd']
+    assert memory.entries['a']['hits'] == 1
+
+
+def test_estimate_uses_largest_static_size():
+    memory = ModelMemory(budget=10 * MB)
+    memory.record('a', 'onnx', payload_bytes=MB, initializer_bytes=3 * MB, rss_delta=50 * MB)
+    assert memory.entries['a']['bytes'] == 3 * MB
+
+
+def test_oversized_model_warns_and_keeps_others(capsys):
+    memory = ModelMemory(budget=2 * MB)
+    memory.record('a', 'pkl', payload_bytes=MB)
+    assert memory.record('big', 'pkl', payload_bytes=5 * MB) == []
+    assert '超出内存预算' in capsys.readouterr().out
+    assert list(memory.entries) == ['a', 'big']
+    assert memory.status()['oversized'] == ['big']
+
+
+class _FakeClassifier:
+    """predict_proba 直接返回 (1, max_num) 概率的服务格式模型"""
+
+    def __init__(self, max_num):
+        self.max_num = max_num
+
+    def predict_proba(self, X):
+        return np.full((1, self.max_num), 1.0 / self.max_num)
+
+
+HISTORY = [{'period': str(25000 - i), 'front_zone': [1, 2, 3, 4, 5], 'back_zone': [1, 2]} for i in range(12)]
+
+
+@pytest.fixture
+def predictor(loader, monkeypatch):
+    predictor = RealMLPredictor(HISTORY, use_cos_models=False)
+    predictor.use_cos_models = True
+    predictor.models = {'xgboost_front': _FakeClassifier(35), 'xgboost_back': _FakeClassifier(12)}
+    predictor.evict_models(['xgboost_front', 'xgboost_back'])
+
+    loads = []
+
+    def load_model_from_cos(model_name, *args, **kwargs):
+        loads.append(model_name)
+        return _FakeClassifier(35 if model_name.endswith('front') else 12)
+
+    monkeypatch.setattr(loader, 'load_model_from_cos', load_model_from_cos)
+    predictor.loads = loads
+    return predictor
+
+
+def test_evicted_models_are_not_missing(predictor):
+    assert predictor.evicted == {'xgboost_front', 'xgboost_back'}
+    assert 'xgboost_front' not in predictor.missing_models()
+    assert 'random_forest_front' in predictor.missing_models()
+
+
+def test_ensemble_skips_evicted_models_without_loading(predictor):
+    result = predictor.ensemble_predict()
+    assert result['model_sources']['xgboost'] == 'evicted'
+    assert result['evicted_models'] == ['xgboost']
+    assert predictor.loads == []
+
+
+def test_single_model_prediction_reloads_evicted(predictor):
+    result = predictor.xgboost_predict()
+    assert result['source'] == 'cos_model'
+    assert predictor.loads == ['xgboost_front', 'xgboost_back']
+    assert not predictor.evicted
@@ -0,0 +1,135 @@
+"""
+纯 NumPy 网络：基本算子与逐元素的手工计算一致，整网与等价的 ONNX 图一致
+"""
+import math
+import os
+import sys
+
+import numpy as np
+import pytest
+
+from utils._numpy_nets import NN_SUFFIX, layer_norm, load_net, lstm, multi_head_attention, save_net
+
+
+def _sigmoid(v):
+    return 1 / (1 + math.exp(-v))
+
+
+def _lstm_by_hand(x, kernel, recurrent, bias):
+    """逐样本、逐时间步、逐单元计算 Keras LSTM（门顺序 i, f, c, o）"""
+    units = recurrent.shape[0]
+    result = []
+    for sample in x:
+        h = [0.0] * units
+        c = [0.0] * units
+        for step in sample:
+            z = [
+                sum(step[f] * kernel[f, j] for f in range(len(step)))
+                + sum(h[u] * recurrent[u, j] for u in range(units)) + bias[j]
+                for j in range(4 * units)
+            ]
+            new_h = []
+            for u in range(units):
+                i = _sigmoid(z[u])
+                f = _sigmoid(z[units + u])
+                g = math.tanh(z[2 * units + u])
+                o = _sigmoid(z[3 * units + u])
+                c[u] = f * c[u] + i * g
+                new_h.append(o * math.tanh(c[u]))
+            h = new_h
+        result.append(h)
+    return np.array(result)
+
+
+def test_lstm_matches_hand_computation():
+    rng = np.random.default_rng(0)
+    x = rng.standard_normal((3, 4, 5))
+    kernel = rng.standard_normal((5, 12)) * 0.5
+    recurrent = rng.standard_normal((3, 12)) * 0.5
+    bias = rng.standard_normal(12) * 0.1
+
+    assert np.allclose(lstm(x, kernel, recurrent, bias), _lstm_by_hand(x, kernel, recurrent, bias))
+    sequences = lstm(x, kernel, recurrent, bias, return_sequences=True)
+    assert sequences.shape == (3, 4, 3)
+    assert np.allclose(sequences[:, -1], lstm(x, kernel, recurrent, bias))
+
+
+def test_layer_norm_matches_definition():
+    rng = np.random.default_rng(1)
+    x = rng.standard_normal((2, 3, 8))
+    gamma, beta = rng.standard_normal(8), rng.standard_normal(8)
+    out = layer_norm(x, gamma, beta)
+    for index in np.ndindex(2, 3):
+        row = x[index]
+        expected = (row - row.mean()) / math.sqrt(row.var() + 1e-3) * gamma + beta
+        assert np.allclose(out[index], expected)
+
+
+def test_attention_matches_per_head_loop():
+    rng = np.random.default_rng(2)
+    batch, seq, d_model, heads, key_dim = 2, 5, 6, 3, 4
+    x = rng.standard_normal((batch, seq, d_model))
+    w = {}
+    for name in ('query', 'key', 'value'):
+        w[f'mha_{name}_kernel'] = rng.standard_normal((d_model, heads, key_dim))
+        w[f'mha_{name}_bias'] = rng.standard_normal((heads, key_dim))
+    w['mha_output_kernel'] = rng.standard_normal((heads, key_dim, d_model))
+    w['mha_output_bias'] = rng.standard_normal(d_model)
+
+    expected = np.tile(w['mha_output_bias'], (batch, seq, 1))
+    for b in range(batch):
+        for h in range(heads):
+            q = x[b] @ w['mha_query_kernel'][:, h] + w['mha_query_bias'][h]
+            k = x[b] @ w['mha_key_kernel'][:, h] + w['mha_key_bias'][h]
+            v = x[b] @ w['mha_value_kernel'][:, h] + w['mha_value_bias'][h]
+            scores = q @ k.T / math.sqrt(key_dim)
+            attention = np.exp(scores - scores.max(axis=1, keepdims=True))
+            attention /= attention.sum(axis=1, keepdims=True)
+            expected[b] += (attention @ v) @ w['mha_output_kernel'][h]
+
+    assert np.allclose(multi_head_attention(x, w), expected)
+
+
+def test_save_and_load_round_trip(tmp_path):
+    rng = np.random.default_rng(3)
+    weights = {
+        'lstm1_kernel': rng.standard_normal((7, 8)).astype(np.float32),
+        'lstm1_recurrent': rng.standard_normal((2, 8)).astype(np.float32),
+        'lstm1_bias': np.zeros(8, dtype=np.float32),
+        'lstm2_kernel': rng.standard_normal((2, 4)).astype(np.float32),
+        'lstm2_recurrent': rng.standard_normal((1, 4)).astype(np.float32),
+        'lstm2_bias': np.zeros(4, dtype=np.float32),
+        'dense1_kernel': rng.standard_normal((1, 3)).astype(np.float32),
+        'dense1_bias': np.zeros(3, dtype=np.float32),
+        'out_kernel': rng.standard_normal((3, 12)).astype(np.float32),
+        'out_bias': np.zeros(12, dtype=np.float32)
+    }
+    path = str(tmp_path / ('lstm_back' + NN_SUFFIX))
+    save_net(path, 'lstm', weights, [None, 10, 7])
+
+    with open(path, 'rb') as f:
+        from_bytes = load_net(f.read())
+    from_path = load_net(path)
+
+    x = rng.random((4, 10, 7), dtype=np.float32)
+    assert from_path.get_inputs()[0].shape == [None, 10, 7]
+    assert np.array_equal(from_path.predict(x), from_bytes.run(None, {'input': x})[0])
+    assert from_path.predict(x).shape == (4, 12)
+
+
+@pytest.mark.parametrize('name', ['lstm_front', 'lstm_back', 'transformer_front', 'transformer_back'])
+def test_matches_onnx_graph(tmp_path, name):
+    pytest.importorskip('onnx')
+    ort = pytest.importorskip('onnxruntime')
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+    from verify_numpy_nets import synthesize
+
+    onnx_path, npz_path = synthesize(name, str(tmp_path))
+    session = ort.InferenceSession(onnx_path, providers=['CPUExecutionProvider'])
+    net = load_net(npz_path)
+
+    model_input = session.get_inputs()[0]
+    shape = [64] + [int(n) for n in model_input.shape[1:]]
+    x = np.random.default_rng(4).random(shape, dtype=np.float32)
+    expected = session.run(None, {model_input.name: x})[0]
+    assert np.abs(net.predict(x) - expected).max() < 1e-4
@@ -0,0 +1,96 @@
+"""
+ONNX INT8 量化：量化模型与 fp32 输入输出一致、概率漂移有界，加载器按 ONNX_MODEL_VARIANT 选择并回退
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+from utils._onnx_quantize import INT8_SUFFIX, calibration_batches, quantize_onnx_model, reshape_for_input
+
+
+ort = pytest.importorskip('onnxruntime')
+pytest.importorskip('onnx')
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+from verify_numpy_nets import synthesize  # noqa: E402
+
+
+def _features(n, seed=0):
+    return np.random.default_rng(seed).integers(1, 36, (n, 70)).astype(np.float32)
+
+
+def test_reshape_and_calibration_batches():
+    X = _features(1000)
+    assert reshape_for_input(X, ['batch', 10, 7]).shape == (1000, 10, 7)
+    assert reshape_for_input(X, [None, 70]).dtype == np.float32
+
+    batches = list(calibration_batches(X, 'input', [None, 10, 7], max_samples=100, batch_size=32))
+    assert [b['input'].shape[0] for b in batches] == [32, 32, 32, 4]
+
+
+@pytest.mark.parametrize('name', ['lstm_front', 'transformer_back'])
+@pytest.mark.parametrize('mode', ['dynamic', 'static'])
+def test_quantized_model_matches_fp32(tmp_path, name, mode):
+    fp32_path, _ = synthesize(name, str(tmp_path))
+    output_path = str(tmp_path / (name + INT8_SUFFIX))
+    info = quantize_onnx_model(fp32_path, output_path, mode, _features(256))
+    assert info['size'] < info['fp32_size']
+
+    fp32 = ort.InferenceSession(fp32_path, providers=['CPUExecutionProvider'])
+    int8 = ort.InferenceSession(output_path, providers=['CPUExecutionProvider'])
+    assert [(i.name, i.shape) for i in int8.get_inputs()] == [(i.name, i.shape) for i in fp32.get_inputs()]
+
+    model_input = fp32.get_inputs()[0]
+    x = reshape_for_input(_features(64, seed=1), model_input.shape)
+    expected = fp32.run(None, {model_input.name: x})[0]
+    actual = int8.run(None, {model_input.name: x})[0]
+    assert actual.shape == expected.shape
+    assert np.abs(actual - expected).mean() < 0.05
+
+
+def test_rejects_unknown_mode_and_missing_calibration(tmp_path):
+    fp32_path, _ = synthesize('lstm_back', str(tmp_path))
+    with pytest.raises(ValueError):
+        quantize_onnx_model(fp32_path, str(tmp_path / 'out.onnx'), 'int4')
+    with pytest.raises(ValueError):
+        quantize_onnx_model(fp32_path, str(tmp_path / 'out.onnx'), 'static')
+
+
+@pytest.fixture
+def int8_loader(loader, monkeypatch, tmp_path):
+    monkeypatch.setattr(loader, 'ONNX_MODEL_VARIANT', 'int8')
+    monkeypatch.setattr(loader, 'NN_ENGINE', 'onnx')
+    monkeypatch.setattr(loader, 'MODEL_CACHE_DIR', '')
+
+    fp32_path, _ = synthesize('lstm_back', str(tmp_path))
+    with open(fp32_path, 'rb') as f:
+        loader.fake_client.files['models/lstm_back.onnx'] = f.read()
+    loader.fp32_path = fp32_path
+    return loader
+
+
+def test_loader_prefers_int8_variant(int8_loader, tmp_path):
+    quantized = quantize_onnx_model(int8_loader.fp32_path, str(tmp_path / 'q.onnx'), 'dynamic')['path']
+    with open(quantized, 'rb') as f:
+        int8_loader.fake_client.files['models/lstm_back' + INT8_SUFFIX] = f.read()
+
+    int8_loader.load_onnx_model('lstm_back')
+    assert int8_loader._cache['onnx_load_info']['lstm_back']['variant'] == 'int8'
+
+
+def test_loader_falls_back_to_fp32_and_stops_probing(int8_loader, monkeypatch):
+    client = int8_loader.fake_client
+    probes = []
+    monkeypatch.setattr(client, 'file_exists', lambda path: probes.append(path) or path in client.files)
+
+    int8_loader.load_onnx_model('lstm_back')
+    assert probes == ['models/lstm_back' + INT8_SUFFIX]
+    assert int8_loader._cache['onnx_load_info']['lstm_back']['variant'] == 'fp32'
+    assert int8_loader._cache['circuit_breakers']['variant:lstm_back' + INT8_SUFFIX]['state'] == 'open'
+
+    # 之后的加载不再探测量化模型
+    int8_loader._cache['onnx_sessions'].clear()
+    int8_loader.load_onnx_model('lstm_back')
+    assert probes == ['models/lstm_back' + INT8_SUFFIX]
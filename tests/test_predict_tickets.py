@@ -0,0 +1,101 @@
+"""
+/api/predict 批量号码：参数在输出前校验，NDJSON流中途出错时以错误行结束而不是第二个响应
+"""
+import io
+import json
+import os
+import importlib.util
+
+import pytest
+
+from utils._deadline import Deadline
+
+
+HISTORY = [{'period': '25010', 'front_zone': [1, 2, 3, 4, 5], 'back_zone': [1, 2]}]
+
+
+@pytest.fixture
+def predict_module():
+    path = os.path.join(os.path.dirname(__file__), '..', 'api', 'predict.py')
+    spec = importlib.util.spec_from_file_location('predict_api', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _handler(module):
+    h = module.handler.__new__(module.handler)
+    h.wfile = io.BytesIO()
+    h.request_version = 'HTTP/1.1'
+    h.requestline = 'POST /api/predict HTTP/1.1'
+    h.command = 'POST'
+    h.client_address = ('127.0.0.1', 0)
+    h.log_message = lambda *args: None
+    return h
+
+
+def _split_response(raw):
+    head, _, body = raw.partition(b'\r\n\r\n')
+    return head.split(b'\r\n')[0].decode(), body.decode('utf-8')
+
+
+@pytest.mark.parametrize('count', ['abc', '0', '100001', None])
+def test_invalid_count_returns_400_before_inference(predict_module, monkeypatch, count):
+    def fail(*args, **kwargs):
+        raise AssertionError('不应在参数错误时推理')
+
+    monkeypatch.setattr(predict_module, 'get_fused_probabilities', fail)
+    h = _handler(predict_module)
+    h._send_tickets(HISTORY, False, {'count': count}, Deadline(1000))
+
+    status, body = _split_response(h.wfile.getvalue())
+    assert ' 400 ' in status
+    assert json.loads(body)['status'] == 'error'
+
+
+def test_stream_error_ends_with_error_line(predict_module, monkeypatch):
+    import utils._ticket_generator as ticket_generator
+
+    def broken_tickets(front_proba, back_proba, count, seed=None):
+        yield {'front': [1, 2, 3, 4, 5], 'back': [1, 2]}
+        raise RuntimeError('抽样失败')
+
+    monkeypatch.setattr(predict_module, 'get_fused_probabilities',
+                        lambda *args: ([1 / 35] * 35, [1 / 12] * 12, 'live_inference'))
+    monkeypatch.setattr(ticket_generator, 'iter_unique_tickets', broken_tickets)
+
+    h = _handler(predict_module)
+    h._send_tickets(HISTORY, False, {'count': '500', 'format': 'ndjson'}, Deadline(1000))
+
+    raw = h.wfile.getvalue()
+    assert raw.count(b'HTTP/1.') == 1
+    status, body = _split_response(raw)
+    assert ' 200 ' in status
+
+    lines = [json.loads(line) for line in body.strip().split('\n')]
+    assert lines[0]['requested'] == 500
+    assert lines[1] == {'front': [1, 2, 3, 4, 5], 'back': [1, 2]}
+    assert lines[-1]['error'] == '抽样失败'
+
+
+@pytest.mark.parametrize('params', [
+    {'count': 'abc'},
+    {'count': '0'},
+    {'count': '1001'},
+    {'constraints': '{not json'},
+    {'constraints': '[1, 2]'},
+    {'constraints': {'odd_counts': {'min': 2}}},
+    {'constraints': {'sum_range': 'abc'}},
+    {'constraints': {'unknown': 1}},
+])
+def test_invalid_constrained_params_return_400_before_inference(predict_module, monkeypatch, params):
+    def fail(*args, **kwargs):
+        raise AssertionError('不应在参数错误时推理')
+
+    monkeypatch.setattr(predict_module, 'get_fused_probabilities', fail)
+    h = _handler(predict_module)
+    h._send_constrained_tickets(HISTORY, False, {'action': 'constrained', **params}, Deadline(1000))
+
+    status, body = _split_response(h.wfile.getvalue())
+    assert ' 400 ' in status
+    assert json.loads(body)['error_type'] == 'ValueError'
@@ -0,0 +1,65 @@
+"""
+预测产物评分：灵修一侧对开奖当天 /api/spiritual 实际返回的灵修预测评分，该预测可由开奖日期推算
+"""
+import io
+import json
+import os
+import importlib.util
+from datetime import datetime, timezone
+
+from utils._prediction_artifact import score_prediction_artifact
+from utils._spiritual_prediction import daily_spiritual_prediction, get_beijing_date
+
+
+ARTIFACT = {
+    'target_period': '25010',
+    'prediction': {'ensemble_prediction': {'front_zone': [1, 2, 3, 4, 5], 'back_zone': [1, 2]}},
+    # 早期产物自带的按期号哈希生成的灵修预测，从未返回给用户
+    'spiritual_prediction': {'front_zone': [1, 2, 3, 4, 5], 'back_zone': [1, 2]}
+}
+DRAW = {'period': '25010', 'front_zone': [1, 2, 3, 30, 31], 'back_zone': [2, 12]}
+
+
+def test_without_served_spiritual_scores_ml_only():
+    record = score_prediction_artifact(ARTIFACT, DRAW)
+    assert (record['ml_hits'], record['ml_total'], record['ml_back_hits']) == (3, 5, 1)
+    assert (record['spiritual_hits'], record['spiritual_total'], record['spiritual_back_hits']) == (0, 0, 0)
+
+
+def test_scores_served_spiritual_prediction():
+    served = {'front_zone': [1, 30, 31, 32, 33], 'back_zone': [11, 12]}
+    record = score_prediction_artifact(ARTIFACT, DRAW, served)
+    assert (record['spiritual_hits'], record['spiritual_total'], record['spiritual_back_hits']) == (3, 5, 1)
+
+
+def test_daily_prediction_is_stable_per_beijing_date():
+    first = daily_spiritual_prediction('2025-12-13')
+    assert first == daily_spiritual_prediction('2025-12-13')
+    assert first != daily_spiritual_prediction('2025-12-14')
+    assert len(set(first['front_zone'])) == 5 and all(1 <= n <= 35 for n in first['front_zone'])
+    assert len(set(first['back_zone'])) == 2 and all(1 <= n <= 12 for n in first['back_zone'])
+
+    # UTC 16:00 已是北京时间次日
+    assert get_beijing_date(datetime(2025, 12, 12, 15, 59, tzinfo=timezone.utc)) == '2025-12-12'
+    assert get_beijing_date(datetime(2025, 12, 12, 16, 0, tzinfo=timezone.utc)) == '2025-12-13'
+
+
+def test_spiritual_get_serves_the_daily_prediction():
+    path = os.path.join(os.path.dirname(__file__), '..', 'api', 'spiritual.py')
+    spec = importlib.util.spec_from_file_location('spiritual_api', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    h = module.handler.__new__(module.handler)
+    h.wfile = io.BytesIO()
+    h.request_version = 'HTTP/1.1'
+    h.requestline = 'GET /api/spiritual HTTP/1.1'
+    h.command = 'GET'
+    h.client_address = ('127.0.0.1', 0)
+    h.log_message = lambda *args: None
+    h.do_GET()
+
+    body = json.loads(h.wfile.getvalue().partition(b'\r\n\r\n')[2])
+    expected = daily_spiritual_prediction(body['date'])
+    assert body['spiritual_prediction'] == {'front_zone': expected['front_zone'], 'back_zone': expected['back_zone']}
+    assert body['energy_analysis']['intensity'] == expected['intensity']
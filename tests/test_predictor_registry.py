@@ -0,0 +1,61 @@
+"""
+进程级预测器注册表：热路径只比较数据版本，缺失的模型由后台检查补加载
+"""
+import pytest
+
+
+HISTORY = [
+    {'period': '25002', 'front_zone': [1, 2, 3, 4, 5], 'back_zone': [1, 2]},
+    {'period': '25001', 'front_zone': [6, 7, 8, 9, 10], 'back_zone': [3, 4]},
+]
+
+
+@pytest.fixture
+def registry(loader, monkeypatch):
+    import utils._predictor_registry as registry
+
+    registry.clear_predictors()
+    monkeypatch.setattr(registry, 'MODEL_POLL_INTERVAL', 0)
+    monkeypatch.setattr(loader, 'get_models_version', lambda: 'v1')
+    yield registry
+    registry.clear_predictors()
+
+
+def _count_preloads(loader, monkeypatch, result=None):
+    calls = []
+
+    def preload_models(model_names, *args, **kwargs):
+        calls.append(list(model_names))
+        loaded = {name: model for name, model in (result or {}).items() if name in model_names}
+        return loaded, {name: {'status': 'loaded'} for name in loaded}
+
+    monkeypatch.setattr(loader, 'preload_models', preload_models)
+    return calls
+
+
+def test_missing_models_do_not_reload_on_request(registry, loader, monkeypatch):
+    calls = _count_preloads(loader, monkeypatch)
+
+    predictor = registry.get_predictor(HISTORY)
+    assert len(calls) == 1
+    assert predictor.missing_models()
+
+    for _ in range(3):
+        assert registry.get_predictor(HISTORY) is predictor
+    assert len(calls) == 1
+
+
+def test_poller_fills_missing_models(registry, loader, monkeypatch):
+    _count_preloads(loader, monkeypatch)
+    predictor = registry.get_predictor(HISTORY)
+
+    calls = _count_preloads(loader, monkeypatch, result={'xgboost_front': object()})
+    monkeypatch.setattr(loader, 'poll_models_version', lambda: 'v1')
+    registry._poll_and_swap()
+
+    assert calls == [predictor.missing_models()]
+    current = registry.get_predictor(HISTORY)
+    assert current is not predictor
+    assert 'xgboost_front' in current.models
+    assert 'xgboost_front' not in current.missing_models()
+    assert current.models_version == 'v1'
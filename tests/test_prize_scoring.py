@@ -0,0 +1,89 @@
+"""
+奖级评分：矩阵计算与逐注集合比较的结果一致
+"""
+import numpy as np
+import pytest
+
+from utils._prize_scoring import (
+    DEFAULT_PRIZES, PRIZE_TIERS, prize_tier, score_against_history, score_tickets, tier_matrix
+)
+
+
+# 官方规则：(前区命中, 后区命中) -> 奖级
+RULES = {
+    (5, 2): 1, (5, 1): 2, (5, 0): 3, (4, 2): 4, (4, 1): 5,
+    (3, 2): 6, (4, 0): 7, (3, 1): 8, (2, 2): 8,
+    (3, 0): 9, (2, 1): 9, (1, 2): 9, (0, 2): 9
+}
+
+
+def _random_draws(rng, n):
+    front = np.array([np.sort(rng.choice(np.arange(1, 36), 5, replace=False)) for _ in range(n)])
+    back = np.array([np.sort(rng.choice(np.arange(1, 13), 2, replace=False)) for _ in range(n)])
+    return front, back
+
+
+def _brute_force_tier(ticket_front, ticket_back, draw_front, draw_back):
+    front_hits = len(set(ticket_front.tolist()) & set(draw_front.tolist()))
+    back_hits = len(set(ticket_back.tolist()) & set(draw_back.tolist()))
+    return RULES.get((front_hits, back_hits), 0)
+
+
+def test_prize_tier_matches_rules():
+    for front_hits in range(6):
+        for back_hits in range(3):
+            assert prize_tier(front_hits, back_hits) == RULES.get((front_hits, back_hits), 0)
+    with pytest.raises(ValueError):
+        prize_tier(6, 0)
+
+
+def test_tier_matrix_matches_brute_force():
+    rng = np.random.default_rng(7)
+    tickets_front, tickets_back = _random_draws(rng, 300)
+    draws_front, draws_back = _random_draws(rng, 40)
+    # 保证高奖级也被覆盖
+    tickets_front[:3] = draws_front[0]
+    tickets_back[0] = draws_back[0]
+    other_back = next(n for n in range(1, 13) if n not in draws_back[0])
+    tickets_back[1] = sorted([draws_back[0][0], other_back])
+
+    tiers = tier_matrix(tickets_front, tickets_back, draws_front, draws_back)
+    assert tiers.shape == (300, 40)
+    for t in range(300):
+        for d in range(40):
+            expected = _brute_force_tier(tickets_front[t], tickets_back[t], draws_front[d], draws_back[d])
+            assert tiers[t, d] == expected
+    assert tiers[0, 0] == 1
+
+
+def test_score_tickets_counts_and_payout():
+    rng = np.random.default_rng(11)
+    tickets_front, tickets_back = _random_draws(rng, 500)
+    draws_front, draws_back = _random_draws(rng, 30)
+
+    expected = {tier: 0 for tier in range(1, 10)}
+    for t in range(500):
+        for d in range(30):
+            tier = _brute_force_tier(tickets_front[t], tickets_back[t], draws_front[d], draws_back[d])
+            if tier:
+                expected[tier] += 1
+
+    # 分块大小不影响结果
+    for chunk_size in (7, 2048):
+        result = score_tickets(tickets_front, tickets_back, draws_front, draws_back, chunk_size=chunk_size)
+        assert result['tier_counts'] == expected
+        assert result['evaluations'] == 500 * 30
+        assert result['total_payout'] == sum(expected[t] * DEFAULT_PRIZES[t] for t in expected)
+
+
+def test_prize_override_and_dict_input():
+    tickets = [{'front': [1, 2, 3, 4, 5], 'back': [1, 2]}]
+    history = [{'front_zone': [1, 2, 3, 10, 11], 'back_zone': [1, 2]}]
+    result = score_against_history(tickets, history, prizes={6: 250})
+    assert result['tier_counts'][6] == 1
+    assert result['total_payout'] == 250
+    assert result['expected_return'] == 125
+
+
+def test_table_shape():
+    assert len(PRIZE_TIERS) == 6 and all(len(row) == 3 for row in PRIZE_TIERS)
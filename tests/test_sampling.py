@@ -0,0 +1,76 @@
+"""
+加权无放回抽样：Gumbel top-k 与纯Python实现都服从逐个按权重抽取（Plackett-Luce）的分布
+"""
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+from utils._sampling import gumbel_top_k, weighted_sample, weighted_sample_batch
+
+
+WEIGHTS = [5.0, 3.0, 1.0, 0.5, 0.5]
+
+
+def _exact_subset_probabilities(weights, k):
+    """逐个按剩余权重抽取k个时，每个k元子集的概率"""
+    probabilities = {}
+    for order in itertools.permutations(range(len(weights)), k):
+        remaining = sum(weights)
+        p = 1.0
+        for i in order:
+            p *= weights[i] / remaining
+            remaining -= weights[i]
+        key = tuple(sorted(order))
+        probabilities[key] = probabilities.get(key, 0.0) + p
+    return probabilities
+
+
+def test_gumbel_top_k_matches_sequential_sampling():
+    n_draws = 200000
+    draws = gumbel_top_k(WEIGHTS, 2, n_draws, seed=1, chunk_size=4096)
+    counts = {}
+    for row in map(tuple, draws.tolist()):
+        counts[row] = counts.get(row, 0) + 1
+
+    for subset, p in _exact_subset_probabilities(WEIGHTS, 2).items():
+        # 约5个标准差的容差
+        tolerance = 5 * np.sqrt(p * (1 - p) / n_draws)
+        assert abs(counts.get(subset, 0) / n_draws - p) < tolerance, subset
+
+
+def test_python_sampler_matches_sequential_sampling():
+    n_draws = 40000
+    rng = random.Random(2)
+    counts = {}
+    for _ in range(n_draws):
+        subset = tuple(n - 1 for n in weighted_sample([1, 2, 3, 4, 5], WEIGHTS, 2, seed=rng.getrandbits(32)))
+        counts[subset] = counts.get(subset, 0) + 1
+
+    for subset, p in _exact_subset_probabilities(WEIGHTS, 2).items():
+        tolerance = 5 * np.sqrt(p * (1 - p) / n_draws)
+        assert abs(counts.get(subset, 0) / n_draws - p) < tolerance, subset
+
+
+def test_rows_are_sorted_unique_and_skip_zero_weights():
+    weights = np.ones(35)
+    weights[[0, 10]] = 0
+    draws = gumbel_top_k(weights, 5, 5000, seed=3)
+    assert draws.shape == (5000, 5)
+    assert np.all(np.diff(draws, axis=1) > 0)
+    assert not np.isin(draws, [0, 10]).any()
+
+
+def test_seed_reproducible_and_chunk_independent_shape():
+    a = weighted_sample_batch(list(range(1, 36)), np.ones(35), 5, 1000, seed=9, chunk_size=128)
+    b = weighted_sample_batch(list(range(1, 36)), np.ones(35), 5, 1000, seed=9, chunk_size=128)
+    assert np.array_equal(a, b)
+    assert a.min() >= 1 and a.max() <= 35
+    assert weighted_sample([3, 1, 2], [1, 1, 1], 5) == [1, 2, 3]
+
+
+@pytest.mark.parametrize('weights, k', [([1, -1, 1], 1), ([1, np.inf], 1), ([], 1), ([1, 1], 3)])
+def test_invalid_arguments(weights, k):
+    with pytest.raises(ValueError):
+        gumbel_top_k(weights, k)
@@ -0,0 +1,83 @@
+"""
+树模型服务格式：ForestEvaluator / XGBoostEvaluator 与原 sklearn / XGBoost 模型的类别1概率一致
+"""
+import numpy as np
+import pytest
+
+from utils._tree_serving import (
+    ForestEvaluator, XGBoostEvaluator, export_serving_model, load_serving_model, serving_suffix
+)
+
+
+def _training_data(n_outputs=6):
+    rng = np.random.default_rng(0)
+    X = rng.integers(1, 36, (300, 70)).astype(np.float32)
+    y = (rng.random((300, n_outputs)) < 0.3).astype(int)
+    y[:, 0] = 0  # 训练集中从未出现的号码：只有类别0
+    return X, y
+
+
+def _positive_proba(proba, estimator):
+    classes = list(estimator.classes_)
+    return proba[:, classes.index(1)] if 1 in classes else np.zeros(proba.shape[0])
+
+
+def test_forest_matches_sklearn(tmp_path):
+    pytest.importorskip('sklearn')
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.multioutput import MultiOutputClassifier
+
+    X, y = _training_data()
+    model = MultiOutputClassifier(RandomForestClassifier(n_estimators=15, max_depth=6, random_state=0)).fit(X, y)
+
+    info = export_serving_model(model, str(tmp_path / 'random_forest_front'))
+    assert info['path'].endswith(serving_suffix('random_forest_front'))
+    evaluator = load_serving_model(info['path'])
+    assert isinstance(evaluator, ForestEvaluator)
+
+    X_test = np.random.default_rng(1).integers(1, 36, (200, 70)).astype(np.float32)
+    expected = np.column_stack([
+        _positive_proba(p, est) for p, est in zip(model.predict_proba(X_test), model.estimators_)
+    ])
+    assert np.allclose(evaluator.predict_proba(X_test), expected, atol=1e-9)
+
+
+def test_forest_handles_unlimited_depth(tmp_path):
+    pytest.importorskip('sklearn')
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.multioutput import MultiOutputClassifier
+
+    X, y = _training_data(3)
+    model = MultiOutputClassifier(RandomForestClassifier(n_estimators=5, random_state=1)).fit(X, y)
+    with open(export_serving_model(model, str(tmp_path / 'rf'))['path'], 'rb') as f:
+        evaluator = load_serving_model(f.read())
+
+    expected = np.column_stack([
+        _positive_proba(p, est) for p, est in zip(model.predict_proba(X), model.estimators_)
+    ])
+    assert np.allclose(evaluator.predict_proba(X), expected, atol=1e-9)
+
+
+@pytest.mark.parametrize('multi_output', [False, True])
+def test_xgboost_matches_classifier(tmp_path, multi_output):
+    xgb = pytest.importorskip('xgboost')
+
+    X, y = _training_data()
+    params = dict(n_estimators=10, max_depth=3, random_state=0)
+    if multi_output:
+        model = xgb.XGBClassifier(multi_strategy='one_output_per_tree', **params).fit(X, y[:, 1:])
+        expected = model.predict_proba(X)
+    else:
+        model = [xgb.XGBClassifier(**params).fit(X, y[:, i]) for i in range(1, y.shape[1])]
+        expected = np.column_stack([clf.predict_proba(X)[:, 1] for clf in model])
+
+    evaluator = load_serving_model(export_serving_model(model, str(tmp_path / 'xgboost_front'))['path'])
+    assert isinstance(evaluator, XGBoostEvaluator)
+    assert evaluator.multi_output == multi_output
+    assert np.allclose(evaluator.predict_proba(X), expected, atol=1e-6)
+
+
+def test_rejects_unknown_models(tmp_path):
+    with pytest.raises(ValueError):
+        export_serving_model(object(), str(tmp_path / 'unknown'))
+    assert serving_suffix('lstm_front') is None